@@ -0,0 +1,155 @@
+"""비동기(aiohttp) 서빙 모드
+
+챗봇 질의(/api/chatbot/query)와 SSE 스트림(/api/chatbot/stream)을 asyncio로 처리하여
+응답 대기 중인 연결이 작업 스레드를 점유하지 않도록 합니다. 그 밖의 경로는 기존
+Flask 앱(server.py)을 스레드 풀에서 그대로 실행하므로 라우트와 응답 형식이 같습니다.
+
+실행:
+    python async_server.py
+    gunicorn async_server:app --worker-class aiohttp.GunicornWebWorker --bind 0.0.0.0:8080
+"""
+import os
+import json
+import asyncio
+import logging
+import functools
+
+from aiohttp import web
+from multidict import CIMultiDict
+from werkzeug.test import EnvironBuilder
+from werkzeug.wrappers import Response as WSGIResponse
+
+# Flask 앱과 챗봇 초기화 상태를 공유 (import 시 챗봇 초기화 스레드가 시작됨)
+import server
+import modules.unified_chatbot as unified_chatbot
+
+logger = logging.getLogger('async_server')
+
+# 응답 본문과 함께 다시 계산되는 헤더
+HOP_BY_HOP_HEADERS = {'content-length', 'transfer-encoding', 'connection', 'keep-alive'}
+
+
+async def query_chatbot(request: web.Request) -> web.Response:
+    if not server.chatbot_ready:
+        return web.json_response({
+            'status': 'error',
+            'message': '챗봇이 초기화되지 않았습니다. 먼저 초기화를 진행해주세요.',
+            'ready': server.chatbot_ready
+        }, status=400)
+    try:
+        data = await request.json()
+        query = data.get('query', '')
+        use_gemini = data.get('use_gemini', False)
+        if not query:
+            return web.json_response({'status': 'error', 'message': '질문이 없습니다.'}, status=400)
+        logger.info(f"통합 챗봇 질의 (비동기): {query}, Gemini 사용: {use_gemini}")
+        chatbot = unified_chatbot.get_unified_chatbot_instance()
+        try:
+            result = await chatbot.aprocess_query(query, use_gemini=use_gemini, **server.chatbot_query_options(data))
+        except (TypeError, ValueError) as e:
+            return web.json_response({'status': 'error', 'message': f'잘못된 검색 옵션: {str(e)}'}, status=400)
+        return web.json_response({
+            'status': 'success',
+            'answer': result['answer'],
+            'citations': result['citations'],
+            'sources_used': result.get('sources_used', {}),
+            'cached': result.get('cached', False)
+        })
+    except Exception as e:
+        logger.error(f"챗봇 질의 처리 중 오류 발생: {str(e)}")
+        return web.json_response({'status': 'error', 'message': f'오류가 발생했습니다: {str(e)}'}, status=500)
+
+
+async def stream_chatbot(request: web.Request) -> web.StreamResponse:
+    query = request.query.get('query', '')
+    use_gemini = request.query.get('use_gemini', 'false').lower() == 'true'
+
+    response = web.StreamResponse(headers={
+        'Content-Type': 'text/event-stream',
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+    await response.prepare(request)
+
+    async def send(event):
+        await response.write(f"data: {json.dumps(event)}\n\n".encode('utf-8'))
+
+    if not query:
+        await send({'type': 'error', 'message': '질문이 없습니다.'})
+        return response
+    if not server.chatbot_ready:
+        await send({'type': 'error', 'message': '챗봇이 아직 초기화되지 않았습니다.'})
+        return response
+
+    events = None
+    try:
+        options = server.chatbot_query_options(request.query)
+        chatbot = unified_chatbot.get_unified_chatbot_instance()
+        events = chatbot.aprocess_query_stream(query, use_gemini=use_gemini, **options)
+        async for event in events:
+            await send(event)
+    except ConnectionResetError:
+        logger.info("클라이언트 연결 종료로 스트리밍을 중단합니다")
+    except Exception as e:
+        logger.error(f"스트리밍 중 오류: {str(e)}")
+        try:
+            await send({'type': 'error', 'message': str(e)})
+        except ConnectionResetError:
+            pass
+    finally:
+        if events is not None:
+            await events.aclose()
+    return response
+
+
+async def flask_fallback(request: web.Request) -> web.Response:
+    """비동기 라우트가 없는 요청은 Flask 앱을 스레드 풀에서 실행"""
+    body = await request.read()
+    headers = [(key, value) for key, value in request.headers.items()
+               if key.lower() not in ('content-length', 'content-type')]
+    builder = EnvironBuilder(
+        path=request.path,
+        method=request.method,
+        headers=headers,
+        query_string=request.query_string,
+        data=body,
+        content_type=request.headers.get('Content-Type')
+    )
+    try:
+        environ = builder.get_environ()
+    finally:
+        builder.close()
+    environ['REMOTE_ADDR'] = request.remote or ''
+
+    loop = asyncio.get_running_loop()
+    wsgi_response = await loop.run_in_executor(
+        None, functools.partial(WSGIResponse.from_app, server.app, environ, buffered=True))
+
+    response_headers = CIMultiDict(
+        (key, value) for key, value in wsgi_response.headers.items() if key.lower() not in HOP_BY_HOP_HEADERS
+    )
+    return web.Response(status=wsgi_response.status_code, headers=response_headers, body=wsgi_response.get_data())
+
+
+async def close_chatbot_clients(app: web.Application):
+    """종료 시 이 이벤트 루프에서 만든 Perplexity·Gemini 비동기 클라이언트 연결 정리"""
+    chatbot = unified_chatbot._unified_chatbot_instance
+    if chatbot is not None:
+        await chatbot.aclose()
+
+
+def create_app() -> web.Application:
+    app = web.Application(client_max_size=10 * 1024 * 1024)
+    app.router.add_post('/api/chatbot/query', query_chatbot)
+    app.router.add_get('/api/chatbot/stream', stream_chatbot)
+    app.router.add_route('*', '/{tail:.*}', flask_fallback)
+    app.on_cleanup.append(close_chatbot_clients)
+    return app
+
+
+app = create_app()
+
+if __name__ == '__main__':
+    port = int(os.environ.get('PORT', 8080))
+    logger.info(f"비동기 서버가 {port} 포트에서 0.0.0.0 호스트로 실행을 시도합니다.")
+    web.run_app(app, host='0.0.0.0', port=port)
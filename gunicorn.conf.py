@@ -0,0 +1,38 @@
+"""gunicorn 설정
+
+포트가 열린 뒤(when_ready) 마스터가 RAG 인덱스 생성 스크립트를 백그라운드로 한 번 실행하고,
+워커는 RAG_INDEX_READONLY=true로 같은 인덱스 파일을 읽기 전용으로 메모리 매핑합니다.
+인덱스가 생성되기 전까지 워커는 키워드(BM25) 검색으로 응답하다가 매니페스트가 생기면 하이브리드 검색으로 전환합니다.
+임베딩·BM25 배열은 페이지 캐시를 공유하므로 워커 수가 늘어도 메모리와 임베딩 호출이 늘지 않습니다.
+RAG_INDEX_DIR(과 EMBEDDING_CACHE_PATH)를 영구 볼륨에 두면 콜드 스타트마다 다시 임베딩하지 않습니다.
+
+실행:
+    gunicorn server:app -c gunicorn.conf.py
+"""
+import os
+import sys
+import subprocess
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8080')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', '4'))
+loglevel = 'info'
+
+# 공유 인덱스 생성 여부 (false면 워커가 각자 인덱스를 준비)
+RAG_PREBUILD = os.environ.get('RAG_PREBUILD', 'true').lower() == 'true'
+BUILD_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts', 'build_rag_index.py')
+
+if RAG_PREBUILD:
+    # 워커는 설정 파일을 읽은 마스터에서 fork되므로 이 설정이 그대로 상속됨
+    os.environ.setdefault('RAG_INDEX_READONLY', 'true')
+
+
+def when_ready(server):
+    """소켓을 연 뒤 공유 RAG 인덱스 생성 스크립트를 백그라운드로 실행 (마스터를 막지 않음)
+
+    마스터가 임베딩 스레드 풀 등을 만든 채로 fork하지 않도록 별도 프로세스에서 실행합니다.
+    인덱스가 이미 최신이면 스크립트는 임베딩 없이 바로 끝나며, 생성에 실패해도 워커는 키워드 검색을 계속 제공합니다.
+    """
+    if not RAG_PREBUILD:
+        return
+    process = subprocess.Popen([sys.executable, BUILD_SCRIPT])
+    server.log.info(f"공유 RAG 인덱스 생성 시작 (pid {process.pid})")
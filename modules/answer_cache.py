@@ -0,0 +1,154 @@
+import re
+import time
+import logging
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+import numpy as np
+
+logger = logging.getLogger('answer_cache')
+
+
+def normalize_query(query: str) -> str:
+    """캐시 키용 질의 정규화 (유니코드 정규화, 소문자, 공백·문장부호 정리)"""
+    text = unicodedata.normalize("NFKC", query).lower().strip()
+    text = re.sub(r"[?!.,~…]+$", "", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+class AnswerCache:
+    """질의 답변 캐시
+
+    정규화된 질의 + 백엔드가 같으면 그대로 반환하고, 질의 임베딩이 주어지면
+    같은 백엔드의 캐시 항목 중 코사인 유사도가 임계값 이상인 답변도 반환합니다.
+    LRU로 최대 항목 수를 유지하며, 웹 검색 결과를 사용한 답변은 더 짧은 TTL을 적용합니다.
+    """
+
+    def __init__(self, max_entries: int = 512, ttl: float = 3600, web_ttl: float = 600,
+                 similarity_threshold: float = 0.95):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.web_ttl = web_ttl
+        self.similarity_threshold = similarity_threshold
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        # 유사도 검색용 행렬 (항목이 바뀌면 다시 구성)
+        self._matrix = None
+        self._matrix_keys = []
+        self._matrix_dirty = True
+
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def semantic_enabled(self) -> bool:
+        return 0 < self.similarity_threshold < 1
+
+    def _remove(self, key):
+        del self._entries[key]
+        self._matrix_dirty = True
+
+    def _nearest(self, backend: str, query_vector: np.ndarray):
+        """같은 백엔드 항목 중 가장 유사한 항목의 (키, 유사도)"""
+        if self._matrix_dirty:
+            keys = [key for key, entry in self._entries.items() if entry["vector"] is not None]
+            self._matrix_keys = keys
+            self._matrix = np.stack([self._entries[key]["vector"] for key in keys]) if keys else None
+            self._matrix_dirty = False
+
+        if self._matrix is None:
+            return None, 0.0
+
+        scores = self._matrix @ query_vector
+        backend_mask = np.array([key[1] == backend for key in self._matrix_keys])
+        scores = np.where(backend_mask, scores, -1.0)
+        best = int(np.argmax(scores))
+        return self._matrix_keys[best], float(scores[best])
+
+    def get(self, query: str, backend: str, query_vector=None, record_miss: bool = True) -> Optional[Dict[str, Any]]:
+        """캐시된 답변 조회 (없으면 None)
+        
+        유사 질의 조회를 이어서 할 예정이면 record_miss=False로 실패를 한 번만 집계합니다.
+        """
+        key = (normalize_query(query), backend)
+        now = time.time()
+
+        with self._lock:
+            # 만료 항목 정리 (웹 검색 답변과 TTL이 달라 전체 확인)
+            for expired_key in [k for k, entry in self._entries.items() if entry["expires_at"] <= now]:
+                self._remove(expired_key)
+
+            entry = self._entries.get(key)
+            if entry:
+                self._entries.move_to_end(key)
+                self.exact_hits += 1
+                return entry["result"]
+
+            if query_vector is not None and self.semantic_enabled and self._entries:
+                vector = self._normalize(query_vector)
+                nearest_key, similarity = self._nearest(backend, vector)
+                if nearest_key is not None and similarity >= self.similarity_threshold:
+                    self._entries.move_to_end(nearest_key)
+                    self.semantic_hits += 1
+                    logger.info(f"유사 질의 캐시 적중: '{query}' ≈ '{nearest_key[0]}' ({similarity:.3f})")
+                    return self._entries[nearest_key]["result"]
+
+            if record_miss:
+                self.misses += 1
+            return None
+
+    def record_miss(self):
+        """캐시 조회를 끝까지 하지 못한 경우(질의 임베딩 실패 등)의 실패 집계"""
+        with self._lock:
+            self.misses += 1
+
+    def put(self, query: str, backend: str, result: Dict[str, Any], query_vector=None, used_web: bool = False):
+        """답변 저장"""
+        key = (normalize_query(query), backend)
+        ttl = self.web_ttl if used_web else self.ttl
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = {
+                "result": result,
+                "vector": self._normalize(query_vector) if query_vector is not None else None,
+                "expires_at": time.time() + ttl
+            }
+            self._matrix_dirty = True
+
+            while len(self._entries) > self.max_entries:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._matrix_dirty = True
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 적중률 등 통계"""
+        hits = self.exact_hits + self.semantic_hits
+        total = hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "exact_hits": self.exact_hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(hits / total, 4) if total else None
+        }
+
+    @staticmethod
+    def _normalize(vector) -> np.ndarray:
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
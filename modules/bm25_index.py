@@ -0,0 +1,166 @@
+import re
+import logging
+import unicodedata
+from collections import Counter
+from typing import List, Dict, Any, Callable, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger('bm25_index')
+
+_WORD_PATTERN = re.compile(r"[0-9a-z]+|[가-힣]+|[^\s0-9a-z가-힣\W]+")
+
+
+def ngram_tokenizer(text: str) -> List[str]:
+    """한국어 문자 바이그램 토크나이저
+
+    조사가 붙은 어절("기준금리는")도 질의("기준금리")와 겹치도록 한글 어절은
+    문자 바이그램으로 나누고, 영문·숫자는 단어 그대로 사용합니다.
+    """
+    text = unicodedata.normalize("NFKC", text).lower()
+    tokens = []
+    for word in _WORD_PATTERN.findall(text):
+        if "가" <= word[0] <= "힣":
+            if len(word) == 1:
+                tokens.append(word)
+            else:
+                tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        else:
+            tokens.append(word)
+    return tokens
+
+
+def _kiwi_tokenizer() -> Callable[[str], List[str]]:
+    """형태소 분석 기반 토크나이저 (kiwipiepy 설치 시)"""
+    from kiwipiepy import Kiwi
+
+    kiwi = Kiwi()
+    content_tags = ("NN", "VV", "VA", "XR", "SL", "SN", "SH")
+
+    def tokenize(text: str) -> List[str]:
+        text = unicodedata.normalize("NFKC", text).lower()
+        return [token.form for token in kiwi.tokenize(text) if token.tag.startswith(content_tags)]
+
+    return tokenize
+
+
+def get_tokenizer(name: str) -> Tuple[str, Callable[[str], List[str]]]:
+    """이름으로 토크나이저 선택, 실제 사용하는 (이름, 함수) 반환"""
+    if name == "kiwi":
+        try:
+            return "kiwi", _kiwi_tokenizer()
+        except ImportError:
+            logger.warning("kiwipiepy가 설치되어 있지 않아 문자 바이그램 토크나이저를 사용합니다")
+    return "ngram", ngram_tokenizer
+
+
+class BM25Index:
+    """역색인 기반 BM25 인덱스
+
+    용어별 포스팅(청크 번호, 미리 계산한 BM25 가중치)을 CSR 형식 배열로 보관하므로,
+    질의 시 질의어가 등장하는 후보 청크만 합산합니다.
+    """
+
+    def __init__(self, vocab: Dict[str, int], indptr: np.ndarray, doc_ids: np.ndarray,
+                 weights: np.ndarray, doc_count: int, tokenizer_name: str = "ngram"):
+        self.vocab = vocab
+        self.indptr = indptr
+        self.doc_ids = doc_ids
+        self.weights = weights
+        self.doc_count = doc_count
+        self.tokenizer_name, self.tokenize = get_tokenizer(tokenizer_name)
+
+    @classmethod
+    def build(cls, texts: List[str], tokenizer_name: str = "ngram", k1: float = 1.5, b: float = 0.75) -> "BM25Index":
+        """텍스트 목록으로 인덱스 생성"""
+        tokenizer_name, tokenize = get_tokenizer(tokenizer_name)
+
+        vocab: Dict[str, int] = {}
+        postings: List[List[Tuple[int, int]]] = []
+        doc_lengths = np.zeros(len(texts), dtype=np.float32)
+
+        for doc_id, text in enumerate(texts):
+            counts = Counter(tokenize(text))
+            doc_lengths[doc_id] = sum(counts.values())
+            for term, tf in counts.items():
+                term_id = vocab.setdefault(term, len(vocab))
+                if term_id == len(postings):
+                    postings.append([])
+                postings[term_id].append((doc_id, tf))
+
+        doc_count = len(texts)
+        avgdl = float(doc_lengths.mean()) if doc_count else 0.0
+
+        indptr = np.zeros(len(postings) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([len(plist) for plist in postings])
+        doc_ids = np.fromiter((doc_id for plist in postings for doc_id, _ in plist), dtype=np.int32, count=indptr[-1])
+        tfs = np.fromiter((tf for plist in postings for _, tf in plist), dtype=np.float32, count=indptr[-1])
+
+        # IDF (Lucene 방식, 항상 양수)와 문서 길이 정규화를 포스팅 가중치에 미리 반영
+        df = np.diff(indptr).astype(np.float32)
+        idf = np.log1p((doc_count - df + 0.5) / (df + 0.5))
+        length_norm = k1 * (1 - b + b * doc_lengths[doc_ids] / avgdl) if avgdl else np.full_like(tfs, k1)
+        weights = np.repeat(idf, np.diff(indptr)) * tfs * (k1 + 1) / (tfs + length_norm)
+
+        return cls(vocab, indptr, doc_ids, weights.astype(np.float32), doc_count, tokenizer_name)
+
+    def state(self) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+        """저장용 (메타데이터, 배열) 반환"""
+        meta = {
+            "tokenizer": self.tokenizer_name,
+            "doc_count": self.doc_count,
+            "terms": sorted(self.vocab, key=self.vocab.get)
+        }
+        arrays = {"indptr": self.indptr, "doc_ids": self.doc_ids, "weights": self.weights}
+        return meta, arrays
+
+    @classmethod
+    def from_state(cls, meta: Dict[str, Any], arrays: Dict[str, np.ndarray]) -> "BM25Index":
+        """저장된 상태로 인덱스 복원"""
+        vocab = {term: i for i, term in enumerate(meta["terms"])}
+        return cls(vocab, arrays["indptr"], arrays["doc_ids"], arrays["weights"],
+                   meta["doc_count"], meta["tokenizer"])
+
+    def idf(self, terms: List[str]) -> np.ndarray:
+        """용어별 IDF (Lucene 방식, 색인에 없는 용어는 최대값)"""
+        df = np.array([
+            self.indptr[self.vocab[term] + 1] - self.indptr[self.vocab[term]] if term in self.vocab else 0
+            for term in terms
+        ], dtype=np.float32)
+        return np.log1p((self.doc_count - df + 0.5) / (df + 0.5))
+
+    def candidate_scores(self, query: str, mask: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """질의어가 등장하는 후보 청크 번호와 BM25 점수 (mask가 주어지면 True인 청크만)"""
+        query_terms = Counter(term for term in self.tokenize(query) if term in self.vocab)
+        if not query_terms:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)
+
+        doc_id_parts = []
+        weight_parts = []
+        for term, count in query_terms.items():
+            term_id = self.vocab[term]
+            start, end = self.indptr[term_id], self.indptr[term_id + 1]
+            doc_id_parts.append(self.doc_ids[start:end])
+            weight_parts.append(self.weights[start:end] * count if count > 1 else self.weights[start:end])
+
+        doc_ids = np.concatenate(doc_id_parts)
+        weights = np.concatenate(weight_parts)
+        if mask is not None:
+            keep = mask[doc_ids]
+            doc_ids, weights = doc_ids[keep], weights[keep]
+
+        candidates, inverse = np.unique(doc_ids, return_inverse=True)
+        scores = np.bincount(inverse, weights=weights, minlength=len(candidates)).astype(np.float32)
+        return candidates, scores
+
+    def search(self, query: str, k: int = 3, mask: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """상위 k개 청크 번호와 BM25 점수"""
+        candidates, scores = self.candidate_scores(query, mask)
+        k = min(k, len(candidates))
+        if k <= 0:
+            return candidates, scores
+
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return candidates[top], scores[top]
+
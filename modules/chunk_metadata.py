@@ -0,0 +1,122 @@
+import re
+from datetime import date
+from typing import List, Dict, Any, Optional, Tuple, Union
+
+import numpy as np
+from langchain.schema.document import Document
+
+# 파일명의 날짜 (2024-05-01, 2024.05.01, 20240501 등)
+_FILENAME_DATE_PATTERN = re.compile(r"(20\d{2})[-._]?(0[1-9]|1[0-2])[-._]?(0[1-9]|[12]\d|3[01])")
+# 파일명의 "(2024년 5월)" 형식 (일자는 1일로 간주)
+_FILENAME_MONTH_PATTERN = re.compile(r"(20\d{2})년\s*(\d{1,2})월")
+# 본문 머리말의 날짜 행 (date: 2024-05-01, 발행일: 2024.5.1 등)
+_HEADER_DATE_PATTERN = re.compile(
+    r"^\s*(?:date|published|발행일|작성일|게시일|날짜)\s*[:：]\s*(20\d{2})[-./년\s]+(\d{1,2})[-./월\s]+(\d{1,2})",
+    re.IGNORECASE | re.MULTILINE
+)
+HEADER_SCAN_CHARS = 500
+_EPOCH = date(1970, 1, 1)
+
+
+def _to_date(year, month, day) -> Optional[date]:
+    try:
+        return date(int(year), int(month), int(day))
+    except ValueError:
+        return None
+
+
+def parse_published_date(file_name: str, content: str) -> Optional[str]:
+    """파일명 또는 본문 머리말에서 게시일을 찾아 YYYY-MM-DD로 반환 (없으면 None)"""
+    match = _FILENAME_DATE_PATTERN.search(file_name)
+    if match:
+        parsed = _to_date(*match.groups())
+        if parsed:
+            return parsed.isoformat()
+
+    match = _HEADER_DATE_PATTERN.search(content[:HEADER_SCAN_CHARS])
+    if match:
+        parsed = _to_date(*match.groups())
+        if parsed:
+            return parsed.isoformat()
+
+    match = _FILENAME_MONTH_PATTERN.search(file_name)
+    if match:
+        parsed = _to_date(match.group(1), match.group(2), 1)
+        if parsed:
+            return parsed.isoformat()
+
+    return None
+
+
+def normalize_filters(source_type: Union[str, List[str], None] = None, date_from: Optional[str] = None,
+                      date_to: Optional[str] = None) -> Dict[str, Any]:
+    """검색 필터 검증 및 정규화 (잘못된 값은 ValueError, 지정하지 않은 항목은 제외)"""
+    filters = {}
+    if source_type:
+        source_types = [source_type] if isinstance(source_type, str) else list(source_type)
+        filters["source_type"] = sorted({str(value).strip() for value in source_types if str(value).strip()})
+    if date_from:
+        filters["date_from"] = date.fromisoformat(str(date_from)).isoformat()
+    if date_to:
+        filters["date_to"] = date.fromisoformat(str(date_to)).isoformat()
+    if "date_from" in filters and "date_to" in filters and filters["date_from"] > filters["date_to"]:
+        raise ValueError("date_from이 date_to보다 늦습니다")
+    return filters
+
+
+class ChunkMetadataIndex:
+    """청크 메타데이터(소스 타입, 게시일)를 배열로 보관해 검색 전 후보 마스크를 만드는 인덱스
+
+    게시일은 1970-01-01부터의 일수로 저장하며, 게시일이 없는 청크(-1)는
+    날짜 범위를 지정한 검색에서 제외됩니다.
+    """
+
+    NO_DATE = -1
+
+    def __init__(self, chunks: List[Document]):
+        self.source_types = sorted({chunk.metadata.get("source_type", "") for chunk in chunks})
+        code_of = {source_type: code for code, source_type in enumerate(self.source_types)}
+        self.source_codes = np.fromiter(
+            (code_of[chunk.metadata.get("source_type", "")] for chunk in chunks), dtype=np.int16, count=len(chunks)
+        )
+        self.published_days = np.fromiter(
+            (self._days(chunk.metadata.get("published_date")) for chunk in chunks), dtype=np.int32, count=len(chunks)
+        )
+
+    @classmethod
+    def _days(cls, value: Optional[str]) -> int:
+        if not value:
+            return cls.NO_DATE
+        try:
+            return (date.fromisoformat(value) - _EPOCH).days
+        except ValueError:
+            return cls.NO_DATE
+
+    def filter(self, filters: Optional[Dict[str, Any]]) -> Tuple[Optional[np.ndarray], Optional[Dict[str, Any]]]:
+        """정규화된 필터로 (청크 마스크, Chroma where 조건) 생성 (필터가 없으면 (None, None))"""
+        if not filters:
+            return None, None
+
+        mask = np.ones(len(self.source_codes), dtype=bool)
+        conditions = []
+
+        if filters.get("source_type"):
+            codes = [self.source_types.index(value) for value in filters["source_type"] if value in self.source_types]
+            mask &= np.isin(self.source_codes, codes)
+            conditions.append({"source_type": {"$in": list(filters["source_type"])}})
+
+        if filters.get("date_from") or filters.get("date_to"):
+            mask &= self.published_days != self.NO_DATE
+            if filters.get("date_from"):
+                mask &= self.published_days >= self._days(filters["date_from"])
+            if filters.get("date_to"):
+                mask &= self.published_days <= self._days(filters["date_to"])
+            # Chroma는 문자열 범위 비교를 지원하지 않아 범위 안의 게시일 목록으로 조건 구성
+            dates = [
+                date.fromordinal(_EPOCH.toordinal() + int(days)).isoformat()
+                for days in np.unique(self.published_days[mask])
+            ]
+            conditions.append({"published_date": {"$in": dates or [""]}})
+
+        where = conditions[0] if len(conditions) == 1 else {"$and": conditions}
+        return mask, where
@@ -0,0 +1,99 @@
+import hashlib
+from typing import List, Dict, Any, Callable
+
+# 예산이 이보다 적게 남으면 잘라서라도 넣지 않음
+MIN_PARTIAL_TOKENS = 50
+
+# 청크 사이 간격이 이 글자 수 이하면 맞닿은 것으로 보고 병합 (분할 시 제거된 줄바꿈 등)
+MAX_MERGE_GAP = 2
+
+
+def _hit_score(hit: Dict[str, Any]) -> float:
+    return hit["rerank_score"] if hit.get("rerank_score") is not None else hit["score"]
+
+
+def merge_hits(hits: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """같은 파일에서 겹치거나 맞닿은 청크를 하나의 구간으로 병합
+
+    청크 메타데이터의 start_index(원문 내 시작 위치)로 구간을 정렬해 겹치는 부분은
+    한 번만 남깁니다. start_index가 없는 청크는 병합하지 않습니다.
+    내용이 같은 청크는 한 번만 포함합니다.
+    반환 항목: {"document"(첫 청크), "text", "score"(구간 내 최고 점수), "chunk_count"}
+    """
+    groups: Dict[Any, List[Dict[str, Any]]] = {}
+    for i, hit in enumerate(hits):
+        metadata = hit["document"].metadata
+        if metadata.get("start_index") is None:
+            key = ("single", i)
+        else:
+            key = (metadata.get("source_type"), metadata.get("file_name"))
+        groups.setdefault(key, []).append(hit)
+
+    spans = []
+    seen_texts = set()
+    for key, group in groups.items():
+        if key[0] != "single":
+            group = sorted(group, key=lambda hit: hit["document"].metadata["start_index"])
+
+        current = None
+        for hit in group:
+            doc = hit["document"]
+            text = doc.page_content
+            text_hash = hashlib.sha256(text.encode('utf-8')).digest()
+            if text_hash in seen_texts:
+                continue
+            seen_texts.add(text_hash)
+
+            start = doc.metadata.get("start_index")
+            if current is not None and start is not None and start <= current["end"] + MAX_MERGE_GAP:
+                # 겹치는 앞부분을 제외하고 이어 붙임
+                overlap = current["end"] - start
+                if overlap < 0:
+                    current["text"] += "\n" + text
+                    current["end"] = start + len(text)
+                elif overlap < len(text):
+                    current["text"] += text[overlap:]
+                    current["end"] = start + len(text)
+                current["score"] = max(current["score"], _hit_score(hit))
+                current["chunk_count"] += 1
+                continue
+
+            current = {
+                "document": doc,
+                "text": text,
+                "score": _hit_score(hit),
+                "chunk_count": 1,
+                "end": (start + len(text)) if start is not None else None
+            }
+            spans.append(current)
+
+    for span in spans:
+        span.pop("end")
+    return spans
+
+
+def select_spans(spans: List[Dict[str, Any]], max_tokens: int, count_tokens: Callable[[str], int],
+                 truncate: Callable[[str, int], str]) -> List[Dict[str, Any]]:
+    """점수 순으로 토큰 예산을 채울 구간 선택
+
+    예산을 넘는 구간은 건너뛰되, 아직 아무것도 넣지 못했거나 남은 예산이 충분하면
+    남은 토큰만큼 잘라서 넣습니다. 각 항목에 "tokens"가 추가됩니다.
+    """
+    selected = []
+    used_tokens = 0
+    for span in sorted(spans, key=lambda span: span["score"], reverse=True):
+        remaining = max_tokens - used_tokens
+        if remaining <= 0:
+            break
+
+        tokens = count_tokens(span["text"])
+        if tokens > remaining:
+            if selected and remaining < MIN_PARTIAL_TOKENS:
+                continue
+            span = dict(span, text=truncate(span["text"], remaining), truncated=True)
+            tokens = count_tokens(span["text"])
+
+        selected.append(dict(span, tokens=tokens))
+        used_tokens += tokens
+
+    return selected
@@ -0,0 +1,44 @@
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+class DenseIndex:
+    """청크 임베딩을 연속된 float32 행렬로 보관하는 프로세스 내 벡터 검색 인덱스
+
+    행렬은 메모리 매핑된 배열이어도 되며, 복사 없이 노름만 따로 계산해
+    코사인 유사도(정규화된 내적)로 top-k를 구합니다.
+    """
+
+    def __init__(self, embeddings: np.ndarray):
+        self.matrix = embeddings if embeddings.dtype == np.float32 else embeddings.astype(np.float32)
+        norms = np.linalg.norm(self.matrix, axis=1)
+        norms[norms == 0] = 1.0
+        self.inv_norms = (1.0 / norms).astype(np.float32)
+
+    def __len__(self):
+        return len(self.matrix)
+
+    def scores(self, query_vector) -> np.ndarray:
+        """모든 청크와의 코사인 유사도"""
+        query = np.asarray(query_vector, dtype=np.float32)
+        query_norm = np.linalg.norm(query)
+        if query_norm:
+            query = query / query_norm
+        return (self.matrix @ query) * self.inv_norms
+
+    def search(self, query_vector, k: int = 3, mask: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """상위 k개 청크 번호와 유사도 (mask가 주어지면 True인 청크만 대상)"""
+        scores = self.scores(query_vector)
+        if mask is not None:
+            scores = np.where(mask, scores, -np.inf)
+            k = min(k, int(mask.sum()))
+        k = min(k, len(scores))
+        if k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        # 전체 정렬 대신 argpartition으로 상위 k개만 고른 뒤 정렬
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return top, scores[top]
+
@@ -0,0 +1,186 @@
+import os
+import logging
+import threading
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+
+from modules.rag_index import content_sha256
+
+logger = logging.getLogger('document_catalog')
+
+# 목록 정렬 기준
+SORT_FIELDS = ("name", "title", "size", "mtime")
+
+
+class DocumentCatalog:
+    """문서 디렉토리(*.md)의 목록과 본문을 메모리에 보관하는 카탈로그
+
+    refresh()는 디렉토리를 훑어 크기나 수정 시각이 바뀐 파일만 다시 읽으며,
+    start_watcher()는 이를 poll_interval초마다 백그라운드에서 실행합니다.
+    항목은 교체만 되고 수정되지 않으므로 조회 측은 잠금 없이 읽습니다.
+    항목: {"source_type", "file_name", "title", "path", "size", "mtime", "sha256", "content"}
+    """
+
+    def __init__(self, directories: Dict[str, Path], poll_interval: float = 5.0):
+        self.directories = {source_type: Path(directory) for source_type, directory in directories.items()}
+        self.poll_interval = poll_interval
+        self.version = 0
+        self.loaded = False
+        # stats()용 집계 (refresh에서 갱신)
+        self.content_bytes = 0
+        self.file_counts = {source_type: 0 for source_type in self.directories}
+        self._entries: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._refresh_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._watcher = None
+
+    def refresh(self) -> Dict[str, int]:
+        """변경/추가/삭제된 파일 반영 (크기와 수정 시각이 같으면 다시 읽지 않음)"""
+        with self._refresh_lock:
+            entries = {}
+            added = updated = 0
+            for source_type, directory in self.directories.items():
+                if not directory.exists():
+                    continue
+                try:
+                    files = [item for item in os.scandir(directory) if item.name.endswith(".md") and item.is_file()]
+                except OSError as e:
+                    logger.error(f"문서 디렉토리 조회 오류: {directory}, {str(e)}")
+                    # 조회 실패 시 기존 항목 유지
+                    entries.update({key: entry for key, entry in self._entries.items() if key[0] == source_type})
+                    continue
+
+                for item in files:
+                    key = (source_type, item.name)
+                    previous = self._entries.get(key)
+                    try:
+                        stat = item.stat()
+                        if previous and previous["size"] == stat.st_size and previous["mtime"] == stat.st_mtime:
+                            entries[key] = previous
+                            continue
+                        entries[key] = self._read_entry(source_type, Path(item.path), stat)
+                        if previous:
+                            updated += 1
+                        else:
+                            added += 1
+                    except Exception as e:
+                        logger.error(f"파일 로드 오류: {item.path}, {str(e)}")
+                        if previous:
+                            entries[key] = previous
+
+            deleted = len(set(self._entries) - set(entries))
+            changed = added or updated or deleted
+            if changed or not self.loaded:
+                counts = {source_type: 0 for source_type in self.directories}
+                for source_type, _ in entries:
+                    counts[source_type] += 1
+                self.file_counts = counts
+                self.content_bytes = sum(entry["size"] for entry in entries.values())
+            self._entries = entries
+            self.loaded = True
+            if changed:
+                self.version += 1
+                logger.info(f"문서 카탈로그 갱신: 추가 {added}, 변경 {updated}, 삭제 {deleted} (총 {len(entries)}개)")
+            return {"added": added, "updated": updated, "deleted": deleted}
+
+    @staticmethod
+    def _read_entry(source_type: str, file_path: Path, stat) -> Dict[str, Any]:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        return {
+            "source_type": source_type,
+            "file_name": file_path.name,
+            "title": file_path.name.replace(".md", ""),
+            "path": file_path,
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            "sha256": content_sha256(content),
+            "content": content
+        }
+
+    def _ensure_loaded(self):
+        if not self.loaded:
+            self.refresh()
+
+    def entries(self, source_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """카탈로그 항목 목록 (source_type이 주어지면 해당 소스만)"""
+        self._ensure_loaded()
+        return [entry for key, entry in self._entries.items() if source_type is None or key[0] == source_type]
+
+    def get(self, source_type: str, file_name: str) -> Optional[Dict[str, Any]]:
+        """파일 항목 조회 (없으면 None)"""
+        self._ensure_loaded()
+        return self._entries.get((source_type, file_name))
+
+    def listing(self, source_type: str, sort: str = "name", order: str = "asc",
+                page: Optional[int] = None, per_page: Optional[int] = None) -> Dict[str, Any]:
+        """정렬·페이지 단위 파일 목록 (page를 지정하지 않으면 전체)
+
+        잘못된 정렬 기준이나 페이지 값은 ValueError
+        """
+        if sort not in SORT_FIELDS:
+            raise ValueError(f"지원하지 않는 정렬 기준: {sort} (사용 가능: {', '.join(SORT_FIELDS)})")
+        if order not in ("asc", "desc"):
+            raise ValueError(f"지원하지 않는 정렬 순서: {order}")
+
+        sort_key = "file_name" if sort == "name" else sort
+        entries = sorted(self.entries(source_type), key=lambda entry: entry[sort_key], reverse=order == "desc")
+        total = len(entries)
+
+        if page is not None or per_page is not None:
+            page = 1 if page is None else page
+            per_page = 50 if per_page is None else per_page
+            if page < 1 or per_page < 1:
+                raise ValueError("page와 per_page는 1 이상이어야 합니다")
+            entries = entries[(page - 1) * per_page:page * per_page]
+
+        return {
+            "files": [entry["file_name"] for entry in entries],
+            "items": [
+                {
+                    "file_name": entry["file_name"],
+                    "title": entry["title"],
+                    "size": entry["size"],
+                    "mtime": entry["mtime"]
+                }
+                for entry in entries
+            ],
+            "total": total,
+            "page": page,
+            "per_page": per_page,
+            "sort": sort,
+            "order": order
+        }
+
+    def start_watcher(self):
+        """poll_interval초마다 수정 시각을 확인하는 백그라운드 스레드 시작 (이미 실행 중이면 무시)"""
+        if self._watcher is not None or self.poll_interval <= 0:
+            return
+        self._stop_event.clear()
+        self._watcher = threading.Thread(target=self._watch, name="document-catalog-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watcher(self):
+        self._stop_event.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+    def _watch(self):
+        while True:
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"문서 카탈로그 갱신 오류: {str(e)}")
+            if self._stop_event.wait(self.poll_interval):
+                return
+
+    def stats(self) -> Dict[str, Any]:
+        """카탈로그 상태 (소스별 파일 수, 본문 총 바이트)"""
+        return {
+            "version": self.version,
+            "files": dict(self.file_counts),
+            "content_bytes": self.content_bytes,
+            "poll_interval": self.poll_interval,
+            "watching": self._watcher is not None
+        }
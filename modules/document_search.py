@@ -0,0 +1,173 @@
+import re
+import bisect
+import unicodedata
+from urllib.parse import quote
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+from markupsafe import escape
+from langchain.schema.document import Document
+
+from modules.bm25_index import ngram_tokenizer
+
+# 스니펫 길이 (글자 수)
+SNIPPET_CHARS = 160
+
+# 제목에 질의가 포함된 문서에 더하는 점수 (최고 본문 점수 대비 비율)
+TITLE_BOOST = 1.0
+
+# 최신 콘텐츠 파일명 앞의 번호나 날짜 ("33_", "2024-05-01_")
+_TITLE_PREFIX_PATTERN = re.compile(r"^(?:\d+|20\d{2}[-.]?\d{2}[-.]?\d{2})_")
+_WORD_PATTERN = re.compile(r"[0-9a-z]+|[가-힣]+")
+_HEADING_PATTERN = re.compile(r"^\s*#+\s*", re.MULTILINE)
+
+
+def view_url(source_type: str, file_name: str) -> str:
+    """문서 보기 페이지 경로"""
+    return f"/view/{quote(source_type)}/{quote(file_name)}"
+
+
+def normalize_text(text: str) -> str:
+    """검색 비교용 정규화 (NFKC, 소문자)"""
+    return unicodedata.normalize("NFKC", text).lower().strip()
+
+
+def _highlight_pattern(query: str) -> Optional[re.Pattern]:
+    """질의어(긴 것 우선)와 한글 바이그램을 찾는 정규식"""
+    words = _WORD_PATTERN.findall(normalize_text(query))
+    terms = set(words) | {token for token in ngram_tokenizer(query) if len(token) > 1}
+    if not terms:
+        return None
+    return re.compile("|".join(re.escape(term) for term in sorted(terms, key=len, reverse=True)), re.IGNORECASE)
+
+
+def highlight_snippet(text: str, query: str, max_chars: int = SNIPPET_CHARS) -> str:
+    """질의어가 가장 먼저 나오는 부분 주변을 잘라 <mark>로 강조한 HTML 스니펫"""
+    text = " ".join(_HEADING_PATTERN.sub("", text).split())
+    pattern = _highlight_pattern(query)
+    match = pattern.search(text) if pattern else None
+
+    start = max(0, match.start() - max_chars // 4) if match else 0
+    end = min(len(text), start + max_chars)
+    if start > 0:
+        space = text.find(" ", start, start + 20)
+        start = space + 1 if space != -1 else start
+    snippet = text[start:end]
+
+    parts = []
+    position = 0
+    for found in (pattern.finditer(snippet) if pattern else ()):
+        parts.append(str(escape(snippet[position:found.start()])))
+        parts.append(f"<mark>{escape(found.group())}</mark>")
+        position = found.end()
+    parts.append(str(escape(snippet[position:])))
+
+    return ("…" if start > 0 else "") + "".join(parts) + ("…" if end < len(text) else "")
+
+
+class DocumentSearcher:
+    """청크 BM25 인덱스로 문서 단위 순위를 매기는 전문 검색기 (LLM·임베딩 호출 없음)
+
+    청크 점수 중 문서별 최고 점수를 문서 점수로 쓰고, 그 청크에서 스니펫을 만듭니다.
+    """
+
+    def __init__(self, chunks: List[Document], bm25_index, metadata_index=None):
+        self.chunks = chunks
+        self.bm25_index = bm25_index
+        self.metadata_index = metadata_index
+
+        self.documents = []
+        codes = {}
+        self.doc_codes = np.empty(len(chunks), dtype=np.int32)
+        for row, chunk in enumerate(chunks):
+            metadata = chunk.metadata
+            key = (metadata.get("source_type"), metadata.get("file_name"))
+            code = codes.get(key)
+            if code is None:
+                code = codes[key] = len(self.documents)
+                self.documents.append({
+                    "source_type": metadata.get("source_type"),
+                    "file_name": metadata.get("file_name"),
+                    "title": metadata.get("title"),
+                    "published_date": metadata.get("published_date")
+                })
+            self.doc_codes[row] = code
+        self.title_keys = [normalize_text(document["title"] or "") for document in self.documents]
+
+    def search(self, query: str, limit: int = 10, filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """문서 순위 검색 → {"total", "results": [{"source_type", "file_name", "title", "published_date",
+        "score", "snippet", "url"}]}"""
+        mask = self.metadata_index.filter(filters)[0] if self.metadata_index is not None else None
+        candidates, scores = self.bm25_index.candidate_scores(query, mask)
+        if not len(candidates):
+            return {"total": 0, "results": []}
+
+        # 점수 내림차순으로 정렬한 뒤 문서별 첫 청크 = 문서 내 최고 점수 청크
+        order = np.argsort(-scores, kind="stable")
+        doc_codes = self.doc_codes[candidates[order]]
+        doc_ids, first = np.unique(doc_codes, return_index=True)
+        best_rows = candidates[order][first]
+        doc_scores = scores[order][first].astype(np.float32)
+
+        query_key = normalize_text(query)
+        if query_key:
+            in_title = np.fromiter((query_key in self.title_keys[doc_id] for doc_id in doc_ids.tolist()),
+                                   dtype=bool, count=len(doc_ids))
+            doc_scores = doc_scores + in_title * (TITLE_BOOST * float(doc_scores.max()))
+
+        top = np.argsort(-doc_scores, kind="stable")[:limit]
+        results = []
+        for i in top.tolist():
+            document = self.documents[int(doc_ids[i])]
+            results.append(dict(
+                document,
+                score=round(float(doc_scores[i]), 4),
+                snippet=highlight_snippet(self.chunks[int(best_rows[i])].page_content, query),
+                url=view_url(document["source_type"], document["file_name"])
+            ))
+        return {"total": len(doc_ids), "results": results}
+
+
+class TitleIndex:
+    """문서 제목 접두어 자동완성 (정규화한 제목을 정렬한 배열에서 이진 탐색)
+
+    최신 콘텐츠처럼 번호·날짜로 시작하는 제목은 그 부분을 뗀 제목으로도 찾을 수 있습니다.
+    """
+
+    def __init__(self, entries: List[Dict[str, Any]]):
+        items = []
+        for entry in entries:
+            title = entry["title"]
+            keys = {normalize_text(title), normalize_text(_TITLE_PREFIX_PATTERN.sub("", title))}
+            for key in keys:
+                if key:
+                    items.append((key, entry["source_type"], entry["file_name"], title))
+        items.sort()
+        self.keys = [item[0] for item in items]
+        self.items = items
+
+    def __len__(self):
+        return len(self.items)
+
+    def complete(self, prefix: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """접두어로 시작하는 제목 (가나다순, 같은 문서는 한 번만)"""
+        prefix = normalize_text(prefix)
+        if not prefix:
+            return []
+
+        suggestions = []
+        seen = set()
+        position = bisect.bisect_left(self.keys, prefix)
+        while position < len(self.keys) and self.keys[position].startswith(prefix) and len(suggestions) < limit:
+            _, source_type, file_name, title = self.items[position]
+            position += 1
+            if (source_type, file_name) in seen:
+                continue
+            seen.add((source_type, file_name))
+            suggestions.append({
+                "title": title,
+                "source_type": source_type,
+                "file_name": file_name,
+                "url": view_url(source_type, file_name)
+            })
+        return suggestions
@@ -0,0 +1,152 @@
+import time
+import random
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
+
+from langchain_core.embeddings import Embeddings
+
+from modules.token_counter import count_tokens
+
+logger = logging.getLogger('embedding_batcher')
+
+
+def _is_rate_limit_error(error: Exception) -> bool:
+    """429 (요청 한도 초과) 오류인지 확인"""
+    if type(error).__name__ == "RateLimitError":
+        return True
+    status_code = getattr(error, "status_code", None) or getattr(getattr(error, "response", None), "status_code", None)
+    return status_code == 429
+
+
+def _is_transient_error(error: Exception) -> bool:
+    """재시도할 만한 일시적 오류인지 확인 (연결 오류, 타임아웃, 5xx)"""
+    if type(error).__name__ in ("APIConnectionError", "APITimeoutError", "InternalServerError"):
+        return True
+    status_code = getattr(error, "status_code", None)
+    return bool(status_code and status_code >= 500)
+
+
+def _retry_after_seconds(error: Exception):
+    """응답의 Retry-After 헤더 값 (없으면 None)"""
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after")) if headers.get("retry-after") else None
+    except (TypeError, ValueError):
+        return None
+
+
+class BatchedEmbeddings(Embeddings):
+    """토큰 수 기준 배치를 여러 스레드로 동시에 임베딩하는 래퍼
+
+    429 응답을 받으면 모든 워커가 공유하는 대기 시간을 늘려 전체 요청 속도를 낮추고,
+    성공이 이어지면 대기 시간을 다시 줄입니다.
+    """
+
+    def __init__(self, underlying: Embeddings, model: str, max_batch_tokens: int = 16000,
+                 max_batch_size: int = 512, max_workers: int = 4, max_retries: int = 6,
+                 base_delay: float = 1.0, max_delay: float = 60.0):
+        self.underlying = underlying
+        self.model = model
+        self.max_batch_tokens = max_batch_tokens
+        self.max_batch_size = max_batch_size
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        self._lock = threading.Lock()
+        self._penalty = 0.0
+        self._cooldown_until = 0.0
+        self.rate_limited_count = 0
+
+    def make_batches(self, texts: List[str]) -> List[Tuple[int, int]]:
+        """토큰 예산과 최대 입력 수를 넘지 않는 (시작, 끝) 구간 목록"""
+        batches = []
+        start = 0
+        batch_tokens = 0
+        for i, text in enumerate(texts):
+            tokens = count_tokens(text, self.model)
+            if i > start and (batch_tokens + tokens > self.max_batch_tokens or i - start >= self.max_batch_size):
+                batches.append((start, i))
+                start = i
+                batch_tokens = 0
+            batch_tokens += tokens
+        if start < len(texts):
+            batches.append((start, len(texts)))
+        return batches
+
+    def _wait_for_cooldown(self):
+        """다른 워커가 429를 받은 경우 공유 대기 시간만큼 대기"""
+        while True:
+            with self._lock:
+                remaining = self._cooldown_until - time.time()
+            if remaining <= 0:
+                return
+            time.sleep(remaining)
+
+    def _on_rate_limit(self, error: Exception) -> float:
+        """대기 시간을 늘리고 이번 재시도까지 기다릴 시간 반환"""
+        with self._lock:
+            self.rate_limited_count += 1
+            self._penalty = min(self.max_delay, max(self.base_delay, self._penalty * 2))
+            delay = _retry_after_seconds(error) or self._penalty * random.uniform(0.5, 1.5)
+            self._cooldown_until = max(self._cooldown_until, time.time() + delay)
+            return delay
+
+    def _on_success(self):
+        with self._lock:
+            self._penalty /= 2
+            if self._penalty < self.base_delay / 4:
+                self._penalty = 0.0
+
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        for attempt in range(self.max_retries + 1):
+            self._wait_for_cooldown()
+            try:
+                vectors = self.underlying.embed_documents(texts)
+                self._on_success()
+                return vectors
+            except Exception as e:
+                if attempt >= self.max_retries:
+                    raise
+                if _is_rate_limit_error(e):
+                    delay = self._on_rate_limit(e)
+                    logger.warning(f"임베딩 요청 한도 초과 (시도 {attempt+1}/{self.max_retries}), {delay:.1f}초 후 재시도")
+                elif _is_transient_error(e):
+                    delay = min(self.max_delay, self.base_delay * (2 ** attempt)) * random.uniform(0.5, 1.5)
+                    logger.warning(f"임베딩 요청 실패 (시도 {attempt+1}/{self.max_retries}): {str(e)}")
+                    time.sleep(delay)
+                else:
+                    raise
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+
+        batches = self.make_batches(texts)
+        if len(batches) == 1:
+            return self._embed_batch(texts)
+
+        logger.info(f"임베딩 시작: {len(texts)}개 텍스트, {len(batches)}개 배치, 동시 요청 {self.max_workers}개")
+        start_time = time.time()
+
+        results: List[List[float]] = [None] * len(texts)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(self._embed_batch, texts[start:end]): (start, end)
+                for start, end in batches
+            }
+            for done, future in enumerate(futures, start=1):
+                start, end = futures[future]
+                results[start:end] = future.result()
+                if done % 10 == 0:
+                    logger.info(f"처리 중: {done}/{len(batches)} 배치")
+
+        elapsed = time.time() - start_time
+        logger.info(f"임베딩 완료: {len(texts)}개 텍스트 ({elapsed:.2f}초 소요, 429 응답 {self.rate_limited_count}회)")
+        return results
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.underlying.embed_query(text)
@@ -0,0 +1,120 @@
+import sqlite3
+import threading
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from modules.rag_index import content_sha256
+
+# SQLite 바인드 변수 제한을 넘지 않도록 조회를 나누는 단위
+LOOKUP_BATCH_SIZE = 500
+
+
+class EmbeddingCache:
+    """(모델명, 텍스트 sha256)을 키로 임베딩을 저장하는 SQLite 캐시
+
+    WAL 모드로 열기 때문에 여러 워커 프로세스와 인덱스 재생성 간에 공유할 수 있습니다.
+    """
+
+    def __init__(self, db_path, model: str):
+        self.db_path = Path(db_path)
+        self.model = model
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                PRIMARY KEY (model, text_hash)
+            )
+            """
+        )
+        self._conn.commit()
+
+    def get_many(self, texts: List[str]) -> List[Optional[np.ndarray]]:
+        """텍스트 목록의 캐시된 임베딩 조회 (없는 항목은 None)"""
+        hashes = [content_sha256(text) for text in texts]
+        found = {}
+
+        with self._lock:
+            unique_hashes = list(dict.fromkeys(hashes))
+            for i in range(0, len(unique_hashes), LOOKUP_BATCH_SIZE):
+                batch = unique_hashes[i:i + LOOKUP_BATCH_SIZE]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings WHERE model = ? AND text_hash IN ({placeholders})",
+                    [self.model] + batch
+                ).fetchall()
+                for text_hash, blob in rows:
+                    found[text_hash] = np.frombuffer(blob, dtype=np.float32)
+
+        results = [found.get(text_hash) for text_hash in hashes]
+        hit_count = sum(1 for vector in results if vector is not None)
+        self.hits += hit_count
+        self.misses += len(results) - hit_count
+        return results
+
+    def put_many(self, texts: List[str], vectors: List[List[float]]):
+        """임베딩을 캐시에 저장"""
+        rows = [
+            (self.model, content_sha256(text), np.asarray(vector, dtype=np.float32).tobytes())
+            for text, vector in zip(texts, vectors)
+        ]
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, text_hash, vector) VALUES (?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 적중/실패 통계"""
+        total = self.hits + self.misses
+        return {
+            "model": self.model,
+            "path": str(self.db_path),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else None
+        }
+
+
+class CachedEmbeddings(Embeddings):
+    """문서 임베딩 시 캐시를 먼저 조회하고 없는 텍스트만 하위 임베딩 모델로 계산
+
+    질의 임베딩은 캐시하지 않습니다 (매번 다른 문장이 대부분이므로).
+    """
+
+    def __init__(self, underlying: Embeddings, cache: EmbeddingCache):
+        self.underlying = underlying
+        self.cache = cache
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        cached = self.cache.get_many(texts)
+
+        # 같은 텍스트가 여러 번 나와도 한 번만 계산
+        missing_texts = list(dict.fromkeys(text for text, vector in zip(texts, cached) if vector is None))
+        computed = {}
+        if missing_texts:
+            vectors = self.underlying.embed_documents(missing_texts)
+            self.cache.put_many(missing_texts, vectors)
+            computed = dict(zip(missing_texts, vectors))
+
+        return [
+            vector.tolist() if vector is not None else list(computed[text])
+            for text, vector in zip(texts, cached)
+        ]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.underlying.embed_query(text)
@@ -0,0 +1,143 @@
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, Any, Callable, Hashable, Optional
+
+from werkzeug.wrappers import Request, Response
+
+try:
+    import brotli
+except ImportError:  # brotli가 없으면 gzip만 제공
+    brotli = None
+
+# 이보다 작은 본문은 압축하지 않음
+MIN_COMPRESS_BYTES = 512
+
+# 압축 대상 MIME 타입 (이미지 등 이미 압축된 형식 제외)
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml")
+
+# 같은 품질일 때 선호하는 인코딩 순서
+ENCODING_PREFERENCE = ("br", "gzip", "identity")
+ETAG_SUFFIXES = {"identity": "", "gzip": "-gz", "br": "-br"}
+
+
+class Representation:
+    """본문과 미리 압축한 변형(gzip, brotli), 검증자(ETag, Last-Modified)를 묶은 HTTP 응답 표현
+
+    ETag는 본문 sha256에서 만든 강한 검증자이며, 인코딩별로 접미사를 붙여 구분합니다.
+    """
+
+    def __init__(self, body: bytes, content_type: str, last_modified: Optional[float] = None,
+                 digest: Optional[str] = None):
+        self.content_type = content_type
+        self.last_modified = datetime.fromtimestamp(int(last_modified), timezone.utc) if last_modified else None
+        self.digest = (digest or hashlib.sha256(body).hexdigest())[:32]
+        self.variants: Dict[str, bytes] = {"identity": body}
+
+        if len(body) >= MIN_COMPRESS_BYTES and content_type.startswith(COMPRESSIBLE_TYPES):
+            compressed = gzip.compress(body, compresslevel=9, mtime=0)
+            if len(compressed) < len(body):
+                self.variants["gzip"] = compressed
+            if brotli is not None:
+                compressed = brotli.compress(body, quality=11)
+                if len(compressed) < len(body):
+                    self.variants["br"] = compressed
+
+    def etag(self, encoding: str = "identity") -> str:
+        """인코딩별 ETag 값 (따옴표 제외)"""
+        return f"{self.digest}{ETAG_SUFFIXES[encoding]}"
+
+    @property
+    def size_bytes(self) -> int:
+        return sum(len(variant) for variant in self.variants.values())
+
+    def negotiate(self, request: Request) -> str:
+        """Accept-Encoding에 따라 보낼 인코딩 선택"""
+        best, best_quality = "identity", 0.0
+        for encoding in ENCODING_PREFERENCE:
+            if encoding not in self.variants:
+                continue
+            quality = request.accept_encodings[encoding] if encoding != "identity" else 0.001
+            if quality > best_quality:
+                best, best_quality = encoding, quality
+        return best
+
+    def not_modified(self, request: Request) -> bool:
+        """조건부 요청이 현재 표현과 일치하는지 (If-None-Match 우선, 없으면 If-Modified-Since)"""
+        if request.if_none_match:
+            if request.if_none_match.star_tag:
+                return True
+            return any(request.if_none_match.contains_weak(self.etag(encoding)) for encoding in self.variants)
+        if request.if_modified_since and self.last_modified:
+            return self.last_modified <= request.if_modified_since
+        return False
+
+    def response(self, request: Request, cache_control: str) -> Response:
+        """조건부 GET을 처리한 응답 (일치하면 본문 없는 304)"""
+        encoding = self.negotiate(request)
+        if self.not_modified(request):
+            response = Response(status=304)
+        else:
+            response = Response(self.variants[encoding], content_type=self.content_type)
+            if encoding != "identity":
+                response.headers["Content-Encoding"] = encoding
+
+        response.set_etag(self.etag(encoding))
+        response.headers["Cache-Control"] = cache_control
+        if self.last_modified:
+            response.last_modified = self.last_modified
+        if len(self.variants) > 1:
+            response.vary.add("Accept-Encoding")
+        return response
+
+
+class RepresentationCache:
+    """키별 Representation LRU 캐시
+
+    version(본문 해시, 파일 수정 시각 등)이 바뀌었을 때만 표현을 다시 만들므로
+    파일마다 해시와 압축은 내용이 바뀔 때 한 번만 계산됩니다.
+    보관 중인 바이트 수는 추가·교체·제거 시 갱신하므로 stats()는 항목 수와 무관하게 상수 시간입니다.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._bytes = 0
+
+    def get(self, key: Hashable, version: Hashable, build: Callable[[], Representation]) -> Representation:
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None and cached[0] == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached[1]
+            self.misses += 1
+
+        # 압축은 잠금 밖에서 수행 (같은 키가 동시에 만들어져도 결과는 동일)
+        representation = build()
+        with self._lock:
+            replaced = self._entries.get(key)
+            if replaced is not None:
+                self._bytes -= replaced[1].size_bytes
+            self._entries[key] = (version, representation)
+            self._bytes += representation.size_bytes
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted.size_bytes
+        return representation
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "bytes": self._bytes,
+            "brotli": brotli is not None
+        }
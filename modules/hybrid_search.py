@@ -0,0 +1,104 @@
+from concurrent.futures import Executor
+from typing import List, Dict, Any, Callable, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain.schema.document import Document
+
+from modules.chunk_metadata import ChunkMetadataIndex
+
+# RRF 상수 (EnsembleRetriever 기본값과 동일)
+RRF_C = 60
+
+
+def reciprocal_rank_fusion(rankings: Sequence[np.ndarray], weights: Sequence[float],
+                           c: int = RRF_C) -> Tuple[np.ndarray, np.ndarray]:
+    """가중 RRF로 여러 순위 목록(청크 번호 배열)을 합쳐 (청크 번호, 점수)를 점수 내림차순으로 반환
+
+    각 목록에서 순위 r(1부터)의 청크는 weight / (c + r)을 받으며,
+    같은 청크 번호의 점수는 합산됩니다.
+    """
+    id_parts = []
+    score_parts = []
+    for ids, weight in zip(rankings, weights):
+        if len(ids) and weight:
+            id_parts.append(np.asarray(ids, dtype=np.int64))
+            score_parts.append(weight / (c + np.arange(1, len(ids) + 1, dtype=np.float32)))
+
+    if not id_parts:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+    candidates, inverse = np.unique(np.concatenate(id_parts), return_inverse=True)
+    scores = np.bincount(inverse, weights=np.concatenate(score_parts), minlength=len(candidates))
+    order = np.argsort(-scores, kind="stable")
+    return candidates[order], scores[order].astype(np.float32)
+
+
+class HybridSearcher:
+    """청크 목록, BM25 인덱스, 벡터 검색 함수를 묶은 검색 스냅샷
+
+    인덱스 갱신 시 새 스냅샷을 만들어 참조만 교체하므로, 진행 중인 검색은
+    항상 서로 일치하는 청크·인덱스 조합으로 끝납니다.
+    dense_search는 (질의 임베딩, k, 청크 마스크, Chroma where 조건) -> (청크 번호 배열, 유사도 배열)
+    함수이며, None이면 BM25만으로 검색합니다.
+    """
+
+    def __init__(self, chunks: List[Document], bm25_index,
+                 dense_search: Optional[Callable[..., Tuple[np.ndarray, np.ndarray]]] = None):
+        self.chunks = chunks
+        self.bm25_index = bm25_index
+        self.dense_search = dense_search
+        self.metadata_index = ChunkMetadataIndex(chunks)
+
+    @property
+    def hybrid(self) -> bool:
+        return self.dense_search is not None
+
+    def search(self, query: str, embed_query: Callable[[str], Any], k: int, weights: Sequence[float],
+               fetch_k: int, executor: Optional[Executor] = None,
+               filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """벡터 검색과 BM25 검색을 동시에 실행하고 RRF로 합친 상위 k개 반환
+
+        filters(소스 타입, 게시일 범위)가 주어지면 점수 계산 전에 후보 청크를 제한합니다.
+        결과 항목: {"document", "score"(RRF), "dense_score", "bm25_score"}
+        (해당 검색에서 찾지 못한 청크의 개별 점수는 None)
+        """
+        mask, where = self.metadata_index.filter(filters)
+        if mask is not None and not mask.any():
+            return []
+
+        dense_future = None
+        if self.hybrid:
+            def dense_branch():
+                return self.dense_search(embed_query(query), fetch_k, mask, where)
+
+            # 질의 임베딩(네트워크)과 BM25(CPU)를 겹쳐 지연 시간이 느린 쪽만큼만 걸리도록 함
+            dense_future = executor.submit(dense_branch) if executor else None
+            dense_ids, dense_scores = (None, None) if dense_future else dense_branch()
+
+        bm25_ids, bm25_scores = self.bm25_index.search(query, fetch_k, mask)
+
+        if dense_future:
+            dense_ids, dense_scores = dense_future.result()
+
+        if self.hybrid:
+            rankings = [dense_ids, bm25_ids]
+            fused_weights = weights
+        else:
+            rankings = [bm25_ids]
+            fused_weights = [1.0]
+
+        fused_ids, fused_scores = reciprocal_rank_fusion(rankings, fused_weights)
+        fused_ids, fused_scores = fused_ids[:k], fused_scores[:k]
+
+        bm25_lookup = dict(zip(bm25_ids.tolist(), bm25_scores.tolist()))
+        dense_lookup = dict(zip(dense_ids.tolist(), dense_scores.tolist())) if self.hybrid else {}
+
+        return [
+            {
+                "document": self.chunks[row],
+                "score": float(score),
+                "dense_score": dense_lookup.get(row),
+                "bm25_score": bm25_lookup.get(row)
+            }
+            for row, score in zip(fused_ids.tolist(), fused_scores.tolist())
+        ]
@@ -0,0 +1,52 @@
+import markdown
+from markupsafe import escape
+
+# 표, 코드 블록, 각주 등 (marked 기본 동작과 비슷하게)
+MARKDOWN_EXTENSIONS = ["extra", "sane_lists"]
+
+# Tailwind prose를 대신하는 문서 보기 스타일 (외부 스크립트 없이 인라인으로 포함)
+PAGE_STYLE = """
+body { font-family: 'Noto Sans KR', -apple-system, BlinkMacSystemFont, 'Apple SD Gothic Neo', sans-serif;
+       max-width: 56rem; margin: 0 auto; padding: 2rem; color: #1f2937; line-height: 1.75; font-size: 1.125rem; }
+h1, h2, h3, h4 { color: #111827; line-height: 1.3; margin: 1.6em 0 0.6em; }
+h1 { font-size: 2.1em; margin-top: 0; }
+h2 { font-size: 1.6em; }
+h3 { font-size: 1.3em; }
+p, ul, ol, table, blockquote, pre { margin: 0 0 1.2em; }
+a { color: #2563eb; }
+img { max-width: 100%; height: auto; }
+blockquote { border-left: 4px solid #e5e7eb; padding-left: 1em; color: #4b5563; font-style: italic; }
+code { background: #f3f4f6; padding: 0.15em 0.35em; border-radius: 4px; font-size: 0.9em; }
+pre { background: #1f2937; color: #f9fafb; padding: 1em; border-radius: 6px; overflow-x: auto; }
+pre code { background: none; padding: 0; color: inherit; }
+table { border-collapse: collapse; width: 100%; font-size: 0.95em; }
+th, td { border: 1px solid #e5e7eb; padding: 0.5em 0.75em; text-align: left; }
+th { background: #f9fafb; }
+hr { border: 0; border-top: 1px solid #e5e7eb; margin: 2em 0; }
+@media (max-width: 640px) { body { padding: 1rem; font-size: 1rem; } }
+"""
+
+
+def render_markdown(content: str) -> str:
+    """마크다운을 HTML 조각으로 변환 (Markdown 인스턴스는 스레드 안전하지 않아 호출마다 생성)"""
+    return markdown.markdown(content, extensions=MARKDOWN_EXTENSIONS, output_format="html")
+
+
+def render_document_page(title: str, content: str) -> str:
+    """문서 보기용 완성된 HTML 페이지 (클라이언트 측 마크다운 파싱 불필요)"""
+    return f"""<!DOCTYPE html>
+<html lang="ko">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{escape(title)}</title>
+    <link href="https://fonts.googleapis.com/css2?family=Noto+Sans+KR:wght@400;500;700&display=swap" rel="stylesheet">
+    <style>{PAGE_STYLE}</style>
+</head>
+<body>
+    <article id="content">
+{render_markdown(content)}
+    </article>
+</body>
+</html>
+"""
@@ -0,0 +1,55 @@
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Any
+
+import numpy as np
+
+
+class LatencyTracker:
+    """백엔드별 최근 응답 시간을 고정 크기 버퍼에 보관하고 백분위수 제공
+
+    버퍼 크기가 고정되어 있어 상태 조회 비용이 누적 요청 수와 무관합니다.
+    """
+
+    def __init__(self, window: int = 500):
+        self.window = window
+        self._samples: Dict[str, deque] = {}
+        self._counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, backend: str, seconds: float):
+        """응답 시간 기록 (초)"""
+        with self._lock:
+            if backend not in self._samples:
+                self._samples[backend] = deque(maxlen=self.window)
+                self._counts[backend] = 0
+            self._samples[backend].append(seconds)
+            self._counts[backend] += 1
+
+    @contextmanager
+    def track(self, backend: str):
+        """with 블록의 실행 시간을 기록"""
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(backend, time.perf_counter() - start_time)
+
+    def summary(self) -> Dict[str, Any]:
+        """백엔드별 p50/p90/p99 (밀리초)와 누적 호출 수"""
+        with self._lock:
+            snapshot = {backend: list(samples) for backend, samples in self._samples.items()}
+            counts = dict(self._counts)
+
+        result = {}
+        for backend, samples in snapshot.items():
+            p50, p90, p99 = np.percentile(samples, [50, 90, 99]) * 1000
+            result[backend] = {
+                "count": counts[backend],
+                "p50_ms": round(float(p50), 1),
+                "p90_ms": round(float(p90), 1),
+                "p99_ms": round(float(p99), 1)
+            }
+        return result
@@ -2,6 +2,7 @@ import os
 import requests
 from dotenv import load_dotenv
 import psycopg2
+from psycopg2.extras import execute_values
 from datetime import datetime, timedelta
 import json # json 모듈 추가
 from pprint import pprint # 디버깅용
@@ -18,6 +19,9 @@ DB_NAME = os.getenv("DB_NAME")
 DB_USER = os.getenv("DB_USER")
 DB_PASSWORD = os.getenv("DB_PASSWORD")
 
+# 한 번의 INSERT·커밋으로 저장할 뉴스 수
+NEWS_DB_BATCH_SIZE = int(os.getenv("NEWS_DB_BATCH_SIZE", "1000"))
+
 def get_latest_economic_news(date_from: str, date_until: str, return_size: int = 1000) -> list:
     """
     지정된 기간의 경제 뉴스 데이터를 Bigkinds API에서 가져옵니다.
@@ -72,14 +76,61 @@ def get_latest_economic_news(date_from: str, date_until: str, return_size: int =
         print(f"예상치 못한 오류 발생: {e}")
         return []
 
-def save_news_to_db(news_data: list):
+INSERT_NEWS_SQL = """
+    INSERT INTO news (bigkinds_id, title, content, published_at, provider, category, source_url)
+    VALUES %s
+    ON CONFLICT (bigkinds_id) DO NOTHING
+    RETURNING bigkinds_id
+"""
+
+def _news_row(news_item: dict) -> tuple:
+    return (
+        news_item.get("doc_id"),
+        news_item.get("title"),
+        news_item.get("content"),
+        news_item.get("published_at"),
+        news_item.get("provider"),
+        json.dumps(news_item.get("category")),
+        news_item.get("url")
+    )
+
+def _insert_news_rows(cur, rows: list) -> int:
+    """여러 행을 한 번의 INSERT로 저장하고 실제로 삽입된 행 수 반환 (이미 있는 bigkinds_id는 건너뜀)"""
+    inserted = execute_values(cur, INSERT_NEWS_SQL, rows, page_size=len(rows), fetch=True)
+    return len(inserted)
+
+def save_news_to_db(news_data: list, batch_size: int = None) -> dict:
     """
     가져온 뉴스 데이터를 PostgreSQL 데이터베이스에 저장합니다.
-    이미 존재하는 뉴스는 삽입하지 않고 건너뜠습니다.
+    batch_size개씩 한 번의 INSERT ... ON CONFLICT (bigkinds_id) DO NOTHING으로 저장하고 배치마다 커밋하며,
+    이미 존재하는 뉴스는 데이터베이스가 건너뜁니다
+    (news.bigkinds_id에 UNIQUE 제약 필요: scripts/add_news_bigkinds_id_unique.sql).
+    배치 삽입이 실패하면 해당 배치만 한 행씩 다시 시도하여 오류 행을 건너뜁니다.
+    :param news_data: 뉴스 문서 리스트
+    :param batch_size: 한 번에 삽입·커밋할 행 수 (기본값: NEWS_DB_BATCH_SIZE 환경 변수 또는 1000)
+    :return: {"inserted", "skipped", "failed"} 건수
     """
+    counts = {"inserted": 0, "skipped": 0, "failed": 0}
     if not news_data:
         print("저장할 뉴스 데이터가 없습니다.")
-        return
+        return counts
+
+    batch_size = batch_size or NEWS_DB_BATCH_SIZE
+
+    # doc_id가 없거나 같은 실행 안에서 중복된 뉴스는 DB에 보내지 않음
+    rows = []
+    seen_ids = set()
+    for news_item in news_data:
+        bigkinds_id = news_item.get("doc_id")
+        if not bigkinds_id:
+            print(f"경고: 'doc_id'가 없는 뉴스 건너뜀: {news_item.get('title', '제목 없음')}")
+            counts["skipped"] += 1
+            continue
+        if bigkinds_id in seen_ids:
+            counts["skipped"] += 1
+            continue
+        seen_ids.add(bigkinds_id)
+        rows.append(_news_row(news_item))
 
     conn = None
     try:
@@ -91,47 +142,31 @@ def save_news_to_db(news_data: list):
         )
         cur = conn.cursor()
 
-        inserted_count = 0
-        skipped_count = 0
-
-        for news_item in news_data:
-            bigkinds_id = news_item.get("doc_id")
-
-            if not bigkinds_id:
-                print(f"경고: 'doc_id'가 없는 뉴스 건너뜀: {news_item.get('title', '제목 없음')}")
-                skipped_count += 1
-                continue
-
-            cur.execute("SELECT id FROM news WHERE bigkinds_id = %s", (bigkinds_id,))
-            if cur.fetchone():
-                skipped_count += 1
-                continue
-
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
             try:
-                cur.execute(
-                    """
-                    INSERT INTO news (bigkinds_id, title, content, published_at, provider, category, source_url)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s)
-                    """,
-                    (
-                        bigkinds_id,
-                        news_item.get("title"),
-                        news_item.get("content"),
-                        news_item.get("published_at"),
-                        news_item.get("provider"),
-                        json.dumps(news_item.get("category")),
-                        news_item.get("url")
-                    ),
-                )
-                inserted_count += 1
+                inserted = _insert_news_rows(cur, batch)
+                conn.commit()
+                counts["inserted"] += inserted
+                counts["skipped"] += len(batch) - inserted
             except psycopg2.Error as db_error:
-                print(f"DB 삽입 오류 ({bigkinds_id}): {db_error}")
-                skipped_count += 1
+                print(f"배치 삽입 오류 ({start + 1}~{start + len(batch)}행), 한 행씩 다시 시도합니다: {db_error}")
                 conn.rollback()
-                continue
 
-        conn.commit()
-        print(f"뉴스 데이터 저장 완료: {inserted_count}개 삽입, {skipped_count}개 건너뜀")
+                for row in batch:
+                    try:
+                        inserted = _insert_news_rows(cur, [row])
+                        conn.commit()
+                        counts["inserted"] += inserted
+                        counts["skipped"] += 1 - inserted
+                    except psycopg2.Error as db_error:
+                        print(f"DB 삽입 오류 ({row[0]}): {db_error}")
+                        conn.rollback()
+                        counts["failed"] += 1
+
+            print(f"진행 상황: {min(start + batch_size, len(rows))}/{len(rows)}행 처리")
+
+        print(f"뉴스 데이터 저장 완료: {counts['inserted']}개 삽입, {counts['skipped']}개 건너뜀, {counts['failed']}개 실패")
 
     except psycopg2.Error as e:
         print(f"데이터베이스 연결 또는 작업 오류: {e}")
@@ -142,6 +177,8 @@ def save_news_to_db(news_data: list):
             cur.close()
             conn.close()
 
+    return counts
+
 if __name__ == "__main__":
     today = datetime.now().strftime("%Y-%m-%d")
     yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
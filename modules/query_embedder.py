@@ -0,0 +1,114 @@
+import time
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Dict, Any
+
+import numpy as np
+
+logger = logging.getLogger('query_embedder')
+
+
+class QueryEmbedder:
+    """질의 임베딩 LRU 캐시 + 동시 질의 마이크로 배치
+
+    최근 질의의 임베딩을 float32 배열로 최대 max_entries개 보관합니다.
+    캐시에 없는 질의가 동시에 들어오면 처음 도착한 스레드가 batch_window초 동안
+    기다린 뒤 모인 질의를 한 번의 임베딩 요청으로 처리하고, 나머지 스레드는 결과만 받습니다.
+    같은 질의가 처리 중이면 새 요청 없이 그 결과를 함께 기다립니다.
+    """
+
+    def __init__(self, embeddings, max_entries: int = 2048, batch_window: float = 0.005,
+                 max_batch_size: int = 64):
+        self.embeddings = embeddings
+        self.max_entries = max_entries
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+
+        self._cache = OrderedDict()
+        self._pending: Dict[str, Future] = {}
+        self._queue = []
+        self._leader_active = False
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.batches = 0
+        self.batched_queries = 0
+
+    def embed_query(self, text: str) -> np.ndarray:
+        """질의 임베딩 (캐시 적중 시 네트워크 요청 없음)"""
+        with self._lock:
+            vector = self._cache.get(text)
+            if vector is not None:
+                self._cache.move_to_end(text)
+                self.hits += 1
+                return vector
+
+            future = self._pending.get(text)
+            lead = False
+            if future is None:
+                self.misses += 1
+                future = Future()
+                self._pending[text] = future
+                self._queue.append(text)
+                if not self._leader_active:
+                    self._leader_active = True
+                    lead = True
+            else:
+                self.coalesced += 1
+
+        if lead:
+            self._run_batches()
+        return future.result()
+
+    def _run_batches(self):
+        """대기 중인 질의를 배치로 임베딩 (큐가 빌 때까지 반복)"""
+        time.sleep(self.batch_window)
+        while True:
+            with self._lock:
+                batch = self._queue[:self.max_batch_size]
+                del self._queue[:self.max_batch_size]
+                if not batch:
+                    self._leader_active = False
+                    return
+
+            try:
+                vectors = np.asarray(self.embeddings.embed_documents(batch), dtype=np.float32)
+                vectors.setflags(write=False)  # 캐시된 벡터를 호출자가 수정하지 않도록
+                error = None
+            except Exception as e:
+                logger.error(f"질의 임베딩 오류 ({len(batch)}개): {str(e)}")
+                vectors, error = None, e
+
+            with self._lock:
+                self.batches += 1
+                self.batched_queries += len(batch)
+                futures = [self._pending.pop(text) for text in batch]
+                if error is None:
+                    for text, vector in zip(batch, vectors):
+                        self._cache[text] = vector
+                    while len(self._cache) > self.max_entries:
+                        self._cache.popitem(last=False)
+
+            for i, future in enumerate(futures):
+                if error is None:
+                    future.set_result(vectors[i])
+                else:
+                    future.set_exception(error)
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 적중률과 배치 통계"""
+        total = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._cache),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "batches": self.batches,
+            "avg_batch_size": round(self.batched_queries / self.batches, 2) if self.batches else None,
+            "hit_rate": round(self.hits / total, 4) if total else None
+        }
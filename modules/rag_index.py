@@ -0,0 +1,164 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+import logging
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+from langchain.schema.document import Document
+
+logger = logging.getLogger('rag_index')
+
+# 저장 포맷이 바뀌면 올려서 기존 인덱스를 무효화
+INDEX_FORMAT_VERSION = 3
+
+
+def content_sha256(content: str) -> str:
+    """문서 본문의 sha256 해시"""
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+class RagIndexStore:
+    """청크, 임베딩, BM25 상태를 디스크에 저장하고 다시 불러오는 RAG 인덱스 저장소
+
+    디렉토리 구성:
+        manifest.json   - 포맷 버전, 청킹/임베딩 설정, 파일별 해시
+        chunks.json     - 청크 ID, 본문, 메타데이터
+        embeddings.npy  - 청크 순서와 같은 float32 임베딩 행렬
+        bm25.json       - BM25 메타데이터 (토크나이저, 용어 목록)
+        bm25_*.npy      - BM25 역색인 배열 (포스팅 오프셋, 청크 번호, 가중치)
+    """
+
+    MANIFEST_FILE = "manifest.json"
+    CHUNKS_FILE = "chunks.json"
+    EMBEDDINGS_FILE = "embeddings.npy"
+    BM25_META_FILE = "bm25.json"
+    BM25_ARRAYS = ("indptr", "doc_ids", "weights")
+
+    def __init__(self, index_dir):
+        self.index_dir = Path(index_dir)
+
+    def build_manifest(self, settings: Dict[str, Any], files: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """현재 설정과 파일 목록으로 매니페스트 생성"""
+        return {
+            "version": INDEX_FORMAT_VERSION,
+            "settings": settings,
+            "files": files,
+            "created_at": time.time()
+        }
+
+    def load_manifest(self) -> Optional[Dict[str, Any]]:
+        """저장된 매니페스트 로드 (없거나 손상된 경우 None)"""
+        manifest_path = self.index_dir / self.MANIFEST_FILE
+        if not manifest_path.exists():
+            return None
+
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"매니페스트 로드 실패: {str(e)}")
+            return None
+
+    def is_current(self, settings: Dict[str, Any], files: Dict[str, Dict[str, Any]]) -> bool:
+        """저장된 인덱스가 현재 코퍼스 및 설정과 일치하는지 확인"""
+        manifest = self.load_manifest()
+        if not manifest:
+            return False
+
+        if manifest.get("version") != INDEX_FORMAT_VERSION:
+            logger.info("인덱스 포맷 버전이 달라 재생성이 필요합니다")
+            return False
+
+        if manifest.get("settings") != settings:
+            logger.info("청킹/임베딩 설정이 변경되어 재생성이 필요합니다")
+            return False
+
+        saved_hashes = {key: info.get("sha256") for key, info in manifest.get("files", {}).items()}
+        current_hashes = {key: info.get("sha256") for key, info in files.items()}
+        if saved_hashes != current_hashes:
+            logger.info("문서가 변경되어 재생성이 필요합니다")
+            return False
+
+        return True
+
+    def save(self, manifest: Dict[str, Any], chunk_ids: List[str], chunks: List[Document],
+             embeddings: np.ndarray, bm25_state: Any):
+        """인덱스를 임시 디렉토리에 기록한 뒤 원자적으로 교체"""
+        self.index_dir.parent.mkdir(parents=True, exist_ok=True)
+        tmp_dir = self.index_dir.with_name(f"{self.index_dir.name}.tmp-{os.getpid()}")
+        old_dir = self.index_dir.with_name(f"{self.index_dir.name}.old-{os.getpid()}")
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        tmp_dir.mkdir(parents=True)
+
+        try:
+            with open(tmp_dir / self.CHUNKS_FILE, 'w', encoding='utf-8') as f:
+                json.dump([
+                    {"id": chunk_id, "page_content": chunk.page_content, "metadata": chunk.metadata}
+                    for chunk_id, chunk in zip(chunk_ids, chunks)
+                ], f, ensure_ascii=False)
+
+            np.save(tmp_dir / self.EMBEDDINGS_FILE, np.asarray(embeddings, dtype=np.float32))
+
+            bm25_meta, bm25_arrays = bm25_state
+            with open(tmp_dir / self.BM25_META_FILE, 'w', encoding='utf-8') as f:
+                json.dump(bm25_meta, f, ensure_ascii=False)
+            for name in self.BM25_ARRAYS:
+                np.save(tmp_dir / f"bm25_{name}.npy", bm25_arrays[name])
+
+            # 매니페스트는 마지막에 기록 (매니페스트가 있으면 나머지 파일도 완전함)
+            with open(tmp_dir / self.MANIFEST_FILE, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+            if self.index_dir.exists():
+                self.index_dir.rename(old_dir)
+            tmp_dir.rename(self.index_dir)
+            shutil.rmtree(old_dir, ignore_errors=True)
+
+            logger.info(f"RAG 인덱스 저장 완료: {self.index_dir} ({len(chunks)}개 청크)")
+
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            if old_dir.exists() and not self.index_dir.exists():
+                old_dir.rename(self.index_dir)
+            raise
+
+    def load_chunks(self, mmap: bool = False) -> Tuple[List[str], List[Document], Any]:
+        """저장된 청크 ID, 청크, BM25 상태 로드 (키워드 검색 준비용)"""
+        with open(self.index_dir / self.CHUNKS_FILE, 'r', encoding='utf-8') as f:
+            records = json.load(f)
+
+        chunk_ids = [record["id"] for record in records]
+        chunks = [
+            Document(page_content=record["page_content"], metadata=record["metadata"])
+            for record in records
+        ]
+
+        with open(self.index_dir / self.BM25_META_FILE, 'r', encoding='utf-8') as f:
+            bm25_meta = json.load(f)
+        bm25_arrays = {
+            name: np.load(self.index_dir / f"bm25_{name}.npy", mmap_mode='r' if mmap else None)
+            for name in self.BM25_ARRAYS
+        }
+        bm25_state = (bm25_meta, bm25_arrays)
+
+        logger.info(f"RAG 인덱스 청크 로드 완료: {self.index_dir} ({len(chunks)}개 청크)")
+        return chunk_ids, chunks, bm25_state
+
+    def load_embeddings(self, mmap: bool = False) -> np.ndarray:
+        """저장된 임베딩 행렬 로드 (mmap=True면 읽기 전용 메모리 매핑)"""
+        return np.load(self.index_dir / self.EMBEDDINGS_FILE, mmap_mode='r' if mmap else None)
+
+    def size_bytes(self) -> int:
+        """저장된 인덱스 파일의 총 크기 (바이트)"""
+        total = 0
+        file_names = [self.MANIFEST_FILE, self.CHUNKS_FILE, self.EMBEDDINGS_FILE, self.BM25_META_FILE]
+        file_names += [f"bm25_{name}.npy" for name in self.BM25_ARRAYS]
+        for file_name in file_names:
+            path = self.index_dir / file_name
+            if path.exists():
+                total += path.stat().st_size
+        return total
@@ -0,0 +1,95 @@
+import logging
+from collections import Counter
+from typing import List, Dict, Any, Callable, Optional
+
+import numpy as np
+
+logger = logging.getLogger('reranker')
+
+
+class LexicalReranker:
+    """질의어 겹침 기반 재정렬기 (외부 모델 없음)
+
+    후보 청크 × 질의어 등장 횟수 행렬을 한 번에 만들고, IDF 가중 포화 tf로
+    질의어를 얼마나 고르게 포함하는지 계산해 검색 단계의 RRF 점수와 섞습니다.
+    """
+
+    name = "lexical"
+
+    def __init__(self, lexical_weight: float = 0.7):
+        self.lexical_weight = lexical_weight
+
+    def score(self, query: str, hits: List[Dict[str, Any]], bm25_index) -> np.ndarray:
+        query_terms = list(dict.fromkeys(bm25_index.tokenize(query)))
+        fused = np.array([hit["score"] for hit in hits], dtype=np.float32)
+        fused = fused / fused.max() if len(fused) and fused.max() > 0 else fused
+        if not query_terms:
+            return fused
+
+        term_col = {term: j for j, term in enumerate(query_terms)}
+        counts = np.zeros((len(hits), len(query_terms)), dtype=np.float32)
+        for i, hit in enumerate(hits):
+            for term, tf in Counter(bm25_index.tokenize(hit["document"].page_content)).items():
+                j = term_col.get(term)
+                if j is not None:
+                    counts[i, j] = tf
+
+        idf = bm25_index.idf(query_terms)
+        lexical = (counts / (counts + 1.0)) @ idf / idf.sum()
+        return self.lexical_weight * lexical + (1 - self.lexical_weight) * fused
+
+
+class CrossEncoderReranker:
+    """로컬 cross-encoder 모델 재정렬기 (sentence-transformers 설치 시)"""
+
+    name = "cross-encoder"
+
+    def __init__(self, model_name: str, batch_size: int = 32):
+        from sentence_transformers import CrossEncoder
+
+        self.model = CrossEncoder(model_name)
+        self.batch_size = batch_size
+
+    def score(self, query: str, hits: List[Dict[str, Any]], bm25_index=None) -> np.ndarray:
+        pairs = [(query, hit["document"].page_content) for hit in hits]
+        return np.asarray(self.model.predict(pairs, batch_size=self.batch_size), dtype=np.float32)
+
+
+def get_reranker(name: str, model_name: Optional[str] = None):
+    """이름으로 재정렬기 생성 ("none"이면 None, cross-encoder를 쓸 수 없으면 lexical로 대체)"""
+    name = (name or "none").lower()
+    if name == "cross-encoder":
+        try:
+            return CrossEncoderReranker(model_name)
+        except ImportError:
+            logger.warning("sentence-transformers가 설치되어 있지 않아 lexical 재정렬기를 사용합니다")
+        except Exception as e:
+            logger.error(f"cross-encoder 모델 로드 실패, lexical 재정렬기를 사용합니다: {str(e)}")
+        return LexicalReranker()
+    if name == "lexical":
+        return LexicalReranker()
+    return None
+
+
+def rerank(query: str, hits: List[Dict[str, Any]], reranker, bm25_index, top_n: int,
+           max_tokens: int, count_tokens: Callable[[str], int]) -> List[Dict[str, Any]]:
+    """후보를 재정렬한 뒤 토큰 예산 안에서 상위 top_n개 선택
+
+    예산을 넘는 청크는 건너뛰고 더 짧은 다음 후보로 채웁니다.
+    각 항목에 "rerank_score"가 추가됩니다.
+    """
+    if not hits:
+        return []
+
+    scores = reranker.score(query, hits, bm25_index)
+    selected = []
+    used_tokens = 0
+    for i in np.argsort(-scores, kind="stable").tolist():
+        tokens = count_tokens(hits[i]["document"].page_content)
+        if used_tokens + tokens > max_tokens:
+            continue
+        selected.append(dict(hits[i], rerank_score=float(scores[i])))
+        used_tokens += tokens
+        if len(selected) >= top_n:
+            break
+    return selected
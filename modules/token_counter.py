@@ -0,0 +1,44 @@
+import logging
+import threading
+from typing import Dict, Any
+
+logger = logging.getLogger('token_counter')
+
+_encodings: Dict[str, Any] = {}
+_lock = threading.Lock()
+
+
+def get_encoding(model: str):
+    """모델에 맞는 tiktoken 인코딩 (사용할 수 없으면 None, 모델별로 한 번만 로드)"""
+    with _lock:
+        if model not in _encodings:
+            encoding = None
+            try:
+                import tiktoken
+                try:
+                    encoding = tiktoken.encoding_for_model(model)
+                except KeyError:
+                    encoding = tiktoken.get_encoding("cl100k_base")
+            except Exception as e:
+                logger.warning(f"tiktoken 로드 실패, 글자 수로 토큰을 추정합니다: {str(e)}")
+            _encodings[model] = encoding
+        return _encodings[model]
+
+
+def count_tokens(text: str, model: str = "gpt-4o-mini") -> int:
+    """텍스트의 토큰 수 (tiktoken을 사용할 수 없으면 글자 수로 보수적으로 추정)"""
+    encoding = get_encoding(model)
+    if encoding is None:
+        return len(text)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_tokens(text: str, max_tokens: int, model: str = "gpt-4o-mini") -> str:
+    """텍스트를 최대 max_tokens 토큰으로 자르기 (tiktoken을 사용할 수 없으면 글자 수 기준)"""
+    encoding = get_encoding(model)
+    if encoding is None:
+        return text[:max_tokens]
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode(tokens[:max_tokens])
@@ -1,7 +1,13 @@
 import os
+import math
 import logging
 import time
-from typing import List, Dict, Any
+import sys
+import asyncio
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import List, Dict, Any, Optional
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -10,20 +16,38 @@ if os.path.exists(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..',
     load_dotenv()
     
 import json
+import random
 import requests
+from requests.adapters import HTTPAdapter
+import aiohttp
+import numpy as np
 from functools import lru_cache
 
 # Semantic Chunker is not used in this codebase
 from langchain_openai import OpenAIEmbeddings, ChatOpenAI
 from langchain_community.vectorstores import Chroma
-from langchain_community.retrievers.bm25 import BM25Retriever
-from langchain.retrievers import EnsembleRetriever
 from langchain.schema.document import Document
 from langchain.prompts import ChatPromptTemplate
 
 # Google AI import
 import google.generativeai as genai
 
+from modules.rag_index import RagIndexStore, INDEX_FORMAT_VERSION
+from modules.embedding_cache import EmbeddingCache, CachedEmbeddings
+from modules.embedding_batcher import BatchedEmbeddings
+from modules.answer_cache import AnswerCache
+from modules.metrics import LatencyTracker
+from modules.dense_index import DenseIndex
+from modules.bm25_index import BM25Index
+from modules.hybrid_search import HybridSearcher
+from modules.query_embedder import QueryEmbedder
+from modules.chunk_metadata import parse_published_date, normalize_filters
+from modules.reranker import get_reranker, rerank
+from modules.token_counter import count_tokens, truncate_tokens
+from modules.context_builder import merge_hits, select_spans
+from modules.document_catalog import DocumentCatalog
+from modules.document_search import DocumentSearcher
+
 # 환경 변수 로드
 load_dotenv()
 
@@ -36,25 +60,160 @@ ROOT_DIR = Path(os.path.dirname(os.path.abspath(__file__))).parent
 DATA_BASE_DIR = Path('/tmp/data') if os.environ.get('ENVIRONMENT') == 'cloud_run' else ROOT_DIR / "data"
 ECONOMY_TERMS_DIR = DATA_BASE_DIR / "economy_terms"
 RECENT_CONTENTS_DIR = DATA_BASE_DIR / "recent_contents_final"
+RAG_INDEX_DIR = Path(os.getenv("RAG_INDEX_DIR", str(DATA_BASE_DIR / "rag_index")))
+EMBEDDING_CACHE_PATH = Path(os.getenv("EMBEDDING_CACHE_PATH", str(DATA_BASE_DIR / "embedding_cache.sqlite3")))
+
+# 인덱스 설정 (변경 시 저장된 인덱스가 자동으로 재생성됨)
+EMBEDDING_MODEL = "text-embedding-3-small"
+CHUNK_SIZE = 500  # 최적화된 청크 크기
+CHUNK_OVERLAP = 100  # 중복도 증가
+CHUNK_SEPARATORS = ["\n\n", "\n", ".", " ", ""]
+BM25_TOKENIZER = os.getenv("BM25_TOKENIZER", "ngram")  # "ngram" (문자 바이그램) 또는 "kiwi" (형태소 분석)
+
+# 임베딩 배치 설정 (배치당 토큰 수, 동시 요청 수)
+EMBEDDING_BATCH_TOKENS = int(os.getenv("EMBEDDING_BATCH_TOKENS", "16000"))
+EMBEDDING_CONCURRENCY = int(os.getenv("EMBEDDING_CONCURRENCY", "4"))
+
+# 질의 임베딩 설정 (LRU 캐시 항목 수, 동시 질의를 모으는 시간(ms))
+QUERY_EMBEDDING_CACHE_SIZE = int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "2048"))
+QUERY_EMBEDDING_BATCH_WINDOW_MS = float(os.getenv("QUERY_EMBEDDING_BATCH_WINDOW_MS", "5"))
+
+# 벡터 검색 백엔드 ("chroma" 또는 프로세스 내 NumPy 행렬 "numpy")
+VECTOR_BACKEND = os.getenv("VECTOR_BACKEND", "chroma").lower()
+VECTOR_MMAP = os.getenv("VECTOR_MMAP", "false").lower() == "true"  # numpy 백엔드에서 저장된 임베딩을 메모리 매핑
+
+# 공유 인덱스 모드: 별도 프로세스(scripts/build_rag_index.py)가 생성한 인덱스를 읽기 전용으로 메모리 매핑하여
+# 여러 워커 프로세스가 페이지 캐시를 함께 사용 (임베딩·저장·Chroma 생략, numpy 백엔드 사용).
+# 공유 인덱스가 없으면 키워드 검색으로 처리하며 RAG_INDEX_POLL_INTERVAL초마다 매니페스트를 확인해 전환·재매핑
+RAG_INDEX_READONLY = os.getenv("RAG_INDEX_READONLY", "false").lower() == "true"
+RAG_INDEX_POLL_INTERVAL = float(os.getenv("RAG_INDEX_POLL_INTERVAL", "10"))
+RAG_INDEX_BUILD_SCRIPT = ROOT_DIR / "scripts" / "build_rag_index.py"
+
+# 하이브리드 검색 설정 (반환 청크 수, 검색기별 후보 수, 벡터/BM25 RRF 가중치)
+RETRIEVAL_K = int(os.getenv("RETRIEVAL_K", "5"))
+RETRIEVAL_FETCH_K = int(os.getenv("RETRIEVAL_FETCH_K", "10"))
+MAX_RETRIEVAL_K = int(os.getenv("MAX_RETRIEVAL_K", "50"))  # 요청별 top_k 상한
+RETRIEVAL_WEIGHTS = tuple(float(w) for w in os.getenv("RETRIEVAL_WEIGHTS", "0.6,0.4").split(","))
+
+# 재정렬 설정 ("none", "lexical" 또는 "cross-encoder", 후보 수, 프롬프트에 넣을 청크의 총 토큰 예산)
+RERANKER = os.getenv("RERANKER", "none")
+RERANK_MODEL = os.getenv("RERANK_MODEL", "BAAI/bge-reranker-v2-m3")
+RERANK_CANDIDATES = int(os.getenv("RERANK_CANDIDATES", "30"))
+RERANK_MAX_TOKENS = int(os.getenv("RERANK_MAX_TOKENS", "1500"))
+
+# 프롬프트 컨텍스트 토큰 예산 (내부 문서, 웹 검색 답변)
+CONTEXT_MAX_TOKENS = int(os.getenv("CONTEXT_MAX_TOKENS", "2000"))
+CONTEXT_WEB_MAX_TOKENS = int(os.getenv("CONTEXT_WEB_MAX_TOKENS", "800"))
+
+# 문서 카탈로그 변경 확인 주기(초, 0이면 감시하지 않음)
+DOCUMENT_CATALOG_POLL_INTERVAL = float(os.getenv("DOCUMENT_CATALOG_POLL_INTERVAL", "5"))
+
+# 질의 처리 설정 (동시 검색 스레드 수, 분기별 제한 시간(초))
+QUERY_WORKERS = int(os.getenv("QUERY_WORKERS", "16"))
+INTERNAL_SEARCH_TIMEOUT = float(os.getenv("INTERNAL_SEARCH_TIMEOUT", "5"))
+WEB_SEARCH_TIMEOUT = float(os.getenv("WEB_SEARCH_TIMEOUT", "20"))
+
+# 답변 캐시 설정 (최대 항목 수, 웹 검색 사용 답변 TTL(초), 유사 질의 임계값)
+ANSWER_CACHE_SIZE = int(os.getenv("ANSWER_CACHE_SIZE", "512"))
+ANSWER_CACHE_WEB_TTL = float(os.getenv("ANSWER_CACHE_WEB_TTL", "600"))
+ANSWER_CACHE_SIMILARITY = float(os.getenv("ANSWER_CACHE_SIMILARITY", "0.95"))
+
+# Perplexity API 설정 (연결 풀 크기, 연결/전체 제한 시간(초))
+PERPLEXITY_API_URL = "https://api.perplexity.ai/chat/completions"
+PERPLEXITY_MODEL = "llama-3.1-sonar-small-128k-online"
+PERPLEXITY_POOL_SIZE = int(os.getenv("PERPLEXITY_POOL_SIZE", str(QUERY_WORKERS)))
+PERPLEXITY_CONNECT_TIMEOUT = 5
+PERPLEXITY_DEADLINE = float(os.getenv("PERPLEXITY_DEADLINE", str(WEB_SEARCH_TIMEOUT)))
+PERPLEXITY_ASYNC_POOL_SIZE = int(os.getenv("PERPLEXITY_ASYNC_POOL_SIZE", "100"))  # 비동기 서버용 연결 수
+
+# Gemini 모델 설정
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
+
+def normalize_top_k(top_k) -> Optional[int]:
+    """요청별 top_k 검증 (지정하지 않으면 None, 1~MAX_RETRIEVAL_K 범위 밖이면 ValueError)"""
+    if top_k is None or top_k == "":
+        return None
+    if isinstance(top_k, bool) or (isinstance(top_k, float) and not top_k.is_integer()):
+        raise ValueError(f"top_k는 정수여야 합니다: {top_k}")
+    k = int(top_k)
+    if not 1 <= k <= MAX_RETRIEVAL_K:
+        raise ValueError(f"top_k는 1~{MAX_RETRIEVAL_K} 범위여야 합니다: {k}")
+    return k
+
+def normalize_weights(weights) -> Optional[List[float]]:
+    """요청별 [벡터, BM25] 융합 가중치 검증 (지정하지 않으면 None, 음수·무한대·NaN이거나 둘 다 0이면 ValueError)"""
+    if not weights:
+        return None
+    if isinstance(weights, (str, bytes)) or len(weights) != 2:
+        raise ValueError("weights는 [벡터, BM25] 두 값이어야 합니다")
+    values = [float(w) for w in weights]
+    if not all(math.isfinite(w) and w >= 0 for w in values) or not any(values):
+        raise ValueError(f"weights는 0 이상의 유한한 값이어야 하며 둘 다 0일 수는 없습니다: {list(weights)}")
+    return values
 
 class UnifiedChatbot:
     """GPT, Gemini API 및 Perplexity API를 통합한 챗봇 시스템"""
     
     def __init__(self):
-        self.embeddings = OpenAIEmbeddings(model="text-embedding-3-small")
+        # 문서 임베딩 재시도(429 공유 대기, Retry-After)는 BatchedEmbeddings가 담당하므로 클라이언트 내부 재시도는 끔
+        self.embeddings = BatchedEmbeddings(
+            OpenAIEmbeddings(model=EMBEDDING_MODEL, max_retries=0),
+            EMBEDDING_MODEL,
+            max_batch_tokens=EMBEDDING_BATCH_TOKENS,
+            max_workers=EMBEDDING_CONCURRENCY
+        )
+        self.embedding_cache = None
+        try:
+            # 변경되지 않은 청크는 임베딩 API를 다시 호출하지 않음
+            self.embedding_cache = EmbeddingCache(EMBEDDING_CACHE_PATH, EMBEDDING_MODEL)
+            self.embeddings = CachedEmbeddings(self.embeddings, self.embedding_cache)
+        except Exception as e:
+            logger.error(f"임베딩 캐시 초기화 오류: {str(e)}")
+        # 질의 임베딩은 문서 임베딩 캐시(SQLite)에 쌓지 않고 메모리 LRU에만 보관
+        self.query_embedder = QueryEmbedder(
+            OpenAIEmbeddings(model=EMBEDDING_MODEL),
+            max_entries=QUERY_EMBEDDING_CACHE_SIZE,
+            batch_window=QUERY_EMBEDDING_BATCH_WINDOW_MS / 1000
+        )
         self.llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.1)
         self.perplexity_api_key = os.getenv("PERPLEXITY_API_KEY")
         self.gemini_api_key = os.getenv("GEMINI_API_KEY")
+        self.http_session = self._create_http_session()
         self.docs = []
         self.vectorstore = None
-        self.retriever = None
+        self.searcher = None
+        self._document_searcher = None
+        self.catalog = None
         self.file_paths = {}
+        self.file_manifest = {}
+        self.chunk_ids = []
+        self.chunks = []
+        self.chunk_embeddings = None
+        self.index_store = RagIndexStore(RAG_INDEX_DIR)
+        self.index_loaded_from_disk = False
+        self.index_readonly = RAG_INDEX_READONLY
+        self._shared_index_created_at = None
+        self._index_watcher = None
+        self._rebuild_process = None
+        self.bm25_index = None
+        self.index_size_bytes = 0
+        self.latency = LatencyTracker()
+        self.reranker = get_reranker(RERANKER, RERANK_MODEL)
+        self._refresh_lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=QUERY_WORKERS, thread_name_prefix="chatbot-query")
+        # 검색 분기 안에서 다시 제출하므로 별도 풀 사용 (같은 풀이면 포화 시 교착 가능)
+        self.retrieval_executor = ThreadPoolExecutor(max_workers=QUERY_WORKERS, thread_name_prefix="chatbot-retrieval")
         
-        # Gemini API 설정
+        # Gemini API 설정 (모델 핸들은 한 번만 생성하여 재사용)
         self.gemini_configured = False
+        self.gemini_model = None
+        self._async_loop = None
+        self._async_loop_lock = threading.Lock()
+        self._aio_session = None
         if self.gemini_api_key:
             try:
                 genai.configure(api_key=self.gemini_api_key)
+                self.gemini_model = genai.GenerativeModel(GEMINI_MODEL)
                 self.gemini_configured = True
                 logger.info("Gemini API가 성공적으로 구성되었습니다.")
             except Exception as e:
@@ -64,110 +223,519 @@ class UnifiedChatbot:
         self.init_timestamp = None
         self.last_update = None
         
-        # 초기화 상태
+        # 초기화 상태 (단계별: pending / running / waiting / ready / failed)
+        # waiting: 읽기 전용 모드의 vector_index가 공유 인덱스 생성을 기다리는 중 (키워드 검색으로 응답)
+        self.stages = {
+            "documents": "pending",
+            "keyword_index": "pending",
+            "vector_index": "pending",
+            "api_check": "pending"
+        }
         self.initialized = False
         self.rag_initialized = False
         self.perplexity_initialized = False
         
         # 캐시 타임아웃 (1시간)
-        self.cache_timeout = 3600
+        self.cache_timeout = int(os.getenv("ANSWER_CACHE_TTL", "3600"))
+        
+        # 반복·유사 질문용 답변 캐시
+        self.answer_cache = AnswerCache(
+            max_entries=ANSWER_CACHE_SIZE,
+            ttl=self.cache_timeout,
+            web_ttl=ANSWER_CACHE_WEB_TTL,
+            similarity_threshold=ANSWER_CACHE_SIMILARITY
+        )
+        
+    def _document_from_entry(self, entry: Dict[str, Any]):
+        """카탈로그 항목으로 Document와 매니페스트 항목 생성 (본문 문자열은 카탈로그와 공유)"""
+        file_name = entry["file_name"]
+        source_type = entry["source_type"]
+        
+        metadata = {
+            "source": str(entry["path"]),
+            "title": entry["title"],
+            "file_name": file_name,
+            "source_type": source_type
+        }
+        if source_type == "recent_contents":
+            # 게시일 필터용 (찾지 못하면 생략, Chroma 메타데이터는 None을 허용하지 않음)
+            published_date = parse_published_date(file_name, entry["content"])
+            if published_date:
+                metadata["published_date"] = published_date
+        
+        doc = Document(page_content=entry["content"], metadata=metadata)
+        
+        manifest_entry = {
+            "sha256": entry["sha256"],
+            "size": entry["size"],
+            "mtime": entry["mtime"]
+        }
+        return doc, manifest_entry
         
     def load_documents(self):
-        """내부 문서 로드"""
+        """내부 문서 로드 (문서 카탈로그가 이미 읽은 본문 사용)"""
         logger.info("문서 로드 시작")
         
         # 경제 용어 및 최신 콘텐츠 로드
-        all_files = list(ECONOMY_TERMS_DIR.glob("*.md")) + list(RECENT_CONTENTS_DIR.glob("*.md"))
-        
-        for file_path in all_files:
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    
-                # 메타데이터 추출
-                file_name = file_path.name
-                title = file_name.replace(".md", "")
-                source_type = "economy_terms" if str(ECONOMY_TERMS_DIR) in str(file_path) else "recent_contents"
-                
-                doc = Document(
-                    page_content=content,
-                    metadata={
-                        "source": str(file_path),
-                        "title": title,
-                        "file_name": file_name,
-                        "source_type": source_type
-                    }
-                )
-                
-                self.docs.append(doc)
-                self.file_paths[file_name] = file_path
-                
-            except Exception as e:
-                logger.error(f"파일 로드 오류: {file_path}, {str(e)}")
+        self.catalog = get_document_catalog()
+        self.catalog.refresh()
+        for entry in self.catalog.entries():
+            doc, manifest_entry = self._document_from_entry(entry)
+            
+            self.docs.append(doc)
+            self.file_paths[entry["file_name"]] = entry["path"]
+            self.file_manifest[f"{entry['source_type']}/{entry['file_name']}"] = manifest_entry
         
         logger.info(f"총 {len(self.docs)}개 문서 로드 완료")
         
-    def create_rag_index(self):
-        """RAG 인덱스 생성"""
-        if not self.docs:
-            raise ValueError("문서가 로드되지 않았습니다")
-            
-        logger.info("RAG 인덱스 생성 시작")
+    def _index_settings(self) -> Dict[str, Any]:
+        """인덱스 내용을 결정하는 설정 (매니페스트 비교용)"""
+        return {
+            "embedding_model": EMBEDDING_MODEL,
+            "chunk_size": CHUNK_SIZE,
+            "chunk_overlap": CHUNK_OVERLAP,
+            "separators": CHUNK_SEPARATORS,
+            "add_start_index": True,
+            "bm25_tokenizer": BM25_TOKENIZER
+        }
         
+    def _chunk_documents(self, docs: List[Document]):
+        """문서를 청크로 분할하고 파일별로 안정적인 청크 ID 부여"""
         # RecursiveCharacterTextSplitter로 청킹 (토큰 제한 방지)
         from langchain.text_splitter import RecursiveCharacterTextSplitter
         
         text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=500,  # 최적화된 청크 크기
-            chunk_overlap=100,  # 중복도 증가
+            chunk_size=CHUNK_SIZE,
+            chunk_overlap=CHUNK_OVERLAP,
             length_function=len,
-            separators=["\n\n", "\n", ".", " ", ""]
+            separators=CHUNK_SEPARATORS,
+            add_start_index=True  # 겹치는 청크를 컨텍스트에서 병합하기 위한 원문 내 위치
         )
         
+        chunk_ids = []
         chunks = []
-        for doc in self.docs:
+        for doc in docs:
             # 모든 문서를 청크로 분할
             doc_chunks = text_splitter.create_documents(
                 texts=[doc.page_content],
                 metadatas=[doc.metadata]
             )
+            file_key = f"{doc.metadata['source_type']}/{doc.metadata['file_name']}"
+            chunk_ids.extend(f"{file_key}#{i}" for i in range(len(doc_chunks)))
             chunks.extend(doc_chunks)
         
-        logger.info(f"총 {len(chunks)}개의 청크 생성")
+        return chunk_ids, chunks
         
-        # 벡터스토어를 배치로 생성
-        batch_size = 50  # 한 번에 처리할 청크 수
+    def _embed_chunks(self, chunks: List[Document]) -> np.ndarray:
+        """청크 임베딩 (캐시 조회 후 누락분만 토큰 기준 배치로 동시 요청)"""
+        vectors = self.embeddings.embed_documents([chunk.page_content for chunk in chunks])
+        return np.asarray(vectors, dtype=np.float32)
         
-        # 빈 벡터스토어로 시작
-        self.vectorstore = None
+    def _build_vectorstore(self, chunk_ids: List[str], chunks: List[Document], embeddings: np.ndarray):
+        """미리 계산된 임베딩으로 Chroma 컬렉션 구성 (임베딩 API 호출 없음)"""
+        vectorstore = Chroma(
+            collection_name="unified_collection",
+            embedding_function=self.embeddings
+        )
         
+        # Chroma의 최대 배치 크기를 넘지 않도록 나누어 추가
+        batch_size = 1000
         for i in range(0, len(chunks), batch_size):
-            batch = chunks[i:i + batch_size]
-            logger.info(f"처리 중: {i}/{len(chunks)}")
-            
-            if self.vectorstore is None:
-                # 첫 배치로 벡터스토어 생성
-                self.vectorstore = Chroma.from_documents(
-                    documents=batch,
-                    embedding=self.embeddings,
-                    collection_name="unified_collection"
-                )
-            else:
-                # 기존 벡터스토어에 추가
-                self.vectorstore.add_documents(batch)
+            vectorstore._collection.upsert(
+                ids=chunk_ids[i:i + batch_size],
+                embeddings=embeddings[i:i + batch_size].tolist(),
+                documents=[chunk.page_content for chunk in chunks[i:i + batch_size]],
+                metadatas=[chunk.metadata for chunk in chunks[i:i + batch_size]]
+            )
         
-        # Ensemble retriever 생성 (Semantic + BM25)
-        vector_retriever = self.vectorstore.as_retriever(search_kwargs={"k": 3})
-        bm25_retriever = BM25Retriever.from_documents(chunks, k=3)
+        return vectorstore
         
-        self.retriever = EnsembleRetriever(
-            retrievers=[vector_retriever, bm25_retriever],
-            weights=[0.6, 0.4]
-        )
+    def _chroma_search(self, chunk_ids: List[str]):
+        """Chroma 컬렉션 검색 결과를 청크 번호로 변환하는 벡터 검색 함수 생성"""
+        collection = self.vectorstore._collection
+        row_of = {chunk_id: row for row, chunk_id in enumerate(chunk_ids)}
+        
+        def search(query_vector, k: int, mask=None, where=None):
+            result = collection.query(query_embeddings=[np.asarray(query_vector).tolist()], n_results=k, where=where,
+                                      include=["distances"])
+            rows, scores = [], []
+            for chunk_id, distance in zip(result["ids"][0], result["distances"][0]):
+                if chunk_id in row_of and (mask is None or mask[row_of[chunk_id]]):
+                    rows.append(row_of[chunk_id])
+                    # 정규화된 임베딩의 제곱 L2 거리를 코사인 유사도로 변환
+                    scores.append(1.0 - distance / 2)
+            return np.asarray(rows, dtype=np.int64), np.asarray(scores, dtype=np.float32)
         
+        return search
+        
+    @property
+    def vector_backend(self) -> str:
+        """실제 사용하는 벡터 검색 백엔드 (읽기 전용 모드는 워커마다 복사본을 만드는 Chroma 대신 numpy)"""
+        return "numpy" if self.index_readonly else VECTOR_BACKEND
+        
+    def _build_searcher(self, chunk_ids: List[str], chunks: List[Document], bm25_index, embeddings: np.ndarray):
+        """하이브리드 검색 스냅샷 생성 (Semantic + BM25)"""
+        if self.vector_backend == "numpy":
+            dense_index = DenseIndex(embeddings)
+            
+            def dense_search(query_vector, k: int, mask=None, where=None):
+                return dense_index.search(query_vector, k, mask)
+        else:
+            dense_search = self._chroma_search(chunk_ids)
+        return HybridSearcher(chunks, bm25_index, dense_search)
+        
+    def build_keyword_index(self):
+        """1단계: 청크와 BM25 리트리버 준비 (임베딩 없이 바로 키워드 검색 가능)"""
+        if not self.docs:
+            raise ValueError("문서가 로드되지 않았습니다")
+            
+        logger.info("키워드 인덱스 생성 시작")
+        self.stages["keyword_index"] = "running"
+        
+        self.index_loaded_from_disk = False
+        
+        if self.index_readonly:
+            # 공유 인덱스가 있으면 바로 하이브리드 검색까지 전환
+            try:
+                if self._map_shared_index():
+                    self.rag_initialized = True
+                    self.stages["keyword_index"] = "ready"
+                    logger.info(f"공유 RAG 인덱스 매핑 완료 ({len(self.chunks)}개 청크)")
+                    return
+            except Exception as e:
+                logger.warning(f"공유 RAG 인덱스 매핑 실패: {str(e)}")
+            logger.warning("공유 RAG 인덱스가 아직 없어 키워드 검색으로 시작합니다 (인덱스가 생성되면 자동 전환)")
+        elif self.index_store.is_current(self._index_settings(), self.file_manifest):
+            try:
+                chunk_ids, chunks, bm25_state = self.index_store.load_chunks()
+                bm25_index = BM25Index.from_state(*bm25_state)
+                self.index_loaded_from_disk = True
+            except Exception as e:
+                logger.warning(f"저장된 RAG 인덱스 로드 실패, 재생성합니다: {str(e)}")
+        
+        if not self.index_loaded_from_disk:
+            chunk_ids, chunks = self._chunk_documents(self.docs)
+            logger.info(f"총 {len(chunks)}개의 청크 생성")
+            bm25_index = BM25Index.build([chunk.page_content for chunk in chunks], BM25_TOKENIZER)
+        
+        self.chunk_ids = chunk_ids
+        self.chunks = chunks
+        self.bm25_index = bm25_index
+        
+        # 벡터 인덱스가 준비될 때까지 BM25만으로 검색
+        self.searcher = HybridSearcher(chunks, bm25_index)
         self.rag_initialized = True
-        logger.info("RAG 인덱스 생성 완료")
+        self.stages["keyword_index"] = "ready"
+        logger.info(f"키워드 인덱스 생성 완료 ({len(chunks)}개 청크)")
+        
+    def build_vector_index(self):
+        """2단계: 임베딩과 벡터스토어 준비 후 하이브리드 검색으로 전환"""
+        if not self.rag_initialized:
+            raise ValueError("키워드 인덱스가 먼저 생성되어야 합니다")
+            
+        if self.index_readonly:
+            # 읽기 전용 워커는 임베딩하지 않고 공유 인덱스가 생기거나 바뀔 때 매핑
+            if not self.vector_ready:
+                self.stages["vector_index"] = "waiting"
+                logger.info("공유 RAG 인덱스를 기다리는 동안 키워드 검색으로 처리합니다")
+            self._start_index_watcher()
+            return
+            
+        logger.info("벡터 인덱스 생성 시작")
+        self.stages["vector_index"] = "running"
+        
+        try:
+            embeddings = None
+            if self.index_loaded_from_disk:
+                try:
+                    embeddings = self.index_store.load_embeddings(mmap=VECTOR_MMAP and self.vector_backend == "numpy")
+                    if len(embeddings) != len(self.chunks):
+                        raise ValueError(f"청크 수({len(self.chunks)})와 임베딩 수({len(embeddings)})가 일치하지 않습니다")
+                except Exception as e:
+                    logger.warning(f"저장된 임베딩 로드 실패, 재생성합니다: {str(e)}")
+                    embeddings = None
+            
+            if embeddings is None:
+                embeddings = self._embed_chunks(self.chunks)
+                self.save_index(embeddings)
+            
+            self.chunk_embeddings = embeddings
+            self.index_size_bytes = self.index_store.size_bytes()
+            if self.vector_backend != "numpy":
+                self.vectorstore = self._build_vectorstore(self.chunk_ids, self.chunks, embeddings)
+            self.searcher = self._build_searcher(self.chunk_ids, self.chunks, self.bm25_index, embeddings)
+            self.stages["vector_index"] = "ready"
+            
+        except Exception:
+            self.stages["vector_index"] = "failed"
+            raise
+        
+        source = "디스크에서 로드" if self.index_loaded_from_disk else "새로 생성"
+        logger.info(f"벡터 인덱스 생성 완료, 하이브리드 검색으로 전환 ({source})")
+        
+    def save_index(self, embeddings: np.ndarray) -> bool:
+        """현재 청크·임베딩·BM25 인덱스를 디스크에 저장 (실패는 치명적이지 않음, 다음 시작 시 재생성)"""
+        try:
+            manifest = self.index_store.build_manifest(self._index_settings(), self.file_manifest)
+            self.index_store.save(manifest, self.chunk_ids, self.chunks, embeddings, self.bm25_index.state())
+            return True
+        except Exception as e:
+            logger.error(f"RAG 인덱스 저장 실패: {str(e)}")
+            return False
+        
+    def _map_shared_index(self) -> bool:
+        """다른 프로세스가 생성한 공유 인덱스를 읽기 전용으로 매핑해 하이브리드 검색 스냅샷 교체
+        
+        매니페스트가 마지막으로 매핑한 것과 같거나 포맷·설정이 다르면 False를 반환합니다.
+        """
+        manifest = self.index_store.load_manifest()
+        if not manifest or manifest.get("created_at") == self._shared_index_created_at:
+            return False
+        if manifest.get("version") != INDEX_FORMAT_VERSION or manifest.get("settings") != self._index_settings():
+            return False
+        
+        chunk_ids, chunks, bm25_state = self.index_store.load_chunks(mmap=True)
+        embeddings = self.index_store.load_embeddings(mmap=True)
+        if len(embeddings) != len(chunks):
+            raise ValueError(f"청크 수({len(chunks)})와 임베딩 수({len(embeddings)})가 일치하지 않습니다")
         
+        # 읽는 도중 인덱스가 교체되었으면 파일이 섞였을 수 있으므로 다음 확인 때 다시 매핑
+        latest = self.index_store.load_manifest()
+        if not latest or latest.get("created_at") != manifest["created_at"]:
+            return False
+        
+        bm25_index = BM25Index.from_state(*bm25_state)
+        searcher = self._build_searcher(chunk_ids, chunks, bm25_index, embeddings)
+        
+        # 참조 교체 (진행 중인 검색은 이전 스냅샷으로 마무리됨)
+        self.chunk_ids = chunk_ids
+        self.chunks = chunks
+        self.chunk_embeddings = embeddings
+        self.bm25_index = bm25_index
+        self.searcher = searcher
+        self.file_manifest = manifest["files"]
+        if self.catalog is not None:
+            self.docs = [self._document_from_entry(entry)[0] for entry in self.catalog.entries()]
+        self.index_loaded_from_disk = True
+        self.index_size_bytes = self.index_store.size_bytes()
+        self.last_update = time.time()
+        
+        remapped = self._shared_index_created_at is not None
+        self._shared_index_created_at = manifest["created_at"]
+        self.stages["vector_index"] = "ready"
+        if remapped:
+            # 문서가 바뀌었으므로 이전 답변은 더 이상 유효하지 않음
+            self.answer_cache.clear()
+            logger.info(f"새 공유 RAG 인덱스로 전환 ({len(chunks)}개 청크)")
+        return True
+        
+    def _start_index_watcher(self):
+        """공유 인덱스 매니페스트를 주기적으로 확인하는 백그라운드 스레드 시작 (이미 실행 중이면 무시)"""
+        if self._index_watcher is not None or RAG_INDEX_POLL_INTERVAL <= 0:
+            return
+        
+        def watch():
+            while True:
+                time.sleep(RAG_INDEX_POLL_INTERVAL)
+                process = self._rebuild_process
+                if process is not None and process.poll() is not None:
+                    logger.info(f"공유 RAG 인덱스 재생성 프로세스 종료 (종료 코드 {process.returncode})")
+                    self._rebuild_process = None
+                try:
+                    self._map_shared_index()
+                except Exception as e:
+                    logger.warning(f"공유 RAG 인덱스 매핑 실패, 다음 확인 때 다시 시도합니다: {str(e)}")
+        
+        self._index_watcher = threading.Thread(target=watch, name="rag-index-watcher", daemon=True)
+        self._index_watcher.start()
+        
+    def request_shared_rebuild(self) -> Dict[str, Any]:
+        """공유 인덱스 생성 스크립트를 백그라운드로 실행 (완료되면 모든 워커가 새 인덱스로 전환)"""
+        if self._rebuild_process is not None and self._rebuild_process.poll() is None:
+            return {"status": "busy", "message": "공유 인덱스 재생성이 이미 진행 중입니다"}
+        self._rebuild_process = subprocess.Popen([sys.executable, str(RAG_INDEX_BUILD_SCRIPT)], cwd=str(ROOT_DIR))
+        logger.info(f"공유 RAG 인덱스 재생성 시작 (pid {self._rebuild_process.pid})")
+        return {
+            "status": "rebuilding",
+            "message": "공유 인덱스를 다시 생성합니다. 완료되면 모든 워커가 새 인덱스로 전환합니다"
+        }
+        
+    @property
+    def vector_ready(self) -> bool:
+        return self.stages["vector_index"] == "ready"
+        
+    def create_rag_index(self):
+        """RAG 인덱스 생성 (저장된 인덱스가 최신이면 디스크에서 로드)"""
+        self.build_keyword_index()
+        self.build_vector_index()
+        
+    def refresh_index(self) -> Dict[str, Any]:
+        """변경/추가/삭제된 문서만 다시 청킹·임베딩하여 인덱스 갱신
+        
+        검색은 갱신 중에도 기존 검색 스냅샷으로 계속 처리되며, 새 스냅샷이
+        준비되면 참조만 교체합니다.
+        """
+        if self.index_readonly:
+            # 공유 인덱스는 별도 프로세스가 다시 만들고 각 워커는 매니페스트 변경을 보고 재매핑
+            return self.request_shared_rebuild()
+        if not self.vector_ready:
+            return {"status": "not_ready", "message": "RAG 인덱스가 아직 준비되지 않았습니다"}
+            
+        if not self._refresh_lock.acquire(blocking=False):
+            return {"status": "busy", "message": "인덱스 갱신이 이미 진행 중입니다"}
+            
+        try:
+            start_time = time.time()
+            # 카탈로그는 크기와 수정 시각이 바뀐 파일만 다시 읽음
+            self.catalog.refresh()
+            
+            new_manifest = {}
+            changed_docs = {}
+            for entry in self.catalog.entries():
+                file_key = f"{entry['source_type']}/{entry['file_name']}"
+                previous = self.file_manifest.get(file_key)
+                if previous and previous["sha256"] == entry["sha256"]:
+                    new_manifest[file_key] = previous
+                    continue
+                doc, manifest_entry = self._document_from_entry(entry)
+                new_manifest[file_key] = manifest_entry
+                changed_docs[file_key] = doc
+            
+            added = [key for key in changed_docs if key not in self.file_manifest]
+            updated = [key for key in changed_docs if key in self.file_manifest]
+            deleted = [key for key in self.file_manifest if key not in new_manifest]
+            
+            summary = {
+                "status": "success",
+                "added": len(added),
+                "updated": len(updated),
+                "deleted": len(deleted)
+            }
+            
+            if not changed_docs and not deleted:
+                self.file_manifest = new_manifest
+                summary["chunk_count"] = len(self.chunks)
+                summary["elapsed"] = round(time.time() - start_time, 3)
+                logger.info("인덱스 갱신: 변경된 문서 없음")
+                return summary
+            
+            stale_keys = set(updated) | set(deleted)
+            
+            def file_key_of(doc):
+                return f"{doc.metadata['source_type']}/{doc.metadata['file_name']}"
+            
+            # 유지되는 청크 (변경·삭제되지 않은 파일)
+            keep_rows = [i for i, chunk in enumerate(self.chunks) if file_key_of(chunk) not in stale_keys]
+            stale_ids = [self.chunk_ids[i] for i, chunk in enumerate(self.chunks) if file_key_of(chunk) in stale_keys]
+            
+            # 변경된 문서만 청킹 및 임베딩
+            new_ids, new_chunks = self._chunk_documents(list(changed_docs.values()))
+            new_embeddings = self._embed_chunks(new_chunks) if new_chunks else np.zeros(
+                (0, self.chunk_embeddings.shape[1]), dtype=np.float32)
+            
+            chunk_ids = [self.chunk_ids[i] for i in keep_rows] + new_ids
+            chunks = [self.chunks[i] for i in keep_rows] + new_chunks
+            embeddings = np.concatenate([self.chunk_embeddings[keep_rows], new_embeddings])
+            
+            # 벡터스토어: 새 청크를 먼저 반영한 뒤 남은 옛 청크 삭제
+            if self.vectorstore is not None:
+                if new_chunks:
+                    self.vectorstore._collection.upsert(
+                        ids=new_ids,
+                        embeddings=new_embeddings.tolist(),
+                        documents=[chunk.page_content for chunk in new_chunks],
+                        metadatas=[chunk.metadata for chunk in new_chunks]
+                    )
+                obsolete_ids = sorted(set(stale_ids) - set(new_ids))
+                if obsolete_ids:
+                    self.vectorstore._collection.delete(ids=obsolete_ids)
+            
+            # BM25 통계는 코퍼스 전체에 의존하므로 새 청크 목록으로 재구성
+            bm25_index = BM25Index.build([chunk.page_content for chunk in chunks], BM25_TOKENIZER)
+            searcher = self._build_searcher(chunk_ids, chunks, bm25_index, embeddings)
+            
+            docs = [doc for doc in self.docs if file_key_of(doc) not in stale_keys] + list(changed_docs.values())
+            
+            # 참조 교체 (진행 중인 검색은 이전 객체로 마무리됨)
+            self.chunk_ids = chunk_ids
+            self.chunks = chunks
+            self.chunk_embeddings = embeddings
+            self.bm25_index = bm25_index
+            self.searcher = searcher
+            self.docs = docs
+            self.file_manifest = new_manifest
+            self.file_paths = {doc.metadata["file_name"]: Path(doc.metadata["source"]) for doc in docs}
+            self.last_update = time.time()
+            
+            # 문서가 바뀌었으므로 이전 답변은 더 이상 유효하지 않음
+            self.answer_cache.clear()
+            
+            try:
+                manifest = self.index_store.build_manifest(self._index_settings(), new_manifest)
+                self.index_store.save(manifest, chunk_ids, chunks, embeddings, bm25_index.state())
+                self.index_size_bytes = self.index_store.size_bytes()
+            except Exception as e:
+                logger.error(f"RAG 인덱스 저장 실패: {str(e)}")
+            
+            summary["chunk_count"] = len(chunks)
+            summary["embedded_chunks"] = len(new_chunks)
+            summary["elapsed"] = round(time.time() - start_time, 3)
+            logger.info(f"인덱스 갱신 완료: {summary}")
+            return summary
+            
+        finally:
+            self._refresh_lock.release()
+        
+    def _create_http_session(self) -> requests.Session:
+        """Perplexity 호출용 keep-alive 세션 (연결 풀 재사용으로 DNS/TLS 핸드셰이크 생략)"""
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=PERPLEXITY_POOL_SIZE,
+            max_retries=0  # 재시도는 _post_perplexity에서 처리
+        )
+        session.mount("https://", adapter)
+        session.headers.update({
+            "Authorization": f"Bearer {self.perplexity_api_key}",
+            "Content-Type": "application/json"
+        })
+        return session
+        
+    def _post_perplexity(self, payload: Dict[str, Any], max_retries: int = 3, deadline: float = 45):
+        """Perplexity API 호출 (지터 백오프 재시도, 전체 제한 시간 적용)
+        
+        연결 오류·타임아웃과 429/5xx 응답만 재시도하며, 제한 시간을 넘기면
+        requests.exceptions.Timeout을 발생시킵니다.
+        """
+        start_time = time.time()
+        retry_delay = 1.0
+        
+        for retry in range(max_retries):
+            remaining = deadline - (time.time() - start_time)
+            if remaining <= 0:
+                raise requests.exceptions.Timeout(f"Perplexity API 전체 제한 시간({deadline}초) 초과")
+                
+            try:
+                response = self.http_session.post(
+                    PERPLEXITY_API_URL,
+                    json=payload,
+                    timeout=(PERPLEXITY_CONNECT_TIMEOUT, remaining)
+                )
+                if response.status_code not in (429, 500, 502, 503, 504) or retry == max_retries - 1:
+                    return response
+                logger.warning(f"Perplexity API 응답 오류 {response.status_code} (시도 {retry+1}/{max_retries})")
+                
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+                logger.warning(f"Perplexity API 요청 실패 (시도 {retry+1}/{max_retries}): {str(e)}")
+                if retry == max_retries - 1:
+                    raise
+            
+            # Full jitter: 0 ~ retry_delay 사이 임의 대기 (남은 시간 초과 금지)
+            sleep_time = min(random.uniform(0, retry_delay), max(0, deadline - (time.time() - start_time)))
+            logger.info(f"{sleep_time:.2f}초 후 재시도합니다...")
+            time.sleep(sleep_time)
+            retry_delay *= 2
+    
     @lru_cache(maxsize=1)  # 캐싱을 통한 성능 최적화
     def check_perplexity_api(self):
         """Perplexity API 연결 확인"""
@@ -183,42 +751,23 @@ class UnifiedChatbot:
             return True
             
         try:
-            # API 연결 테스트
-            headers = {
-                "Authorization": f"Bearer {self.perplexity_api_key}",
-                "Content-Type": "application/json"
-            }
+            # API 연결 테스트 (간단한 테스트 쿼리)
+            response = self._post_perplexity(
+                {
+                    "model": PERPLEXITY_MODEL,
+                    "messages": [{"role": "user", "content": "test"}],
+                    "max_tokens": 10
+                },
+                max_retries=2,
+                deadline=20
+            )
             
-            # 간단한 테스트 쿼리
-            max_retries = 2
-            retry_delay = 2
+            self.perplexity_initialized = response.status_code == 200
+            logger.info(f"Perplexity API 연결 확인: {self.perplexity_initialized}")
+            return self.perplexity_initialized
             
-            for retry in range(max_retries):
-                try:
-                    response = requests.post(
-                        "https://api.perplexity.ai/chat/completions",
-                        headers=headers,
-                        json={
-                            "model": "llama-3.1-sonar-small-128k-online",
-                            "messages": [{"role": "user", "content": "test"}],
-                            "max_tokens": 10
-                        },
-                        timeout=10  # 타임아웃 증가
-                    )
-                    
-                    self.perplexity_initialized = response.status_code == 200
-                    logger.info(f"Perplexity API 연결 확인: {self.perplexity_initialized}")
-                    return self.perplexity_initialized
-                    
-                except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
-                    logger.warning(f"Perplexity API 테스트 중 연결 오류 (시도 {retry+1}/{max_retries}): {str(e)}")
-                    if retry < max_retries - 1:
-                        time.sleep(retry_delay)
-                    else:
-                        logger.error("Perplexity API 연결 시도 실패")
-                        break
-            
-            # 모든 재시도 실패
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+            logger.error(f"Perplexity API 연결 시도 실패: {str(e)}")
             self.perplexity_initialized = False
             return False
             
@@ -228,28 +777,67 @@ class UnifiedChatbot:
             return False
     
     def check_gemini_api(self):
-        """Gemini API 연결 확인"""
+        """Gemini API 연결 확인 (모델 메타데이터 조회만 하므로 생성 비용 없음)"""
         if not self.gemini_api_key or not self.gemini_configured:
             logger.warning("Gemini API 키가 없거나 구성되지 않았습니다")
             return False
             
         try:
             # API 연결 테스트
-            gemini_model = genai.GenerativeModel('gemini-1.5-flash')
-            response = gemini_model.generate_content("테스트")
+            model_info = genai.get_model(f"models/{GEMINI_MODEL}")
             
             # 응답 확인
-            if response and hasattr(response, 'text'):
-                logger.info("Gemini API 연결 확인: 성공")
+            if "generateContent" in getattr(model_info, "supported_generation_methods", []):
+                logger.info(f"Gemini API 연결 확인: 성공 ({GEMINI_MODEL})")
                 return True
             else:
-                logger.warning("Gemini API 응답 형식이 올바르지 않습니다")
+                logger.warning(f"Gemini 모델이 텍스트 생성을 지원하지 않습니다: {GEMINI_MODEL}")
                 return False
                 
         except Exception as e:
             logger.error(f"Gemini API 연결 확인 실패: {str(e)}")
             return False
     
+    def _perplexity_payload(self, query: str) -> Dict[str, Any]:
+        """웹 검색용 Perplexity 요청 본문"""
+        return {
+            "model": PERPLEXITY_MODEL,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": "당신은 최신 한국 경제 정보를 제공하는 전문가입니다. 정확한 정보와 함께 출처를 제공하세요."
+                },
+                {
+                    "role": "user",
+                    "content": query
+                }
+            ],
+            "temperature": 0.2,
+            "return_citations": True,
+            "return_related_questions": True
+        }
+        
+    def _perplexity_result(self, status_code: int, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Perplexity 응답을 검색 결과 형식으로 변환"""
+        if status_code == 200:
+            # 응답에서 정보 추출
+            answer = result.get("choices", [{}])[0].get("message", {}).get("content", "")
+            # Perplexity API는 citations를 별도로 제공하지 않을 수 있음
+            citations = []
+            
+            return {
+                "success": True,
+                "answer": answer,
+                "citations": citations
+            }
+        else:
+            logger.error(f"Perplexity API 오류: {result}")
+            return {
+                "success": False,
+                "answer": "웹 검색 중 오류가 발생했습니다.",
+                "citations": []
+            }
+    
     def search_with_perplexity(self, query: str):
         """Perplexity API로 실시간 웹 검색"""
         if not self.perplexity_initialized:
@@ -261,70 +849,91 @@ class UnifiedChatbot:
             }
             
         try:
-            headers = {
-                "Authorization": f"Bearer {self.perplexity_api_key}",
-                "Content-Type": "application/json"
-            }
+            # 연결 풀을 재사용하며 지터가 있는 지수 백오프로 재시도 (전체 제한 시간 내)
+            with self.latency.track("perplexity"):
+                response = self._post_perplexity(self._perplexity_payload(query), max_retries=3,
+                                                 deadline=PERPLEXITY_DEADLINE)
             
-            payload = {
-                "model": "llama-3.1-sonar-small-128k-online",
-                "messages": [
-                    {
-                        "role": "system",
-                        "content": "당신은 최신 한국 경제 정보를 제공하는 전문가입니다. 정확한 정보와 함께 출처를 제공하세요."
-                    },
-                    {
-                        "role": "user",
-                        "content": query
-                    }
-                ],
-                "temperature": 0.2,
-                "return_citations": True,
-                "return_related_questions": True
+            return self._perplexity_result(response.status_code, response.json())
+                
+        except Exception as e:
+            logger.error(f"Perplexity 검색 오류: {str(e)}")
+            return {
+                "success": False,
+                "answer": f"검색 중 오류 발생: {str(e)}",
+                "citations": []
             }
+    
+    def _get_aio_session(self) -> aiohttp.ClientSession:
+        """현재 이벤트 루프용 Perplexity keep-alive 세션 (루프마다 하나)"""
+        loop = asyncio.get_running_loop()
+        if self._aio_session is None or self._aio_session[0] is not loop or self._aio_session[1].closed:
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=PERPLEXITY_ASYNC_POOL_SIZE),
+                headers={
+                    "Authorization": f"Bearer {self.perplexity_api_key}",
+                    "Content-Type": "application/json"
+                }
+            )
+            self._aio_session = (loop, session)
+        return self._aio_session[1]
+        
+    async def aclose(self):
+        """현재 이벤트 루프에서 만든 비동기 클라이언트 종료 (Perplexity aiohttp 세션, Gemini gRPC 채널)"""
+        loop = asyncio.get_running_loop()
+        if self._aio_session is not None and self._aio_session[0] is loop:
+            session = self._aio_session[1]
+            self._aio_session = None
+            await session.close()
+        
+        async_client = getattr(self.gemini_model, "_async_client", None)
+        if async_client is not None:
+            self.gemini_model._async_client = None
+            await async_client.transport.close()
+        
+    async def _post_perplexity_async(self, payload: Dict[str, Any], max_retries: int = 3, deadline: float = 45):
+        """Perplexity API 호출 (비동기, _post_perplexity와 같은 재시도 정책), (상태 코드, 응답 JSON) 반환"""
+        session = self._get_aio_session()
+        start_time = time.time()
+        retry_delay = 1.0
+        
+        for retry in range(max_retries):
+            remaining = deadline - (time.time() - start_time)
+            if remaining <= 0:
+                raise asyncio.TimeoutError(f"Perplexity API 전체 제한 시간({deadline}초) 초과")
+                
+            try:
+                timeout = aiohttp.ClientTimeout(total=remaining, connect=PERPLEXITY_CONNECT_TIMEOUT)
+                async with session.post(PERPLEXITY_API_URL, json=payload, timeout=timeout) as response:
+                    if response.status not in (429, 500, 502, 503, 504) or retry == max_retries - 1:
+                        return response.status, await response.json(content_type=None)
+                logger.warning(f"Perplexity API 응답 오류 {response.status} (시도 {retry+1}/{max_retries})")
+                
+            except (asyncio.TimeoutError, aiohttp.ClientConnectionError) as e:
+                logger.warning(f"Perplexity API 요청 실패 (시도 {retry+1}/{max_retries}): {str(e)}")
+                if retry == max_retries - 1:
+                    raise
             
-            # 타임아웃 증가 및 재시도 로직 추가
-            max_retries = 3
-            retry_delay = 2  # 초 단위
+            sleep_time = min(random.uniform(0, retry_delay), max(0, deadline - (time.time() - start_time)))
+            logger.info(f"{sleep_time:.2f}초 후 재시도합니다...")
+            await asyncio.sleep(sleep_time)
+            retry_delay *= 2
+    
+    async def search_with_perplexity_async(self, query: str):
+        """Perplexity API로 실시간 웹 검색 (비동기, 응답 대기 중 스레드를 점유하지 않음)"""
+        if not self.perplexity_initialized:
+            logger.warning("Perplexity API가 초기화되지 않았습니다")
+            return {
+                "success": False,
+                "answer": "웹 검색 기능을 사용할 수 없습니다.",
+                "citations": []
+            }
             
-            for retry in range(max_retries):
-                try:
-                    response = requests.post(
-                        "https://api.perplexity.ai/chat/completions",
-                        headers=headers,
-                        json=payload,
-                        timeout=45  # 타임아웃 증가
-                    )
-                    break  # 성공하면 반복 종료
-                except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
-                    logger.warning(f"Perplexity API 요청 실패 (시도 {retry+1}/{max_retries}): {str(e)}")
-                    if retry < max_retries - 1:
-                        logger.info(f"{retry_delay}초 후 재시도합니다...")
-                        time.sleep(retry_delay)
-                        retry_delay *= 2  # 지수 백오프
-                    else:
-                        raise  # 최대 재시도 횟수 초과 시 예외 발생
-            
-            result = response.json()
-            
-            if response.status_code == 200:
-                # 응답에서 정보 추출
-                answer = result.get("choices", [{}])[0].get("message", {}).get("content", "")
-                # Perplexity API는 citations를 별도로 제공하지 않을 수 있음
-                citations = []
-                
-                return {
-                    "success": True,
-                    "answer": answer,
-                    "citations": citations
-                }
-            else:
-                logger.error(f"Perplexity API 오류: {result}")
-                return {
-                    "success": False,
-                    "answer": "웹 검색 중 오류가 발생했습니다.",
-                    "citations": []
-                }
+        try:
+            with self.latency.track("perplexity"):
+                status_code, result = await self._post_perplexity_async(
+                    self._perplexity_payload(query), max_retries=3, deadline=PERPLEXITY_DEADLINE)
+            return self._perplexity_result(status_code, result)
                 
         except Exception as e:
             logger.error(f"Perplexity 검색 오류: {str(e)}")
@@ -334,6 +943,27 @@ class UnifiedChatbot:
                 "citations": []
             }
     
+    def _gemini_prompt(self, query: str) -> str:
+        """시스템 프롬프트와 사용자 질의 결합"""
+        system_prompt = "당신은 최신 한국 경제 정보를 제공하는 전문가입니다. 정확한 정보와 함께 필요한 경우 출처를 제공하세요."
+        return f"{system_prompt}\n\n사용자 질문: {query}"
+        
+    def _gemini_result(self, response) -> Dict[str, Any]:
+        """Gemini 응답을 검색 결과 형식으로 변환"""
+        if response and hasattr(response, 'text'):
+            return {
+                "success": True,
+                "answer": response.text,
+                "citations": []  # Gemini는 별도 인용 형식이 없음
+            }
+        else:
+            logger.error("Gemini API 응답이 유효하지 않습니다")
+            return {
+                "success": False,
+                "answer": "응답 처리 중 오류가 발생했습니다.",
+                "citations": []
+            }
+    
     def search_with_gemini(self, query: str):
         """Gemini API로 질의 처리"""
         if not self.gemini_configured:
@@ -345,30 +975,33 @@ class UnifiedChatbot:
             }
             
         try:
-            # Gemini 모델 인스턴스 생성 (온라인 검색 지원 모델)
-            gemini_model = genai.GenerativeModel('gemini-1.5-flash')
-            
-            # 시스템 프롬프트와 사용자 질의 결합
-            system_prompt = "당신은 최신 한국 경제 정보를 제공하는 전문가입니다. 정확한 정보와 함께 필요한 경우 출처를 제공하세요."
-            full_prompt = f"{system_prompt}\n\n사용자 질문: {query}"
-            
-            # Gemini API 호출
-            response = gemini_model.generate_content(full_prompt)
-            
-            # 응답 처리
-            if response and hasattr(response, 'text'):
-                return {
-                    "success": True,
-                    "answer": response.text,
-                    "citations": []  # Gemini는 별도 인용 형식이 없음
-                }
-            else:
-                logger.error("Gemini API 응답이 유효하지 않습니다")
-                return {
-                    "success": False,
-                    "answer": "응답 처리 중 오류가 발생했습니다.",
-                    "citations": []
-                }
+            # 초기화 시 만든 모델 핸들을 재사용하여 Gemini API 호출
+            with self.latency.track("gemini"):
+                response = self.gemini_model.generate_content(self._gemini_prompt(query))
+            return self._gemini_result(response)
+                
+        except Exception as e:
+            logger.error(f"Gemini 검색 오류: {str(e)}")
+            return {
+                "success": False,
+                "answer": f"Gemini 검색 중 오류 발생: {str(e)}",
+                "citations": []
+            }
+    
+    async def search_with_gemini_async(self, query: str):
+        """Gemini API로 질의 처리 (비동기, 대기 중 스레드를 점유하지 않음)"""
+        if not self.gemini_configured:
+            logger.warning("Gemini API가 구성되지 않았습니다")
+            return {
+                "success": False,
+                "answer": "Gemini API 검색 기능을 사용할 수 없습니다.",
+                "citations": []
+            }
+            
+        try:
+            with self.latency.track("gemini"):
+                response = await self.gemini_model.generate_content_async(self._gemini_prompt(query))
+            return self._gemini_result(response)
                 
         except Exception as e:
             logger.error(f"Gemini 검색 오류: {str(e)}")
@@ -378,83 +1011,221 @@ class UnifiedChatbot:
                 "citations": []
             }
     
-    def search_internal_documents(self, query: str):
-        """내부 문서에서 관련 정보 검색"""
+    def _get_async_loop(self) -> asyncio.AbstractEventLoop:
+        """비동기 API 호출을 처리하는 백그라운드 이벤트 루프 (최초 호출 시 시작)"""
+        with self._async_loop_lock:
+            if self._async_loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="chatbot-async", daemon=True).start()
+                self._async_loop = loop
+            return self._async_loop
+    
+    def search_documents(self, query: str, limit: int = 10, filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """문서 전문 검색 (BM25 청크 점수로 문서 순위와 강조 스니펫 생성, LLM·임베딩 호출 없음)"""
+        searcher = self.searcher
+        if searcher is None:
+            raise RuntimeError("검색 인덱스가 아직 준비되지 않았습니다")
+        
+        # 검색 스냅샷의 청크 목록이 바뀐 경우에만 문서 매핑을 다시 만듦
+        document_searcher = self._document_searcher
+        if document_searcher is None or document_searcher.chunks is not searcher.chunks:
+            document_searcher = DocumentSearcher(searcher.chunks, searcher.bm25_index, searcher.metadata_index)
+            self._document_searcher = document_searcher
+        
+        return document_searcher.search(query, limit, normalize_filters(**(filters or {})))
+        
+    def search_internal_documents(self, query: str, k: Optional[int] = None, weights: Optional[List[float]] = None,
+                                  query_vector=None, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """내부 문서에서 관련 정보 검색
+        
+        벡터 검색과 BM25 검색 결과를 RRF로 합친 상위 k개를
+        {"document", "score", "dense_score", "bm25_score"} 목록으로 반환합니다.
+        재정렬기가 설정되어 있으면 RERANK_CANDIDATES개 후보를 재정렬해 토큰 예산 안에서
+        상위 k개를 고르고 "rerank_score"를 추가합니다.
+        filters(normalize_filters 결과: source_type, date_from, date_to)로 검색 대상을 미리 제한하며,
+        query_vector가 주어지면 질의 임베딩을 다시 계산하지 않습니다.
+        """
         if not self.rag_initialized:
             logger.warning("RAG가 초기화되지 않아 내부 문서 검색을 건너뜁니다")
             return []
             
+        k = normalize_top_k(k) or RETRIEVAL_K
+        weights = normalize_weights(weights) or list(RETRIEVAL_WEIGHTS)
+        
+        def embed_query(text):
+            return query_vector if query_vector is not None else self.query_embedder.embed_query(text)
+            
+        candidates = max(k, RERANK_CANDIDATES) if self.reranker else k
+            
         try:
             start_time = time.time()
-            docs = self.retriever.get_relevant_documents(query)
+            searcher = self.searcher
+            hits = searcher.search(
+                query, embed_query, k=candidates, weights=weights,
+                fetch_k=max(candidates, RETRIEVAL_FETCH_K), executor=self.retrieval_executor,
+                filters=filters
+            )
+            self.latency.record("retrieval", time.time() - start_time)
+            
+            if self.reranker:
+                with self.latency.track("rerank"):
+                    hits = rerank(query, hits, self.reranker, searcher.bm25_index, top_n=k,
+                                  max_tokens=RERANK_MAX_TOKENS, count_tokens=count_tokens)
+            
             elapsed = time.time() - start_time
-            logger.info(f"내부 문서 검색 완료: {len(docs)}개 문서 발견 ({elapsed:.2f}초 소요)")
-            return docs
+            logger.info(f"내부 문서 검색 완료: {len(hits)}개 문서 발견 ({elapsed:.2f}초 소요)")
+            return hits
         except Exception as e:
             logger.error(f"내부 문서 검색 오류: {str(e)}")
             return []
     
-    def process_query(self, query: str, use_gemini: bool = False) -> Dict[str, Any]:
-        """사용자 질의 처리 (RAG + Gemini/Perplexity 통합)"""
-        if not self.initialized:
-            return {
-                "answer": "챗봇이 아직 초기화되지 않았습니다.",
-                "citations": [],
-                "sources_used": {"internal": False, "web": False}
-            }
+    def _source_branches(self, start_time: float, internal_future, web_future) -> Dict[Any, Any]:
+        """검색 분기별 (이름, 제한 시각, 시간 초과 시 대체 결과)"""
+        return {
+            internal_future: ("internal", start_time + INTERNAL_SEARCH_TIMEOUT,
+                              {"hits": [], "query_vector": None, "cached": None}),
+            web_future: ("web", start_time + WEB_SEARCH_TIMEOUT, {
+                "success": False,
+                "answer": "웹 검색 시간이 초과되었습니다.",
+                "citations": []
+            })
+        }
+    
+    def _search_internal_branch(self, query: str, retrieval: Optional[Dict[str, Any]] = None,
+                                semantic_backend: Optional[str] = None) -> Dict[str, Any]:
+        """내부 문서 검색 분기 → {"hits", "query_vector", "cached"}
+        
+        semantic_backend가 주어지면 질의를 임베딩해 유사 질의 캐시를 먼저 확인하고,
+        적중하면 검색하지 않고 캐시된 답변을 반환합니다 (임베딩은 웹 검색과 동시에 진행됨).
+        """
+        query_vector = None
+        if semantic_backend is not None:
+            try:
+                query_vector = self.query_embedder.embed_query(query)
+            except Exception as e:
+                logger.warning(f"질의 임베딩 실패, 유사 질의 캐시를 건너뜁니다: {str(e)}")
+                self.answer_cache.record_miss()
+            else:
+                cached = self.answer_cache.get(query, semantic_backend, query_vector)
+                if cached:
+                    return {"hits": [], "query_vector": query_vector, "cached": cached}
+        
+        hits = self.search_internal_documents(query, query_vector=query_vector, **(retrieval or {}))
+        return {"hits": hits, "query_vector": query_vector, "cached": None}
+    
+    def _iter_sources(self, query: str, use_gemini: bool = False, retrieval: Optional[Dict[str, Any]] = None,
+                      semantic_backend: Optional[str] = None):
+        """내부 문서 검색과 웹 검색을 동시에 실행하고 끝나는 순서대로 (이름, 결과) 반환
+        
+        분기별 제한 시간을 넘긴 검색은 기다리지 않고 빈 결과로 대체합니다.
+        retrieval은 내부 문서 검색 옵션 (k, weights, filters)이며, 내부 분기 결과는
+        _search_internal_branch의 dict입니다.
+        """
+        if use_gemini and self.gemini_configured:
+            # Gemini는 비동기 API로 호출하여 응답 대기 중 작업 스레드를 점유하지 않음
+            web_future = asyncio.run_coroutine_threadsafe(self.search_with_gemini_async(query), self._get_async_loop())
+        else:
+            web_future = self.executor.submit(self.search_with_perplexity, query)
             
-        # 개발 모드 체크 완전 제거 - 항상 실제 문서 사용
-        if False:  # 절대 실행되지 않는 코드
-            logger.info(f"테스트 모드에서 질의 처리: {query}")
-            return {
-                "answer": f"[개발 모드] '{query}'에 대한 가상 답변입니다.",
-                "citations": [],
-                "sources_used": {"internal": False, "web": False}
-            }
+        start_time = time.time()
+        internal_future = self.executor.submit(self._search_internal_branch, query, retrieval, semantic_backend)
+        pending = self._source_branches(start_time, internal_future, web_future)
         
-        # 1. 내부 문서 검색
-        internal_docs = self.search_internal_documents(query)
+        while pending:
+            nearest_deadline = min(deadline for _, deadline, _ in pending.values())
+            done, _ = wait(pending, timeout=max(0, nearest_deadline - time.time()), return_when=FIRST_COMPLETED)
+            
+            for future in done:
+                name, _, fallback = pending.pop(future)
+                try:
+                    yield name, future.result()
+                except Exception as e:
+                    logger.error(f"검색 분기 오류 ({name}): {str(e)}")
+                    yield name, fallback
+            
+            now = time.time()
+            for future, (name, deadline, fallback) in list(pending.items()):
+                if deadline <= now:
+                    # 이미 실행 중인 요청은 취소되지 않지만 결과를 기다리지 않음
+                    pending.pop(future)
+                    future.cancel()
+                    logger.warning(f"검색 분기 제한 시간 초과 ({name}, {now - start_time:.2f}초)")
+                    yield name, fallback
+    
+    async def _aiter_sources(self, query: str, use_gemini: bool = False, retrieval: Optional[Dict[str, Any]] = None,
+                             semantic_backend: Optional[str] = None):
+        """_iter_sources의 비동기 버전
         
-        # 2. API로 웹 검색 (Gemini 또는 Perplexity 사용)
-        web_search_result = {}
+        웹 검색은 이벤트 루프에서 기다리고, CPU 위주의 내부 문서 검색만 작업 스레드에서 실행합니다.
+        """
+        loop = asyncio.get_running_loop()
         if use_gemini and self.gemini_configured:
-            web_search_result = self.search_with_gemini(query)
+            web_task = asyncio.ensure_future(self.search_with_gemini_async(query))
         else:
-            web_search_result = self.search_with_perplexity(query)
+            web_task = asyncio.ensure_future(self.search_with_perplexity_async(query))
+            
+        start_time = time.time()
+        internal_task = loop.run_in_executor(
+            self.executor, self._search_internal_branch, query, retrieval, semantic_backend)
+        pending = self._source_branches(start_time, internal_task, web_task)
         
-        # 3. 결과 통합
-        sources_used = {
-            "internal": len(internal_docs) > 0,
-            "web": web_search_result.get("success", False),
-            "api": "gemini" if use_gemini and self.gemini_configured else "perplexity"
-        }
+        while pending:
+            nearest_deadline = min(deadline for _, deadline, _ in pending.values())
+            done, _ = await asyncio.wait(pending, timeout=max(0, nearest_deadline - time.time()),
+                                         return_when=asyncio.FIRST_COMPLETED)
+            
+            for future in done:
+                name, _, fallback = pending.pop(future)
+                try:
+                    yield name, future.result()
+                except Exception as e:
+                    logger.error(f"검색 분기 오류 ({name}): {str(e)}")
+                    yield name, fallback
+            
+            now = time.time()
+            for future, (name, deadline, fallback) in list(pending.items()):
+                if deadline <= now:
+                    pending.pop(future)
+                    future.cancel()
+                    logger.warning(f"검색 분기 제한 시간 초과 ({name}, {now - start_time:.2f}초)")
+                    yield name, fallback
+    
+    def _build_context(self, internal_hits: List[Dict[str, Any]], web_search_result: Dict[str, Any]):
+        """검색 결과로 프롬프트 컨텍스트와 인용 목록 구성
         
+        같은 파일의 겹치는 청크는 하나로 병합하고, 점수 순으로 CONTEXT_MAX_TOKENS
+        토큰 예산을 채웁니다. 웹 검색 답변은 CONTEXT_WEB_MAX_TOKENS까지만 사용합니다.
+        """
         # 프롬프트 구성
         context_parts = []
         citations = []
         
+        spans = select_spans(merge_hits(internal_hits), CONTEXT_MAX_TOKENS, count_tokens, truncate_tokens)
+        
         # 내부 문서 정보 추가
-        if internal_docs:
+        if spans:
             context_parts.append("=== 내부 문서 정보 ===")
-            for i, doc in enumerate(internal_docs):
+            for i, span in enumerate(spans):
+                doc = span["document"]
                 context_parts.append(f"\n[내부문서 {i+1}] {doc.metadata.get('title')}")
-                context_parts.append(doc.page_content[:500])
+                context_parts.append(span["text"])
                 
                 # 문서의 실제 인용 구간 저장
-                quoted_content = doc.page_content.strip()[:150]  # 처음 150자
+                quoted_content = span["text"].strip()[:150]  # 처음 150자
                 citations.append({
                     "type": "internal",
                     "title": doc.metadata.get('title'),
                     "source": doc.metadata.get('source'),
                     "file_name": doc.metadata.get('file_name'),
                     "source_type": doc.metadata.get('source_type'),
-                    "quoted_text": quoted_content  # 인용된 텍스트 구간
+                    "quoted_text": quoted_content,  # 인용된 텍스트 구간
+                    "score": round(span["score"], 6)
                 })
         
         # 웹 검색 정보 추가
         if web_search_result.get("success") and web_search_result.get("answer"):
             context_parts.append("\n=== 최신 웹 정보 ===")
-            context_parts.append(web_search_result["answer"])
+            context_parts.append(truncate_tokens(web_search_result["answer"], CONTEXT_WEB_MAX_TOKENS))
             
             # 웹 출처 추가
             for citation in web_search_result.get("citations", []):
@@ -478,7 +1249,10 @@ class UnifiedChatbot:
                         "source": "웹"
                     })
         
-        # GPT로 최종 답변 생성
+        return context_parts, citations
+        
+    def _answer_chain(self, query: str, context_parts: List[str]):
+        """최종 답변 생성용 체인과 입력값 반환"""
         if context_parts:
             # 컨텍스트가 있는 경우
             prompt = ChatPromptTemplate.from_messages([
@@ -497,13 +1271,10 @@ class UnifiedChatbot:
                 ("human", "{context}\n\n질문: {query}")
             ])
             
-            chain = prompt | self.llm
-            response = chain.invoke({
+            inputs = {
                 "context": "\n".join(context_parts),
                 "query": query
-            })
-            
-            answer = response.content
+            }
         else:
             # 컨텍스트가 없는 경우 (일반 대화)
             prompt = ChatPromptTemplate.from_messages([
@@ -512,15 +1283,311 @@ class UnifiedChatbot:
                 ("human", "{query}")
             ])
             
-            chain = prompt | self.llm
-            response = chain.invoke({"query": query})
-            answer = response.content
+            inputs = {"query": query}
+            
+        return prompt | self.llm, inputs
         
-        return {
+    def _cached_answer(self, query: str, backend: str):
+        """정확히 같은 질의의 답변 캐시 조회, (캐시된 결과 또는 None, 유사 질의 조회용 백엔드 또는 None) 반환
+        
+        유사 질의 조회는 질의 임베딩이 필요하므로 웹 검색과 동시에 내부 문서 검색 분기에서 합니다.
+        키워드 검색만 가능한 동안에는 답변을 캐시하지 않으므로 유사 질의 조회도 건너뜁니다.
+        """
+        semantic = self.answer_cache.semantic_enabled and self.vector_ready
+        cached = self.answer_cache.get(query, backend, record_miss=not semantic)
+        return cached, (backend if semantic and not cached else None)
+    
+    def _retrieval_options(self, backend: str, top_k: Optional[int], weights: Optional[List[float]],
+                           filters: Optional[Dict[str, Any]] = None):
+        """요청별 검색 옵션과 답변 캐시 키용 백엔드 이름 반환 (기본값과 다르면 캐시 키에 반영)
+        
+        filters는 {"source_type", "date_from", "date_to"} 중 필요한 항목만 담은 dict입니다.
+        """
+        retrieval = {}
+        top_k = normalize_top_k(top_k)
+        if top_k is not None:
+            retrieval["k"] = top_k
+        weights = normalize_weights(weights)
+        if weights is not None:
+            retrieval["weights"] = weights
+        if filters:
+            normalized = normalize_filters(**filters)
+            if normalized:
+                retrieval["filters"] = normalized
+        
+        if retrieval:
+            backend = f"{backend}:k={retrieval.get('k', RETRIEVAL_K)}:w={retrieval.get('weights', list(RETRIEVAL_WEIGHTS))}"
+            if "filters" in retrieval:
+                backend += f":f={json.dumps(retrieval['filters'], sort_keys=True)}"
+        return retrieval, backend
+    
+    def process_query(self, query: str, use_gemini: bool = False, top_k: Optional[int] = None,
+                      weights: Optional[List[float]] = None, filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """사용자 질의 처리 (RAG + Gemini/Perplexity 통합)
+        
+        top_k, weights로 요청별 내부 문서 수와 [벡터, BM25] 융합 가중치를,
+        filters로 내부 문서의 소스 타입과 게시일 범위를 지정할 수 있습니다.
+        """
+        if not self.initialized:
+            return {
+                "answer": "챗봇이 아직 초기화되지 않았습니다.",
+                "citations": [],
+                "sources_used": {"internal": False, "web": False}
+            }
+            
+        # 개발 모드 체크 완전 제거 - 항상 실제 문서 사용
+        if False:  # 절대 실행되지 않는 코드
+            logger.info(f"테스트 모드에서 질의 처리: {query}")
+            return {
+                "answer": f"[개발 모드] '{query}'에 대한 가상 답변입니다.",
+                "citations": [],
+                "sources_used": {"internal": False, "web": False}
+            }
+        
+        backend = "gemini" if use_gemini and self.gemini_configured else "perplexity"
+        retrieval, cache_backend = self._retrieval_options(backend, top_k, weights, filters)
+        
+        # 0. 반복 질문은 캐시된 답변 반환 (유사 질문은 내부 문서 검색 분기에서 확인)
+        cached, semantic_backend = self._cached_answer(query, cache_backend)
+        if cached:
+            return dict(cached, cached=True)
+        
+        # 1~2. 내부 문서 검색과 웹 검색 (Gemini 또는 Perplexity 사용)을 동시에 실행
+        results = {}
+        for name, result in self._iter_sources(query, use_gemini, retrieval, semantic_backend):
+            if name == "internal" and result["cached"]:
+                return dict(result["cached"], cached=True)
+            results[name] = result
+        internal_hits = results["internal"]["hits"]
+        query_vector = results["internal"]["query_vector"]
+        web_search_result = results["web"]
+        
+        # 3. 결과 통합
+        sources_used = {
+            "internal": len(internal_hits) > 0,
+            "web": web_search_result.get("success", False),
+            "api": backend
+        }
+        
+        context_parts, citations = self._build_context(internal_hits, web_search_result)
+        
+        # GPT로 최종 답변 생성
+        chain, inputs = self._answer_chain(query, context_parts)
+        with self.latency.track("llm"):
+            answer = chain.invoke(inputs).content
+        
+        result = {
+            "answer": answer,
+            "citations": citations,
+            "sources_used": sources_used
+        }
+        # 키워드 검색만으로 만든 답변은 캐시하지 않음
+        if answer and self.vector_ready:
+            self.answer_cache.put(query, cache_backend, result, query_vector, used_web=sources_used["web"])
+        return result
+    
+    def _cached_events(self, cached: Dict[str, Any], start_time: float):
+        """캐시된 답변을 스트리밍 이벤트로 변환"""
+        yield {"type": "processing", "message": "💾 이전에 생성된 답변을 불러왔습니다."}
+        yield {"type": "content", "content": cached["answer"]}
+        if cached["citations"]:
+            yield {"type": "citations", "citations": cached["citations"]}
+        yield {"type": "sources", "sources_used": cached["sources_used"]}
+        yield {"type": "timing", "processing_time": 0.0, "total_time": time.time() - start_time}
+        yield {"type": "done"}
+        
+    def _source_event(self, name: str, result, api_name: str) -> Dict[str, Any]:
+        """검색 분기 완료 진행 이벤트"""
+        if name == "internal":
+            return {"type": "processing", "message": f"📚 내부 문서 {len(result['hits'])}개를 찾았습니다."}
+        elif result.get("success"):
+            return {"type": "processing", "message": f"🌐 {api_name} 실시간 웹 검색을 완료했습니다."}
+        else:
+            return {"type": "processing", "message": f"🌐 {api_name} 웹 검색 결과 없이 진행합니다."}
+    
+    def process_query_stream(self, query: str, use_gemini: bool = False, top_k: Optional[int] = None,
+                             weights: Optional[List[float]] = None, filters: Optional[Dict[str, Any]] = None):
+        """사용자 질의 처리 (스트리밍)
+        
+        검색 분기가 실제로 끝날 때마다 진행 이벤트를 보내고, GPT 토큰을 생성되는
+        즉시 'content' 이벤트로 전달합니다. 이벤트 형식은 /api/chatbot/stream의
+        SSE 페이로드와 같습니다.
+        """
+        if not self.initialized:
+            yield {"type": "error", "message": "챗봇이 아직 초기화되지 않았습니다."}
+            return
+            
+        start_time = time.time()
+        api_name = "Gemini" if use_gemini and self.gemini_configured else "Perplexity"
+        backend = api_name.lower()
+        retrieval, cache_backend = self._retrieval_options(backend, top_k, weights, filters)
+        
+        cached, semantic_backend = self._cached_answer(query, cache_backend)
+        if cached:
+            yield from self._cached_events(cached, start_time)
+            return
+        
+        yield {"type": "searching", "message": f"🔍 내부 문서와 {api_name} 웹 검색을 동시에 진행하고 있습니다..."}
+        
+        results = {}
+        for name, result in self._iter_sources(query, use_gemini, retrieval, semantic_backend):
+            if name == "internal" and result["cached"]:
+                yield from self._cached_events(result["cached"], start_time)
+                return
+            results[name] = result
+            yield self._source_event(name, result, api_name)
+        
+        internal_hits = results["internal"]["hits"]
+        query_vector = results["internal"]["query_vector"]
+        web_search_result = results["web"]
+        sources_used = {
+            "internal": len(internal_hits) > 0,
+            "web": web_search_result.get("success", False),
+            "api": backend
+        }
+        context_parts, citations = self._build_context(internal_hits, web_search_result)
+        
+        yield {"type": "generating", "message": "💭 답변을 생성하고 있습니다..."}
+        processing_time = time.time() - start_time
+        
+        chain, inputs = self._answer_chain(query, context_parts)
+        answer_parts = []
+        llm_start = time.time()
+        for chunk in chain.stream(inputs):
+            if chunk.content:
+                if not answer_parts:
+                    self.latency.record("llm_first_token", time.time() - llm_start)
+                answer_parts.append(chunk.content)
+                yield {"type": "content", "content": chunk.content}
+        self.latency.record("llm", time.time() - llm_start)
+        
+        if answer_parts and self.vector_ready:
+            self.answer_cache.put(query, cache_backend, {
+                "answer": "".join(answer_parts),
+                "citations": citations,
+                "sources_used": sources_used
+            }, query_vector, used_web=sources_used["web"])
+        
+        if citations:
+            yield {"type": "citations", "citations": citations}
+        yield {"type": "sources", "sources_used": sources_used}
+        yield {"type": "timing", "processing_time": processing_time, "total_time": time.time() - start_time}
+        yield {"type": "done"}
+    
+    async def aprocess_query(self, query: str, use_gemini: bool = False, top_k: Optional[int] = None,
+                             weights: Optional[List[float]] = None,
+                             filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """process_query의 비동기 버전 (웹 검색과 GPT 호출을 이벤트 루프에서 기다림)"""
+        if not self.initialized:
+            return {
+                "answer": "챗봇이 아직 초기화되지 않았습니다.",
+                "citations": [],
+                "sources_used": {"internal": False, "web": False}
+            }
+            
+        backend = "gemini" if use_gemini and self.gemini_configured else "perplexity"
+        retrieval, cache_backend = self._retrieval_options(backend, top_k, weights, filters)
+        
+        cached, semantic_backend = self._cached_answer(query, cache_backend)
+        if cached:
+            return dict(cached, cached=True)
+        
+        results = {}
+        async for name, result in self._aiter_sources(query, use_gemini, retrieval, semantic_backend):
+            if name == "internal" and result["cached"]:
+                return dict(result["cached"], cached=True)
+            results[name] = result
+        internal_hits = results["internal"]["hits"]
+        query_vector = results["internal"]["query_vector"]
+        web_search_result = results["web"]
+        sources_used = {
+            "internal": len(internal_hits) > 0,
+            "web": web_search_result.get("success", False),
+            "api": backend
+        }
+        context_parts, citations = self._build_context(internal_hits, web_search_result)
+        
+        chain, inputs = self._answer_chain(query, context_parts)
+        with self.latency.track("llm"):
+            answer = (await chain.ainvoke(inputs)).content
+        
+        result = {
             "answer": answer,
             "citations": citations,
             "sources_used": sources_used
         }
+        if answer and self.vector_ready:
+            self.answer_cache.put(query, cache_backend, result, query_vector, used_web=sources_used["web"])
+        return result
+    
+    async def aprocess_query_stream(self, query: str, use_gemini: bool = False, top_k: Optional[int] = None,
+                                    weights: Optional[List[float]] = None, filters: Optional[Dict[str, Any]] = None):
+        """process_query_stream의 비동기 버전 (이벤트 형식 동일)
+        
+        응답 대기 중 스레드를 점유하지 않으므로 한 프로세스에서 많은 스트림을 동시에 유지할 수 있습니다.
+        """
+        if not self.initialized:
+            yield {"type": "error", "message": "챗봇이 아직 초기화되지 않았습니다."}
+            return
+            
+        start_time = time.time()
+        api_name = "Gemini" if use_gemini and self.gemini_configured else "Perplexity"
+        backend = api_name.lower()
+        retrieval, cache_backend = self._retrieval_options(backend, top_k, weights, filters)
+        
+        cached, semantic_backend = self._cached_answer(query, cache_backend)
+        if cached:
+            for event in self._cached_events(cached, start_time):
+                yield event
+            return
+        
+        yield {"type": "searching", "message": f"🔍 내부 문서와 {api_name} 웹 검색을 동시에 진행하고 있습니다..."}
+        
+        results = {}
+        async for name, result in self._aiter_sources(query, use_gemini, retrieval, semantic_backend):
+            if name == "internal" and result["cached"]:
+                for event in self._cached_events(result["cached"], start_time):
+                    yield event
+                return
+            results[name] = result
+            yield self._source_event(name, result, api_name)
+        
+        internal_hits = results["internal"]["hits"]
+        query_vector = results["internal"]["query_vector"]
+        web_search_result = results["web"]
+        sources_used = {
+            "internal": len(internal_hits) > 0,
+            "web": web_search_result.get("success", False),
+            "api": backend
+        }
+        context_parts, citations = self._build_context(internal_hits, web_search_result)
+        
+        yield {"type": "generating", "message": "💭 답변을 생성하고 있습니다..."}
+        processing_time = time.time() - start_time
+        
+        chain, inputs = self._answer_chain(query, context_parts)
+        answer_parts = []
+        llm_start = time.time()
+        async for chunk in chain.astream(inputs):
+            if chunk.content:
+                if not answer_parts:
+                    self.latency.record("llm_first_token", time.time() - llm_start)
+                answer_parts.append(chunk.content)
+                yield {"type": "content", "content": chunk.content}
+        self.latency.record("llm", time.time() - llm_start)
+        
+        if answer_parts and self.vector_ready:
+            self.answer_cache.put(query, cache_backend, {
+                "answer": "".join(answer_parts),
+                "citations": citations,
+                "sources_used": sources_used
+            }, query_vector, used_web=sources_used["web"])
+        
+        if citations:
+            yield {"type": "citations", "citations": citations}
+        yield {"type": "sources", "sources_used": sources_used}
+        yield {"type": "timing", "processing_time": processing_time, "total_time": time.time() - start_time}
+        yield {"type": "done"}
     
     def get_status(self):
         """챗봇 상태 정보 반환"""
@@ -531,13 +1598,36 @@ class UnifiedChatbot:
         return {
             "initialized": self.initialized,
             "rag_initialized": self.rag_initialized,
+            "stages": dict(self.stages),
+            "retrieval_mode": "hybrid" if self.vector_ready else ("keyword" if self.rag_initialized else None),
+            "vector_backend": self.vector_backend,
+            "retrieval": {"k": RETRIEVAL_K, "fetch_k": RETRIEVAL_FETCH_K, "weights": list(RETRIEVAL_WEIGHTS)},
+            "reranker": {
+                "name": self.reranker.name,
+                "candidates": RERANK_CANDIDATES,
+                "max_tokens": RERANK_MAX_TOKENS
+            } if self.reranker else None,
             "perplexity_initialized": self.perplexity_initialized,
             "gemini_configured": self.gemini_configured,
             "document_count": len(self.docs),
-            "chunk_count": len(self.vectorstore.get()['ids']) if self.vectorstore else 0,
+            "chunk_count": len(self.chunks),
+            "index": {
+                "disk_bytes": self.index_size_bytes,
+                "embedding_bytes": int(self.chunk_embeddings.nbytes) if self.chunk_embeddings is not None else 0,
+                "loaded_from_disk": self.index_loaded_from_disk,
+                "readonly": self.index_readonly,
+                "memory_mapped": isinstance(self.chunk_embeddings, np.memmap),
+                "shared_created_at": self._shared_index_created_at,
+                "rebuilding": self._rebuild_process is not None and self._rebuild_process.poll() is None
+            },
             "init_timestamp": self.init_timestamp,
             "last_update": self.last_update,
             "uptime": uptime,
+            "document_catalog": self.catalog.stats() if self.catalog else None,
+            "embedding_cache": self.embedding_cache.stats() if self.embedding_cache else None,
+            "query_embedding": self.query_embedder.stats(),
+            "answer_cache": self.answer_cache.stats(),
+            "latency": self.latency.summary(),
             "api_keys": {
                 "openai": bool(os.getenv("OPENAI_API_KEY")),
                 "perplexity": bool(os.getenv("PERPLEXITY_API_KEY")),
@@ -547,6 +1637,21 @@ class UnifiedChatbot:
 
 # 싱글톤 인스턴스
 _unified_chatbot_instance = None
+_document_catalog = None
+_document_catalog_lock = threading.Lock()
+
+def get_document_catalog() -> DocumentCatalog:
+    """문서 카탈로그 싱글톤 반환 (챗봇 문서 로드와 서버 목록/본문 API가 공유)"""
+    global _document_catalog
+    
+    with _document_catalog_lock:
+        if _document_catalog is None:
+            _document_catalog = DocumentCatalog(
+                {"economy_terms": ECONOMY_TERMS_DIR, "recent_contents": RECENT_CONTENTS_DIR},
+                poll_interval=DOCUMENT_CATALOG_POLL_INTERVAL
+            )
+    
+    return _document_catalog
 
 def get_unified_chatbot_instance():
     """통합 챗봇 싱글톤 인스턴스 반환"""
@@ -557,8 +1662,12 @@ def get_unified_chatbot_instance():
     
     return _unified_chatbot_instance
 
-def initialize_unified_chatbot():
-    """통합 챗봇 초기화"""
+def initialize_unified_chatbot(on_ready=None):
+    """통합 챗봇 초기화
+    
+    키워드(BM25) 인덱스가 준비되는 즉시 on_ready를 호출하여 질의를 받기 시작하고,
+    벡터 인덱스 생성과 API 확인은 그 뒤에 동시에 진행합니다.
+    """
     try:
         logger.info("통합 챗봇 초기화 시작")
         start_time = time.time()
@@ -571,21 +1680,43 @@ def initialize_unified_chatbot():
             return True
         
         # 문서 로드
+        chatbot.stages["documents"] = "running"
         chatbot.load_documents()
+        chatbot.stages["documents"] = "ready"
         
-        # RAG 인덱스 생성
-        chatbot.create_rag_index()
-        
-        # Perplexity API 확인
-        chatbot.check_perplexity_api()
-        
-        # Gemini API 확인
-        chatbot.check_gemini_api()
-        
-        # 초기화 완료 및 타임스탬프 업데이트
+        # 키워드 인덱스 생성 후 바로 질의 처리 시작
+        chatbot.build_keyword_index()
         chatbot.initialized = True
         chatbot.init_timestamp = time.time()
         chatbot.last_update = chatbot.init_timestamp
+        if on_ready:
+            on_ready()
+        logger.info(f"키워드 검색으로 질의 처리 시작 (소요 시간: {time.time() - start_time:.2f}초)")
+        
+        def check_apis():
+            chatbot.stages["api_check"] = "running"
+            # Perplexity API 확인
+            chatbot.check_perplexity_api()
+            # Gemini API 확인
+            chatbot.check_gemini_api()
+            chatbot.stages["api_check"] = "ready"
+        
+        # API 확인은 벡터 인덱스 생성과 동시에 진행
+        api_future = chatbot.executor.submit(check_apis)
+        
+        try:
+            chatbot.build_vector_index()
+        except Exception as e:
+            # 벡터 인덱스 없이도 키워드 검색으로 계속 서비스
+            logger.error(f"벡터 인덱스 생성 오류, 키워드 검색만 사용합니다: {str(e)}")
+        
+        try:
+            api_future.result()
+        except Exception as e:
+            chatbot.stages["api_check"] = "failed"
+            logger.error(f"API 확인 오류: {str(e)}")
+        
+        chatbot.last_update = time.time()
         
         elapsed = time.time() - start_time
         logger.info(f"통합 챗봇 초기화 완료 (소요 시간: {elapsed:.2f}초)")
@@ -594,4 +1725,43 @@ def initialize_unified_chatbot():
         
     except Exception as e:
         logger.error(f"통합 챗봇 초기화 오류: {str(e)}")
-        return False
\ No newline at end of file
+        if _unified_chatbot_instance:
+            for stage, state in _unified_chatbot_instance.stages.items():
+                if state in ("pending", "running"):
+                    _unified_chatbot_instance.stages[stage] = "failed"
+        return False
+
+def build_rag_index() -> Dict[str, Any]:
+    """공유 RAG 인덱스를 생성해 디스크에 저장 (서버 워커를 띄우기 전 한 번만 실행)
+    
+    저장된 인덱스가 현재 문서·설정과 일치하면 임베딩 없이 그대로 둡니다.
+    워커는 RAG_INDEX_READONLY=true로 이 인덱스를 읽기 전용으로 메모리 매핑합니다.
+    """
+    start_time = time.time()
+    chatbot = UnifiedChatbot()
+    chatbot.index_readonly = False
+    try:
+        chatbot.load_documents()
+        chatbot.build_keyword_index()
+        
+        if chatbot.index_loaded_from_disk:
+            status = "current"
+        else:
+            embeddings = chatbot._embed_chunks(chatbot.chunks)
+            if not chatbot.save_index(embeddings):
+                return {"status": "error", "message": "RAG 인덱스 저장 실패", "index_dir": str(RAG_INDEX_DIR)}
+            status = "built"
+        
+        summary = {
+            "status": status,
+            "index_dir": str(RAG_INDEX_DIR),
+            "document_count": len(chatbot.docs),
+            "chunk_count": len(chatbot.chunks),
+            "disk_bytes": chatbot.index_store.size_bytes(),
+            "elapsed": round(time.time() - start_time, 3)
+        }
+        logger.info(f"공유 RAG 인덱스 준비 완료: {summary}")
+        return summary
+    finally:
+        chatbot.executor.shutdown(wait=False)
+        chatbot.retrieval_executor.shutdown(wait=False)
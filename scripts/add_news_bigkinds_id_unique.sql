@@ -0,0 +1,29 @@
+-- news.bigkinds_id UNIQUE 제약 추가
+-- modules/news_collector.py의 INSERT ... ON CONFLICT (bigkinds_id) DO NOTHING은 이 제약이 있어야 동작합니다.
+-- 이미 중복된 행이 있으면 제약을 추가할 수 없으므로 먼저 저장된 행만 남기고 삭제합니다.
+-- 여러 번 실행해도 안전합니다.
+--
+-- 실행:
+--     psql -h "$DB_HOST" -U "$DB_USER" -d "$DB_NAME" -f scripts/add_news_bigkinds_id_unique.sql
+
+BEGIN;
+
+DELETE FROM news a
+USING news b
+WHERE a.bigkinds_id = b.bigkinds_id
+  AND a.ctid > b.ctid;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1
+        FROM pg_constraint
+        WHERE conrelid = 'news'::regclass
+          AND conname = 'news_bigkinds_id_key'
+    ) THEN
+        ALTER TABLE news ADD CONSTRAINT news_bigkinds_id_key UNIQUE (bigkinds_id);
+    END IF;
+END
+$$;
+
+COMMIT;
@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+"""
+공유 RAG 인덱스 생성 스크립트
+문서를 청킹·임베딩하여 RAG_INDEX_DIR에 저장합니다. 서버 워커는 RAG_INDEX_READONLY=true로
+이 인덱스를 읽기 전용으로 메모리 매핑하므로, 워커 수와 관계없이 임베딩은 한 번만 수행됩니다.
+(gunicorn.conf.py의 when_ready 훅과 읽기 전용 모드의 /api/chatbot/refresh가 이 스크립트를 백그라운드로 실행하며,
+ 동시에 여러 번 실행되면 잠금 파일로 하나만 생성합니다)
+"""
+
+import os
+import sys
+import json
+import fcntl
+import logging
+from pathlib import Path
+
+# 프로젝트 루트 디렉토리
+ROOT_DIR = Path(os.path.dirname(os.path.abspath(__file__))).parent
+os.chdir(ROOT_DIR)
+sys.path.insert(0, str(ROOT_DIR))
+
+# 생성 단계는 항상 쓰기 모드로 실행
+os.environ["RAG_INDEX_READONLY"] = "false"
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+from modules.unified_chatbot import build_rag_index, RAG_INDEX_DIR
+
+
+def main():
+    RAG_INDEX_DIR.parent.mkdir(parents=True, exist_ok=True)
+    with open(RAG_INDEX_DIR.parent / f"{RAG_INDEX_DIR.name}.lock", "w") as lock_file:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            print(json.dumps({"status": "busy", "message": "다른 프로세스가 인덱스를 생성 중입니다"}, ensure_ascii=False))
+            return 0
+        result = build_rag_index()
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    return 0 if result.get("status") in ("built", "current") else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,6 @@
-from flask import Flask, send_from_directory, jsonify, render_template, request, Response
+from flask import Flask, send_from_directory, jsonify, render_template, request, Response, abort
 import os
+import hmac
 import logging
 from pathlib import Path
 import mimetypes
@@ -17,8 +18,13 @@ from configs.config import Config
 
 # 통합 챗봇 모듈 import (기존 코드에서 사용하므로 유지)
 import modules.unified_chatbot as unified_chatbot
+from modules.http_cache import Representation, RepresentationCache
+from modules.markdown_renderer import render_document_page
+from modules.document_search import TitleIndex
+from werkzeug.security import safe_join
 
-app = Flask(__name__)
+# 기본 정적 라우트를 끄고 serve_static에서 캐시 헤더와 함께 제공
+app = Flask(__name__, static_folder=None)
 
 # --- 기존 로깅 및 디렉토리 설정 (변경 없음) ---
 # 로그 디렉토리 생성
@@ -48,6 +54,22 @@ logger.info(f"ROOT_DIR: {ROOT_DIR}")
 logger.info(f"ECONOMY_TERMS_DIR: {ECONOMY_TERMS_DIR}")
 logger.info(f"RECENT_CONTENTS_DIR: {RECENT_CONTENTS_DIR}")
 
+# HTTP 캐시 정책 (경로별 Cache-Control, 메모리에 보관할 응답 표현 수, 메모리 캐시 대상 정적 파일 최대 크기)
+CONTENT_CACHE_CONTROL = os.getenv('CONTENT_CACHE_CONTROL', 'public, max-age=300, stale-while-revalidate=3600')
+LISTING_CACHE_CONTROL = os.getenv('LISTING_CACHE_CONTROL', 'public, max-age=60')
+STATIC_CACHE_CONTROL = os.getenv('STATIC_CACHE_CONTROL', 'public, max-age=3600')
+API_CACHE_CONTROL = 'no-store'
+HTTP_CACHE_SIZE = int(os.getenv('HTTP_CACHE_SIZE', '2048'))
+STATIC_CACHE_MAX_BYTES = int(os.getenv('STATIC_CACHE_MAX_BYTES', str(5 * 1024 * 1024)))
+VIEW_CACHE_CONTROL = os.getenv('VIEW_CACHE_CONTROL', 'public, max-age=300, stale-while-revalidate=3600')
+VIEW_CACHE_SIZE = int(os.getenv('VIEW_CACHE_SIZE', '10000'))
+STATIC_DIR = ROOT_DIR / 'static'
+
+# 파일별 ETag와 압축 본문(gzip/brotli)은 내용이 바뀔 때만 다시 계산
+http_representations = RepresentationCache(HTTP_CACHE_SIZE)
+# 문서 보기 페이지 (서버에서 렌더링한 HTML, 시작 시 전체 코퍼스를 미리 렌더링)
+view_pages = RepresentationCache(VIEW_CACHE_SIZE)
+
 # 폴더가 없는 경우 생성
 os.makedirs(ECONOMY_TERMS_DIR, exist_ok=True)
 os.makedirs(RECENT_CONTENTS_DIR, exist_ok=True)
@@ -58,13 +80,18 @@ os.makedirs(ROOT_DIR / 'templates', exist_ok=True)
 chatbot_ready = False
 chatbot_initializing = False
 
+# 키워드 인덱스가 준비되면 호출됨 (벡터 인덱스 생성 중에도 질의 처리 시작)
+def mark_chatbot_ready():
+    global chatbot_ready
+    chatbot_ready = True
+
 # 서버 시작 시 챗봇 자동 초기화 함수 (기존 코드에서 사용하므로 유지)
 def initialize_chatbot_at_startup():
     global chatbot_ready, chatbot_initializing
     try:
         logger.info("서버 시작 시 통합 챗봇 자동 초기화 시작")
         chatbot_initializing = True
-        success = unified_chatbot.initialize_unified_chatbot()
+        success = unified_chatbot.initialize_unified_chatbot(on_ready=mark_chatbot_ready)
         chatbot_ready = success
         chatbot_initializing = False
         logger.info(f"통합 챗봇 자동 초기화 완료: {success}")
@@ -73,6 +100,31 @@ def initialize_chatbot_at_startup():
         chatbot_ready = False
         chatbot_initializing = False
 
+# 문서 목록·본문 API와 챗봇이 공유하는 문서 카탈로그 (변경 사항은 수정 시각 확인으로 반영)
+document_catalog = unified_chatbot.get_document_catalog()
+document_catalog.start_watcher()
+
+def view_page(entry):
+    """카탈로그 항목의 문서 보기 HTML (본문 해시가 같으면 캐시된 렌더링 결과 사용)"""
+    def build():
+        html = render_document_page(entry['title'], entry['content'])
+        return Representation(html.encode('utf-8'), 'text/html; charset=utf-8', entry['mtime'])
+    return view_pages.get((entry['source_type'], entry['file_name']), entry['sha256'], build)
+
+def warm_view_pages():
+    """모든 문서의 보기 페이지를 미리 렌더링 (첫 요청 지연 방지)"""
+    start_time = time.time()
+    count = 0
+    for entry in document_catalog.entries():
+        try:
+            view_page(entry)
+            count += 1
+        except Exception as e:
+            logger.error(f"문서 보기 렌더링 오류: {entry['file_name']}, {str(e)}")
+    logger.info(f"문서 보기 페이지 {count}개 렌더링 완료 (소요 시간: {time.time() - start_time:.2f}초)")
+
+threading.Thread(target=warm_view_pages, name="view-page-warmup", daemon=True).start()
+
 # 서버 시작 시 백그라운드에서 챗봇 초기화 실행 (기존 코드에서 사용하므로 유지)
 threading.Thread(target=initialize_chatbot_at_startup).start()
 
@@ -82,6 +134,9 @@ def after_request(response):
     response.headers.add('Access-Control-Allow-Origin', '*')
     response.headers.add('Access-Control-Allow-Headers', 'Content-Type,Authorization')
     response.headers.add('Access-Control-Allow-Methods', 'GET,PUT,POST,DELETE')
+    # 캐시 정책을 정하지 않은 API 응답(챗봇 답변, 상태 등)은 브라우저/CDN에 저장하지 않음
+    if request.path.startswith('/api/') and 'Cache-Control' not in response.headers:
+        response.headers['Cache-Control'] = API_CACHE_CONTROL
     return response
 
 # --- 기존 라우트들 (변경 없음) ---
@@ -96,59 +151,127 @@ def health():
 
 @app.route('/static/<path:path>')
 def serve_static(path):
-    return send_from_directory('static', path)
+    """정적 파일 (내용 해시 ETag, 조건부 GET, 미리 압축한 본문)"""
+    file_path = safe_join(str(STATIC_DIR), path)
+    if file_path is None or not os.path.isfile(file_path):
+        abort(404)
+    stat = os.stat(file_path)
+    if stat.st_size > STATIC_CACHE_MAX_BYTES:
+        return send_from_directory('static', path)
+    
+    def build():
+        with open(file_path, 'rb') as f:
+            body = f.read()
+        content_type = mimetypes.guess_type(file_path)[0] or 'application/octet-stream'
+        if content_type.startswith('text/') or content_type == 'application/javascript':
+            content_type += '; charset=utf-8'
+        return Representation(body, content_type, stat.st_mtime)
+    
+    representation = http_representations.get(('static', path), (stat.st_mtime_ns, stat.st_size), build)
+    return representation.response(request, STATIC_CACHE_CONTROL)
+
+def catalog_listing(source_type):
+    """문서 카탈로그에서 목록 반환 (쿼리: sort=name|title|size|mtime, order=asc|desc, page, per_page)"""
+    def build():
+        listing = document_catalog.listing(
+            source_type,
+            sort=request.args.get('sort', 'name'),
+            order=request.args.get('order', 'asc'),
+            page=request.args.get('page', type=int),
+            per_page=request.args.get('per_page', type=int)
+        )
+        return Representation(json.dumps(listing, ensure_ascii=False).encode('utf-8'), 'application/json')
+    
+    try:
+        # 카탈로그가 바뀌지 않았으면 같은 쿼리의 목록을 다시 만들지 않음
+        representation = http_representations.get(
+            ('listing', source_type, request.query_string), document_catalog.version, build)
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+    return representation.response(request, LISTING_CACHE_CONTROL)
+
+def catalog_content(source_type, filename):
+    """문서 카탈로그에서 파일 본문 반환 (디스크를 다시 읽지 않음, 내용 해시 ETag와 조건부 GET)"""
+    entry = document_catalog.get(source_type, filename)
+    if entry is None:
+        logger.warning(f"문서를 찾을 수 없음: {source_type}/{filename}")
+        return f"파일을 찾을 수 없습니다: {filename}", 404
+    
+    def build():
+        return Representation(entry['content'].encode('utf-8'), 'text/markdown; charset=utf-8',
+                              entry['mtime'], digest=entry['sha256'])
+    
+    representation = http_representations.get(('content', source_type, filename), entry['sha256'], build)
+    return representation.response(request, CONTENT_CACHE_CONTROL)
 
 @app.route('/api/economy_terms')
 def get_economy_terms():
-    files = []
-    if ECONOMY_TERMS_DIR.exists():
-        try:
-            for file in ECONOMY_TERMS_DIR.glob('*.md'):
-                files.append(file.name)
-            logger.info(f"경제 용어 파일 목록 반환: {len(files)}개")
-        except Exception as e:
-            logger.error(f"경제 용어 파일 목록 조회 오류: {str(e)}")
-    else:
-        logger.warning(f"경제 용어 디렉토리가 존재하지 않음: {ECONOMY_TERMS_DIR}")
-    return jsonify({'files': files})
+    return catalog_listing('economy_terms')
 
 @app.route('/api/recent_contents')
 def get_recent_contents():
-    files = []
-    if RECENT_CONTENTS_DIR.exists():
-        try:
-            for file in RECENT_CONTENTS_DIR.glob('*.md'):
-                files.append(file.name)
-            logger.info(f"최신 콘텐츠 파일 목록 반환: {len(files)}개")
-        except Exception as e:
-            logger.error(f"최신 콘텐츠 파일 목록 조회 오류: {str(e)}")
-    else:
-        logger.warning(f"최신 콘텐츠 디렉토리가 존재하지 않음: {RECENT_CONTENTS_DIR}")
-    return jsonify({'files': files})
+    return catalog_listing('recent_contents')
 
 @app.route('/api/economy_terms/<path:filename>')
 def get_economy_term(filename):
-    try:
-        file_path = ECONOMY_TERMS_DIR / filename
-        logger.info(f"경제 용어 파일 요청: {file_path}")
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        return content
-    except Exception as e:
-        logger.error(f"경제 용어 파일 로드 오류: {str(e)}")
-        return str(e), 404
+    return catalog_content('economy_terms', filename)
 
 @app.route('/api/recent_contents/<path:filename>')
 def get_recent_content(filename):
+    return catalog_content('recent_contents', filename)
+
+# 제목 자동완성 인덱스 (카탈로그가 바뀌면 다시 생성)
+_title_index = (None, None)
+
+def get_title_index():
+    global _title_index
+    version, index = _title_index
+    if index is None or version != document_catalog.version:
+        version = document_catalog.version
+        index = TitleIndex(document_catalog.entries())
+        _title_index = (version, index)
+    return index
+
+@app.route('/api/search')
+def search_documents():
+    """문서 전문 검색 (쿼리: q, limit, source_type, date_from, date_to)
+    
+    챗봇 BM25 인덱스로 문서 순위와 <mark> 강조 스니펫을 반환합니다 (LLM 호출 없음).
+    """
+    start_time = time.time()
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'status': 'error', 'message': '검색어가 없습니다.'}), 400
+    chatbot = unified_chatbot._unified_chatbot_instance
+    if chatbot is None or chatbot.searcher is None:
+        return jsonify({'status': 'error', 'message': '검색 인덱스를 준비 중입니다. 잠시 후 다시 시도해주세요.'}), 503
     try:
-        file_path = RECENT_CONTENTS_DIR / filename
-        logger.info(f"최신 콘텐츠 파일 요청: {file_path}")
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        return content
+        limit = min(max(request.args.get('limit', 10, type=int), 1), 50)
+        filters = chatbot_query_options(request.args)['filters']
+        result = chatbot.search_documents(query, limit=limit, filters=filters)
+    except (TypeError, ValueError) as e:
+        return jsonify({'status': 'error', 'message': f'잘못된 검색 옵션: {str(e)}'}), 400
     except Exception as e:
-        logger.error(f"최신 콘텐츠 파일 로드 오류: {str(e)}")
-        return str(e), 404
+        logger.error(f"문서 검색 오류: {str(e)}")
+        return jsonify({'status': 'error', 'message': f'오류가 발생했습니다: {str(e)}'}), 500
+    return jsonify({
+        'status': 'success',
+        'query': query,
+        'total': result['total'],
+        'results': result['results'],
+        'took_ms': round((time.time() - start_time) * 1000, 2)
+    })
+
+@app.route('/api/search/autocomplete')
+def autocomplete_titles():
+    """문서 제목 접두어 자동완성 (쿼리: q, limit)"""
+    prefix = request.args.get('q', '')
+    limit = min(max(request.args.get('limit', 10, type=int), 1), 50)
+    return jsonify({
+        'status': 'success',
+        'query': prefix,
+        'suggestions': get_title_index().complete(prefix, limit)
+    })
 
 # 통합 챗봇 API (기존 코드에서 사용하므로 유지)
 @app.route('/api/chatbot/status')
@@ -156,7 +279,9 @@ def chatbot_status():
     global chatbot_ready, chatbot_initializing
     status_info = {
         'ready': chatbot_ready,
-        'initializing': chatbot_initializing
+        'initializing': chatbot_initializing,
+        'http_cache': http_representations.stats(),
+        'view_cache': view_pages.stats()
     }
     if chatbot_ready:
         try:
@@ -165,6 +290,9 @@ def chatbot_status():
             status_info.update(detailed_status)
         except Exception as e:
             logger.error(f"챗봇 상세 상태 조회 오류: {str(e)}")
+    elif unified_chatbot._unified_chatbot_instance is not None:
+        # 준비 전에도 단계별 진행 상황은 제공
+        status_info['stages'] = dict(unified_chatbot._unified_chatbot_instance.stages)
     return jsonify(status_info)
 
 @app.route('/api/chatbot/initialize', methods=['POST'])
@@ -184,7 +312,7 @@ def initialize_chatbot():
         try:
             logger.info("통합 챗봇 초기화 시작")
             chatbot_initializing = True
-            success = unified_chatbot.initialize_unified_chatbot()
+            success = unified_chatbot.initialize_unified_chatbot(on_ready=mark_chatbot_ready)
             chatbot_ready = success
             chatbot_initializing = False
             logger.info(f"통합 챗봇 초기화 완료: {success}")
@@ -195,6 +323,24 @@ def initialize_chatbot():
     threading.Thread(target=init_chatbot_thread).start()
     return jsonify({'status': 'initializing', 'message': '챗봇 초기화가 시작되었습니다.'})
 
+def chatbot_query_options(params):
+    """요청 JSON 또는 쿼리 문자열에서 내부 문서 검색 옵션 (top_k, weights, filters) 추출
+    
+    쿼리 문자열에서는 weights와 source_type을 쉼표로 구분합니다.
+    """
+    weights = params.get('weights')
+    if isinstance(weights, str):
+        weights = weights.split(',')
+    # 내부 문서 검색 범위 (소스 타입: economy_terms / recent_contents, 게시일: YYYY-MM-DD)
+    filters = {key: params.get(key) for key in ('source_type', 'date_from', 'date_to') if params.get(key)}
+    if isinstance(filters.get('source_type'), str):
+        filters['source_type'] = filters['source_type'].split(',')
+    return {
+        'top_k': unified_chatbot.normalize_top_k(params.get('top_k')),
+        'weights': unified_chatbot.normalize_weights(weights),
+        'filters': filters
+    }
+
 @app.route('/api/chatbot/query', methods=['POST'])
 def query_chatbot():
     global chatbot_ready
@@ -212,12 +358,16 @@ def query_chatbot():
             return jsonify({'status': 'error', 'message': '질문이 없습니다.'}), 400
         logger.info(f"통합 챗봇 질의: {query}, Gemini 사용: {use_gemini}")
         chatbot = unified_chatbot.get_unified_chatbot_instance()
-        result = chatbot.process_query(query, use_gemini=use_gemini)
+        try:
+            result = chatbot.process_query(query, use_gemini=use_gemini, **chatbot_query_options(data))
+        except (TypeError, ValueError) as e:
+            return jsonify({'status': 'error', 'message': f'잘못된 검색 옵션: {str(e)}'}), 400
         return jsonify({
             'status': 'success',
             'answer': result['answer'],
             'citations': result['citations'],
-            'sources_used': result.get('sources_used', {})
+            'sources_used': result.get('sources_used', {}),
+            'cached': result.get('cached', False)
         })
     except Exception as e:
         logger.error(f"챗봇 질의 처리 중 오류 발생: {str(e)}")
@@ -232,34 +382,16 @@ def stream_chatbot():
         return 'data: ' + json.dumps({'type': 'error', 'message': '질문이 없습니다.'}) + '\n\n'
     if not chatbot_ready:
         return 'data: ' + json.dumps({'type': 'error', 'message': '챗봇이 아직 초기화되지 않았습니다.'}) + '\n\n'
+    try:
+        options = chatbot_query_options(request.args)
+    except (TypeError, ValueError) as e:
+        return 'data: ' + json.dumps({'type': 'error', 'message': f'잘못된 검색 옵션: {str(e)}'}) + '\n\n'
     def generate():
         try:
-            yield f"data: {json.dumps({'type': 'searching', 'message': '🔍 관련 정보를 검색하고 있습니다...'})}\n\n"
-            time.sleep(0.5)
             chatbot = unified_chatbot.get_unified_chatbot_instance()
-            yield f"data: {json.dumps({'type': 'processing', 'message': '📚 내부 문서를 확인하고 있습니다...'})}\n\n"
-            api_name = "Gemini" if use_gemini else "Perplexity"
-            yield f"data: {json.dumps({'type': 'processing', 'message': f'🌐 {api_name} API를 사용하여 실시간 정보를 검색합니다...'})}\n\n"
-            time.sleep(0.5)
-            result = chatbot.process_query(query, use_gemini=use_gemini)
-            if result.get('sources_used', {}).get('web'):
-                yield f"data: {json.dumps({'type': 'processing', 'message': '🌐 실시간 웹 검색을 진행하고 있습니다...'})}\n\n"
-                time.sleep(0.5)
-            yield f"data: {json.dumps({'type': 'generating', 'message': '💭 답변을 생성하고 있습니다...'})}\n\n"
-            time.sleep(0.3)
-            answer = result.get('answer', '')
-            sentences = answer.replace('. ', '.|').split('|')
-            for sentence in sentences:
-                if sentence.strip():
-                    words = sentence.split(' ')
-                    for i in range(0, len(words), 3):
-                        chunk = ' '.join(words[i:i+3])
-                        yield f"data: {json.dumps({'type': 'content', 'content': chunk + ' '})}\n\n"
-                        time.sleep(0.05)
-            if result.get('citations'):
-                yield f"data: {json.dumps({'type': 'citations', 'citations': result['citations']})}\n\n"
-            yield f"data: {json.dumps({'type': 'sources', 'sources_used': result.get('sources_used', {})})}\n\n"
-            yield f"data: {json.dumps({'type': 'done'})}\n\n"
+            # 검색 단계와 GPT 토큰을 실제로 생성되는 시점에 그대로 전달
+            for event in chatbot.process_query_stream(query, use_gemini=use_gemini, **options):
+                yield f"data: {json.dumps(event)}\n\n"
         except Exception as e:
             logger.error(f"스트리밍 중 오류: {str(e)}")
             yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
@@ -276,6 +408,31 @@ def reset_chatbot():
     unified_chatbot._unified_chatbot_instance = None
     return jsonify({'status': 'success', 'message': '챗봇이 재설정되었습니다.'})
 
+@app.route('/api/chatbot/refresh', methods=['POST'])
+def refresh_chatbot_index():
+    """변경/추가/삭제된 문서만 RAG 인덱스에 반영 (관리자용, ADMIN_API_TOKEN이 없으면 비활성화)"""
+    global chatbot_ready
+    admin_token = os.getenv('ADMIN_API_TOKEN')
+    if not admin_token:
+        # 갱신은 유료 임베딩 호출이나 인덱스 생성 프로세스를 일으키므로 토큰이 없으면 거부
+        return jsonify({'status': 'error', 'message': '인덱스 갱신이 비활성화되어 있습니다 (ADMIN_API_TOKEN 미설정).'}), 503
+    authorization = request.headers.get('Authorization', '')
+    if not hmac.compare_digest(authorization.encode('utf-8'), f'Bearer {admin_token}'.encode('utf-8')):
+        return jsonify({'status': 'error', 'message': '권한이 없습니다.'}), 403
+    if not chatbot_ready:
+        return jsonify({'status': 'error', 'message': '챗봇이 초기화되지 않았습니다.'}), 400
+    try:
+        chatbot = unified_chatbot.get_unified_chatbot_instance()
+        result = chatbot.refresh_index()
+        if result.get('status') in ('busy', 'not_ready'):
+            return jsonify(result), 409
+        if result.get('status') == 'rebuilding':
+            return jsonify(result), 202
+        return jsonify(result)
+    except Exception as e:
+        logger.error(f"인덱스 갱신 중 오류 발생: {str(e)}")
+        return jsonify({'status': 'error', 'message': f'오류가 발생했습니다: {str(e)}'}), 500
+
 # --- Puppeteer 서버를 호출하는 원래 get_unboxing_video 함수로 복구 ---
 @app.route('/api/get-unboxing-video', methods=['POST'])
 def get_unboxing_video():
@@ -364,44 +521,18 @@ def get_unboxing_video():
 
 @app.route('/view/<source_type>/<filename>')
 def view_document(source_type, filename):
-    """내부 문서 보기 (새 창에서 열 때)"""
+    """내부 문서 보기 (새 창에서 열 때, 서버에서 렌더링한 HTML)"""
+    if source_type != 'economy_terms':
+        source_type = 'recent_contents'
+    entry = document_catalog.get(source_type, filename)
+    if entry is None:
+        logger.error(f"문서 조회 오류: {source_type}/{filename}")
+        return f"문서를 찾을 수 없습니다: {filename}", 404
     try:
-        if source_type == 'economy_terms':
-            file_path = ECONOMY_TERMS_DIR / filename
-        else:
-            file_path = RECENT_CONTENTS_DIR / filename
-            
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            
-        # 백틱 문자를 미리 이스케이프 처리
-        escaped_content = content.replace('`', r'\`')
-            
-        # 마크다운을 HTML로 변환하여 반환
-        html_content = f"""
-        <!DOCTYPE html>
-        <html lang="ko">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>{filename.replace('.md', '')}</title>
-            <script src="https://cdn.jsdelivr.net/npm/marked/marked.min.js"></script>
-            <script src="https://cdn.tailwindcss.com"></script>
-            <link href="https://fonts.googleapis.com/css2?family=Noto+Sans+KR:wght@400;500;700&display=swap" rel="stylesheet">
-        </head>
-        <body class="font-sans p-8 max-w-4xl mx-auto">
-            <div id="content" class="prose prose-lg"></div>
-            <script>
-                document.getElementById('content').innerHTML = marked.parse(`{escaped_content}`);
-            </script>
-        </body>
-        </html>
-        """
-        return html_content
-        
+        return view_page(entry).response(request, VIEW_CACHE_CONTROL)
     except Exception as e:
-        logger.error(f"문서 조회 오류: {str(e)}")
-        return f"문서를 찾을 수 없습니다: {filename}", 404
+        logger.error(f"문서 보기 렌더링 오류: {str(e)}")
+        return f"문서를 표시할 수 없습니다: {filename}", 500
 
 # 환경 변수 확인 API
 @app.route('/api/env/check')
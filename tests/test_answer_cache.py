@@ -0,0 +1,99 @@
+"""AnswerCache TTL·LRU·유사 질의 조회 테스트"""
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from modules import answer_cache
+from modules.answer_cache import AnswerCache, normalize_query
+
+
+def answer(text):
+    return {"answer": text, "citations": []}
+
+
+class AnswerCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch.object(answer_cache.time, "time", side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_normalize_query(self):
+        self.assertEqual(normalize_query("  기준금리란   무엇인가요?! "), "기준금리란 무엇인가요")
+        self.assertEqual(normalize_query("ＧＤＰ"), "gdp")
+
+    def test_exact_hit_uses_normalized_query_and_backend(self):
+        cache = AnswerCache()
+        cache.put("기준금리란?", "perplexity", answer("A"))
+
+        self.assertEqual(cache.get("기준금리란", "perplexity"), answer("A"))
+        self.assertIsNone(cache.get("기준금리란", "gemini"))
+        self.assertEqual((cache.exact_hits, cache.misses), (1, 1))
+
+    def test_entries_expire_after_ttl(self):
+        cache = AnswerCache(ttl=60, web_ttl=10)
+        cache.put("환율", "perplexity", answer("내부"))
+        cache.put("금리", "perplexity", answer("웹"), used_web=True)
+
+        self.now += 11
+        self.assertIsNone(cache.get("금리", "perplexity"))
+        self.assertEqual(cache.get("환율", "perplexity"), answer("내부"))
+
+        self.now += 50
+        self.assertIsNone(cache.get("환율", "perplexity"))
+        self.assertEqual(cache.stats()["entries"], 0)
+
+    def test_lru_eviction_keeps_recently_used(self):
+        cache = AnswerCache(max_entries=2)
+        cache.put("a", "p", answer("A"))
+        cache.put("b", "p", answer("B"))
+        cache.get("a", "p")
+        cache.put("c", "p", answer("C"))
+
+        self.assertIsNone(cache.get("b", "p"))
+        self.assertEqual(cache.get("a", "p"), answer("A"))
+        self.assertEqual(cache.get("c", "p"), answer("C"))
+        self.assertEqual(cache.evictions, 1)
+
+    def test_semantic_hit_respects_threshold_and_backend(self):
+        cache = AnswerCache(similarity_threshold=0.9)
+        cache.put("기준금리란", "perplexity", answer("A"), query_vector=[1.0, 0.0])
+
+        close = [np.cos(0.3), np.sin(0.3)]  # 유사도 약 0.955
+        far = [np.cos(0.6), np.sin(0.6)]  # 유사도 약 0.825
+        self.assertEqual(cache.get("금리 뜻", "perplexity", query_vector=close), answer("A"))
+        self.assertIsNone(cache.get("금리 의미", "perplexity", query_vector=far))
+        self.assertIsNone(cache.get("금리 뜻", "gemini", query_vector=close))
+        self.assertEqual((cache.semantic_hits, cache.misses), (1, 2))
+
+    def test_semantic_lookup_disabled_at_threshold_one(self):
+        cache = AnswerCache(similarity_threshold=1.0)
+        cache.put("기준금리란", "perplexity", answer("A"), query_vector=[1.0, 0.0])
+
+        self.assertFalse(cache.semantic_enabled)
+        self.assertIsNone(cache.get("금리 뜻", "perplexity", query_vector=[1.0, 0.0]))
+
+    def test_record_miss_and_deferred_miss(self):
+        cache = AnswerCache()
+        self.assertIsNone(cache.get("환율", "perplexity", record_miss=False))
+        self.assertEqual(cache.misses, 0)
+
+        cache.record_miss()
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_clear_invalidates_exact_and_semantic_entries(self):
+        cache = AnswerCache(similarity_threshold=0.9)
+        cache.put("기준금리란", "perplexity", answer("A"), query_vector=[1.0, 0.0])
+        cache.get("기준금리", "perplexity", query_vector=[1.0, 0.0])
+
+        cache.clear()
+
+        self.assertIsNone(cache.get("기준금리란", "perplexity"))
+        self.assertIsNone(cache.get("금리 뜻", "perplexity", query_vector=[1.0, 0.0]))
+        self.assertEqual(cache.stats()["entries"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+"""BM25Index 생성·검색·상태 저장 복원 테스트"""
+import unittest
+
+import numpy as np
+
+from modules.bm25_index import BM25Index, ngram_tokenizer
+
+TEXTS = [
+    "기준금리는 한국은행이 결정하는 정책금리입니다.",
+    "환율은 두 나라 통화의 교환 비율입니다. 환율이 오르면 수입물가가 오릅니다.",
+    "인플레이션은 물가가 지속적으로 오르는 현상입니다.",
+    "GDP는 국내총생산을 뜻합니다."
+]
+
+
+class NgramTokenizerTest(unittest.TestCase):
+
+    def test_korean_words_become_bigrams(self):
+        self.assertEqual(ngram_tokenizer("기준금리는"), ["기준", "준금", "금리", "리는"])
+
+    def test_latin_words_are_kept_and_lowercased(self):
+        self.assertEqual(ngram_tokenizer("GDP 3.5% 성장"), ["gdp", "3", "5", "성장"])
+
+    def test_single_syllable_word(self):
+        self.assertEqual(ngram_tokenizer("금 값"), ["금", "값"])
+
+
+class BM25IndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.index = BM25Index.build(TEXTS)
+
+    def test_search_ranks_matching_document_first(self):
+        doc_ids, scores = self.index.search("기준금리", k=2)
+
+        self.assertEqual(int(doc_ids[0]), 0)
+        self.assertTrue(np.all(np.diff(scores) <= 0))
+
+    def test_particles_do_not_prevent_match(self):
+        doc_ids, _ = self.index.search("환율이란", k=1)
+        self.assertEqual(int(doc_ids[0]), 1)
+
+    def test_candidates_are_documents_containing_term(self):
+        candidates, scores = self.index.candidate_scores("오르")
+        by_doc = dict(zip(candidates.tolist(), scores.tolist()))
+
+        self.assertEqual(set(by_doc), {1, 2})
+        self.assertGreater(by_doc[1], 0)
+        self.assertGreater(by_doc[2], 0)
+
+    def test_unknown_query_returns_empty(self):
+        doc_ids, scores = self.index.search("반도체", k=3)
+        self.assertEqual(len(doc_ids), 0)
+        self.assertEqual(len(scores), 0)
+
+    def test_mask_limits_candidates(self):
+        mask = np.array([False, False, True, True])
+        candidates, _ = self.index.candidate_scores("오르", mask)
+        self.assertEqual(candidates.tolist(), [2])
+
+    def test_k_larger_than_candidates(self):
+        doc_ids, _ = self.index.search("gdp", k=10)
+        self.assertEqual(doc_ids.tolist(), [3])
+
+    def test_state_round_trip_gives_identical_scores(self):
+        meta, arrays = self.index.state()
+        restored = BM25Index.from_state(meta, {name: array.copy() for name, array in arrays.items()})
+
+        self.assertEqual(restored.vocab, self.index.vocab)
+        self.assertEqual(restored.doc_count, len(TEXTS))
+        self.assertEqual(restored.tokenizer_name, "ngram")
+        for query in ("기준금리", "환율 물가", "국내총생산"):
+            expected = self.index.search(query, k=4)
+            actual = restored.search(query, k=4)
+            np.testing.assert_array_equal(actual[0], expected[0])
+            np.testing.assert_allclose(actual[1], expected[1])
+
+    def test_idf_is_higher_for_rarer_terms(self):
+        rare, common, missing = self.index.idf(["기준", "니다", "없는용어"])
+        self.assertGreater(rare, common)
+        self.assertGreaterEqual(missing, rare)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+"""게시일 추출과 메타데이터 필터(청크 마스크, Chroma where) 테스트"""
+import unittest
+
+from langchain.schema.document import Document
+
+from modules.chunk_metadata import ChunkMetadataIndex, normalize_filters, parse_published_date
+
+
+def chunk(source_type, published_date=None):
+    metadata = {"source_type": source_type}
+    if published_date:
+        metadata["published_date"] = published_date
+    return Document(page_content="본문", metadata=metadata)
+
+
+class ParsePublishedDateTest(unittest.TestCase):
+
+    def test_file_name_dates(self):
+        self.assertEqual(parse_published_date("2024-05-01_기준금리.md", ""), "2024-05-01")
+        self.assertEqual(parse_published_date("환율 2024.05.01.md", ""), "2024-05-01")
+        self.assertEqual(parse_published_date("news_20240501.md", ""), "2024-05-01")
+
+    def test_header_date(self):
+        content = "# 물가 동향\n발행일: 2024.5.7\n\n본문"
+        self.assertEqual(parse_published_date("물가 동향.md", content), "2024-05-07")
+
+    def test_header_beyond_scan_window_is_ignored(self):
+        content = "본문 " * 300 + "\ndate: 2024-05-07"
+        self.assertIsNone(parse_published_date("물가 동향.md", content))
+
+    def test_file_name_date_takes_precedence_over_header(self):
+        self.assertEqual(parse_published_date("2024-05-01.md", "date: 2023-01-02"), "2024-05-01")
+
+    def test_month_only_file_name_means_first_day(self):
+        self.assertEqual(parse_published_date("경제 동향 (2024년 5월).md", ""), "2024-05-01")
+
+    def test_invalid_or_missing_dates(self):
+        self.assertIsNone(parse_published_date("2024-02-30 보고서.md", ""))
+        self.assertIsNone(parse_published_date("기준금리.md", "# 기준금리\n\n정책금리입니다"))
+
+
+class NormalizeFiltersTest(unittest.TestCase):
+
+    def test_values_are_normalized(self):
+        filters = normalize_filters(" news ", "2024-05-01", None)
+        self.assertEqual(filters, {"source_type": ["news"], "date_from": "2024-05-01"})
+        self.assertEqual(normalize_filters(), {})
+
+    def test_invalid_values_raise(self):
+        with self.assertRaises(ValueError):
+            normalize_filters(date_from="2024/05/01")
+        with self.assertRaises(ValueError):
+            normalize_filters(date_from="2024-06-01", date_to="2024-05-01")
+
+
+class ChunkMetadataIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.index = ChunkMetadataIndex([
+            chunk("economy_terms"),
+            chunk("recent_contents", "2024-04-30"),
+            chunk("recent_contents", "2024-05-02"),
+            chunk("news", "2024-05-02"),
+            chunk("news", "2024-06-01")
+        ])
+
+    def test_no_filters(self):
+        self.assertEqual(self.index.filter({}), (None, None))
+
+    def test_source_type_mask_and_where(self):
+        mask, where = self.index.filter(normalize_filters(["news", "unknown"]))
+
+        self.assertEqual(mask.tolist(), [False, False, False, True, True])
+        self.assertEqual(where, {"source_type": {"$in": ["news", "unknown"]}})
+
+    def test_date_range_excludes_undated_chunks(self):
+        mask, where = self.index.filter(normalize_filters(date_from="2024-05-01", date_to="2024-05-31"))
+
+        self.assertEqual(mask.tolist(), [False, False, True, True, False])
+        self.assertEqual(where, {"published_date": {"$in": ["2024-05-02"]}})
+
+    def test_combined_filters_use_and(self):
+        mask, where = self.index.filter(normalize_filters("recent_contents", date_from="2024-05-01"))
+
+        self.assertEqual(mask.tolist(), [False, False, True, False, False])
+        self.assertEqual(where, {"$and": [
+            {"source_type": {"$in": ["recent_contents"]}},
+            {"published_date": {"$in": ["2024-05-02"]}}
+        ]})
+
+    def test_empty_date_range_matches_nothing(self):
+        mask, where = self.index.filter(normalize_filters(date_to="2023-12-31"))
+
+        self.assertFalse(mask.any())
+        self.assertEqual(where, {"published_date": {"$in": [""]}})
+
+
+if __name__ == "__main__":
+    unittest.main()
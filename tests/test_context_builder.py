@@ -0,0 +1,111 @@
+"""청크 구간 병합과 토큰 예산 선택 테스트"""
+import unittest
+
+from langchain.schema.document import Document
+
+from modules.context_builder import merge_hits, select_spans, MAX_MERGE_GAP, MIN_PARTIAL_TOKENS
+
+TEXT = "가나다라마바사아자차카타파하" * 10
+
+
+def hit(start, end, score, file_name="금리.md", text=None):
+    metadata = {"source_type": "economy_terms", "file_name": file_name}
+    if start is not None:
+        metadata["start_index"] = start
+    return {"document": Document(page_content=text if text is not None else TEXT[start:end], metadata=metadata),
+            "score": score}
+
+
+def span(text, score):
+    return {"text": text, "score": score}
+
+
+def truncate(text, max_tokens):
+    return text[:max_tokens]
+
+
+class MergeHitsTest(unittest.TestCase):
+
+    def test_overlapping_chunks_are_merged_once(self):
+        spans = merge_hits([hit(30, 70, 0.4), hit(0, 40, 0.9)])
+
+        self.assertEqual(len(spans), 1)
+        self.assertEqual(spans[0]["text"], TEXT[0:70])
+        self.assertEqual(spans[0]["score"], 0.9)
+        self.assertEqual(spans[0]["chunk_count"], 2)
+        self.assertEqual(spans[0]["document"].metadata["start_index"], 0)
+
+    def test_contained_chunk_adds_nothing(self):
+        spans = merge_hits([hit(0, 50, 0.5), hit(10, 30, 0.7)])
+
+        self.assertEqual(spans[0]["text"], TEXT[0:50])
+        self.assertEqual(spans[0]["score"], 0.7)
+
+    def test_small_gap_is_joined_with_newline(self):
+        spans = merge_hits([hit(0, 20, 0.5), hit(20 + MAX_MERGE_GAP, 40, 0.5)])
+
+        self.assertEqual(len(spans), 1)
+        self.assertEqual(spans[0]["text"], TEXT[0:20] + "\n" + TEXT[20 + MAX_MERGE_GAP:40])
+
+    def test_distant_chunks_and_other_files_stay_separate(self):
+        spans = merge_hits([
+            hit(0, 20, 0.5),
+            hit(21 + MAX_MERGE_GAP, 40, 0.6),
+            hit(0, 20, 0.7, file_name="환율.md", text="환율은 통화의 교환 비율입니다")
+        ])
+
+        self.assertEqual(len(spans), 3)
+        self.assertEqual([span["chunk_count"] for span in spans], [1, 1, 1])
+
+    def test_chunks_without_start_index_and_duplicates(self):
+        spans = merge_hits([
+            hit(None, None, 0.5, text="뉴스 본문"),
+            hit(None, None, 0.4, text="뉴스 본문"),
+            hit(None, None, 0.3, text="다른 본문")
+        ])
+
+        self.assertEqual([span["text"] for span in spans], ["뉴스 본문", "다른 본문"])
+
+    def test_rerank_score_takes_precedence(self):
+        reranked = dict(hit(0, 20, 0.1), rerank_score=3.0)
+        self.assertEqual(merge_hits([reranked])[0]["score"], 3.0)
+
+
+class SelectSpansTest(unittest.TestCase):
+
+    def test_spans_are_selected_by_score_within_budget(self):
+        spans = [span("a" * 40, 0.2), span("b" * 40, 0.9), span("c" * 40, 0.5)]
+
+        selected = select_spans(spans, 80, len, truncate)
+
+        self.assertEqual([s["text"][0] for s in selected], ["b", "c"])
+        self.assertEqual([s["tokens"] for s in selected], [40, 40])
+
+    def test_oversized_span_is_skipped_when_little_budget_remains(self):
+        budget = 100 + MIN_PARTIAL_TOKENS - 1
+        spans = [span("a" * 100, 0.9), span("b" * 200, 0.8), span("c" * 10, 0.1)]
+
+        selected = select_spans(spans, budget, len, truncate)
+
+        self.assertEqual([s["text"][0] for s in selected], ["a", "c"])
+        self.assertNotIn("truncated", selected[1])
+
+    def test_oversized_span_is_truncated_to_remaining_budget(self):
+        budget = 100 + MIN_PARTIAL_TOKENS
+        spans = [span("a" * 100, 0.9), span("b" * 200, 0.8)]
+
+        selected = select_spans(spans, budget, len, truncate)
+
+        self.assertEqual(selected[1]["text"], "b" * MIN_PARTIAL_TOKENS)
+        self.assertTrue(selected[1]["truncated"])
+        self.assertEqual(sum(s["tokens"] for s in selected), budget)
+
+    def test_first_span_is_always_included(self):
+        selected = select_spans([span("a" * 500, 0.9)], 30, len, truncate)
+
+        self.assertEqual(selected[0]["tokens"], 30)
+        self.assertTrue(selected[0]["truncated"])
+
+
+if __name__ == "__main__":
+    unittest.main()
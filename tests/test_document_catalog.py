@@ -0,0 +1,97 @@
+"""DocumentCatalog 변경 감지·목록 정렬 테스트"""
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from modules.document_catalog import DocumentCatalog
+from modules.rag_index import content_sha256
+
+
+class DocumentCatalogTest(unittest.TestCase):
+
+    def setUp(self):
+        self.base = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.base, ignore_errors=True)
+        self.terms_dir = self.base / "economy_terms"
+        self.recent_dir = self.base / "recent_contents_final"
+        self.terms_dir.mkdir()
+        self.recent_dir.mkdir()
+
+        self.write(self.terms_dir, "기준금리.md", "기준금리는 정책금리입니다", mtime=1000)
+        self.write(self.terms_dir, "환율.md", "환율은 통화의 교환 비율입니다", mtime=3000)
+        self.write(self.recent_dir, "물가 동향.md", "물가가 올랐습니다", mtime=2000)
+        (self.terms_dir / "메모.txt").write_text("목록에서 제외", encoding="utf-8")
+
+        self.catalog = DocumentCatalog({"economy_terms": self.terms_dir, "recent_contents": self.recent_dir},
+                                       poll_interval=0)
+
+    @staticmethod
+    def write(directory, name, text, mtime):
+        path = directory / name
+        path.write_text(text, encoding="utf-8")
+        os.utime(path, (mtime, mtime))
+
+    def test_initial_load(self):
+        self.assertEqual(self.catalog.refresh(), {"added": 3, "updated": 0, "deleted": 0})
+
+        entry = self.catalog.get("economy_terms", "기준금리.md")
+        self.assertEqual(entry["title"], "기준금리")
+        self.assertEqual(entry["content"], "기준금리는 정책금리입니다")
+        self.assertEqual(entry["sha256"], content_sha256("기준금리는 정책금리입니다"))
+        self.assertIsNone(self.catalog.get("economy_terms", "메모.txt"))
+
+        stats = self.catalog.stats()
+        self.assertEqual(stats["version"], 1)
+        self.assertEqual(stats["files"], {"economy_terms": 2, "recent_contents": 1})
+        self.assertEqual(stats["content_bytes"], sum(entry["size"] for entry in self.catalog.entries()))
+
+    def test_unchanged_files_are_not_reread(self):
+        self.catalog.refresh()
+        before = self.catalog.get("economy_terms", "환율.md")
+
+        self.assertEqual(self.catalog.refresh(), {"added": 0, "updated": 0, "deleted": 0})
+        self.assertIs(self.catalog.get("economy_terms", "환율.md"), before)
+        self.assertEqual(self.catalog.version, 1)
+
+    def test_add_modify_delete(self):
+        self.catalog.refresh()
+
+        self.write(self.terms_dir, "환율.md", "원달러 환율이 올랐습니다", mtime=4000)
+        self.write(self.recent_dir, "고용 동향.md", "취업자가 늘었습니다", mtime=4000)
+        (self.terms_dir / "기준금리.md").unlink()
+
+        self.assertEqual(self.catalog.refresh(), {"added": 1, "updated": 1, "deleted": 1})
+        self.assertEqual(self.catalog.get("economy_terms", "환율.md")["content"], "원달러 환율이 올랐습니다")
+        self.assertIsNone(self.catalog.get("economy_terms", "기준금리.md"))
+
+        stats = self.catalog.stats()
+        self.assertEqual(stats["version"], 2)
+        self.assertEqual(stats["files"], {"economy_terms": 1, "recent_contents": 2})
+        self.assertEqual(stats["content_bytes"], sum(entry["size"] for entry in self.catalog.entries()))
+
+    def test_missing_directory_is_empty(self):
+        shutil.rmtree(self.recent_dir)
+
+        self.assertEqual(self.catalog.entries("recent_contents"), [])
+        self.assertEqual(self.catalog.stats()["files"], {"economy_terms": 2, "recent_contents": 0})
+
+    def test_listing_sort_and_pages(self):
+        listing = self.catalog.listing("economy_terms", sort="mtime", order="desc")
+        self.assertEqual(listing["files"], ["환율.md", "기준금리.md"])
+        self.assertEqual(listing["total"], 2)
+        self.assertIsNone(listing["page"])
+
+        page = self.catalog.listing("economy_terms", page=2, per_page=1)
+        self.assertEqual(page["files"], ["환율.md"])
+        self.assertEqual(page["total"], 2)
+
+    def test_listing_rejects_invalid_options(self):
+        for options in ({"sort": "date"}, {"order": "up"}, {"page": 0}, {"per_page": -1}):
+            with self.assertRaises(ValueError):
+                self.catalog.listing("economy_terms", **options)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+"""문서 전문 검색(스니펫 강조)과 제목 자동완성 테스트"""
+import unittest
+
+from langchain.schema.document import Document
+
+from modules.bm25_index import BM25Index
+from modules.chunk_metadata import ChunkMetadataIndex, normalize_filters
+from modules.document_search import DocumentSearcher, TitleIndex, highlight_snippet
+
+
+def chunk(title, text, source_type="economy_terms", published_date=None):
+    metadata = {"source_type": source_type, "file_name": f"{title}.md", "title": title}
+    if published_date:
+        metadata["published_date"] = published_date
+    return Document(page_content=text, metadata=metadata)
+
+
+class HighlightSnippetTest(unittest.TestCase):
+
+    def test_query_terms_are_marked(self):
+        snippet = highlight_snippet("# 환율\n\n환율은 두 나라 통화의 교환 비율입니다.", "환율")
+
+        self.assertEqual(snippet, "<mark>환율</mark> <mark>환율</mark>은 두 나라 통화의 교환 비율입니다.")
+
+    def test_snippet_is_cut_around_first_match(self):
+        text = "서론 " * 100 + "기준금리는 정책금리입니다. " + "결론 " * 100
+
+        snippet = highlight_snippet(text, "기준금리", max_chars=60)
+
+        self.assertTrue(snippet.startswith("…"))
+        self.assertTrue(snippet.endswith("…"))
+        self.assertIn("<mark>기준금리</mark>", snippet)
+        self.assertLessEqual(len(snippet.replace("<mark>", "").replace("</mark>", "")), 62)
+
+    def test_html_is_escaped(self):
+        snippet = highlight_snippet("<script>금리</script>", "금리")
+
+        self.assertNotIn("<script>", snippet)
+        self.assertIn("&lt;script&gt;<mark>금리</mark>", snippet)
+
+    def test_no_match_returns_leading_text(self):
+        self.assertEqual(highlight_snippet("물가가 올랐습니다", "반도체"), "물가가 올랐습니다")
+
+
+class DocumentSearcherTest(unittest.TestCase):
+
+    def setUp(self):
+        chunks = [
+            chunk("기준금리", "기준금리는 한국은행이 정하는 정책금리입니다."),
+            chunk("기준금리", "금리가 오르면 대출 이자가 늘어납니다. 금리 인상은 물가를 낮춥니다."),
+            chunk("환율", "환율이 오르면 수입 물가가 오릅니다."),
+            chunk("물가 동향", "5월 소비자물가가 올랐습니다. 금리 동결이 예상됩니다.", "recent_contents", "2024-05-02")
+        ]
+        self.searcher = DocumentSearcher(chunks, BM25Index.build([c.page_content for c in chunks]),
+                                         ChunkMetadataIndex(chunks))
+
+    def test_documents_are_ranked_once_with_snippet_and_url(self):
+        result = self.searcher.search("금리")
+
+        files = [item["file_name"] for item in result["results"]]
+        self.assertEqual(result["total"], 2)
+        self.assertEqual(files[0], "기준금리.md")
+        self.assertEqual(len(files), len(set(files)))
+        self.assertIn("<mark>금리</mark>", result["results"][0]["snippet"])
+        self.assertEqual(result["results"][0]["url"], "/view/economy_terms/%EA%B8%B0%EC%A4%80%EA%B8%88%EB%A6%AC.md")
+
+    def test_title_match_is_boosted(self):
+        result = self.searcher.search("물가")
+        self.assertEqual(result["results"][0]["title"], "물가 동향")
+
+    def test_filters_and_limit(self):
+        result = self.searcher.search("물가", filters=normalize_filters("economy_terms"))
+        self.assertEqual({item["source_type"] for item in result["results"]}, {"economy_terms"})
+        self.assertEqual(result["total"], 2)
+
+        result = self.searcher.search("금리", limit=1)
+        self.assertEqual((result["total"], len(result["results"])), (2, 1))
+
+    def test_unknown_query(self):
+        self.assertEqual(self.searcher.search("반도체"), {"total": 0, "results": []})
+
+
+class TitleIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.index = TitleIndex([
+            {"title": "기준금리", "source_type": "economy_terms", "file_name": "기준금리.md"},
+            {"title": "기업어음", "source_type": "economy_terms", "file_name": "기업어음.md"},
+            {"title": "GDP", "source_type": "economy_terms", "file_name": "GDP.md"},
+            {"title": "33_기준금리 동결", "source_type": "recent_contents", "file_name": "33_기준금리 동결.md"},
+            {"title": "2024-05-01_환율 동향", "source_type": "recent_contents", "file_name": "2024-05-01_환율 동향.md"}
+        ])
+
+    def test_prefix_matches_in_sorted_order(self):
+        titles = [item["title"] for item in self.index.complete("기")]
+        self.assertEqual(titles, ["기업어음", "기준금리", "33_기준금리 동결"])
+
+    def test_number_and_date_prefixes_are_optional(self):
+        self.assertEqual([item["title"] for item in self.index.complete("환율")], ["2024-05-01_환율 동향"])
+        self.assertEqual([item["title"] for item in self.index.complete("33_")], ["33_기준금리 동결"])
+
+    def test_prefix_is_normalized(self):
+        suggestions = self.index.complete("ｇｄ")
+        self.assertEqual(suggestions[0]["title"], "GDP")
+        self.assertEqual(suggestions[0]["url"], "/view/economy_terms/GDP.md")
+
+    def test_limit_and_empty_prefix(self):
+        self.assertEqual(len(self.index.complete("기", limit=2)), 2)
+        self.assertEqual(self.index.complete("  "), [])
+        self.assertEqual(self.index.complete("반도체"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+"""Representation 조건부 GET·인코딩 협상과 RepresentationCache 테스트"""
+import gzip
+import unittest
+
+from werkzeug.test import EnvironBuilder
+from werkzeug.wrappers import Request
+
+from modules import http_cache
+from modules.http_cache import Representation, RepresentationCache, MIN_COMPRESS_BYTES
+
+BODY = ("기준금리는 한국은행이 정하는 정책금리입니다. " * 40).encode("utf-8")
+MTIME = 1714521600  # 2024-05-01 00:00:00 UTC
+
+
+def make_request(**headers):
+    return Request(EnvironBuilder(path="/", headers=headers).get_environ())
+
+
+class RepresentationTest(unittest.TestCase):
+
+    def setUp(self):
+        self.representation = Representation(BODY, "text/markdown; charset=utf-8", last_modified=MTIME)
+
+    def test_plain_response_has_validators(self):
+        response = self.representation.response(make_request(), "no-cache")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_data(), BODY)
+        self.assertIsNone(response.headers.get("Content-Encoding"))
+        self.assertEqual(response.get_etag(), (self.representation.etag(), False))
+        self.assertEqual(response.headers["Cache-Control"], "no-cache")
+        self.assertEqual(int(response.last_modified.timestamp()), MTIME)
+        self.assertIn("Accept-Encoding", response.vary)
+
+    def test_gzip_is_negotiated(self):
+        response = self.representation.response(make_request(**{"Accept-Encoding": "gzip"}), "no-cache")
+
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(response.get_data()), BODY)
+        self.assertEqual(response.get_etag()[0], self.representation.etag("gzip"))
+        self.assertNotEqual(self.representation.etag("gzip"), self.representation.etag())
+
+    def test_brotli_is_preferred_when_available(self):
+        request = make_request(**{"Accept-Encoding": "gzip, br"})
+        expected = "br" if http_cache.brotli is not None else "gzip"
+
+        self.assertEqual(self.representation.negotiate(request), expected)
+
+    def test_quality_values_are_respected(self):
+        request = make_request(**{"Accept-Encoding": "gzip;q=1.0, br;q=0.5"})
+        self.assertEqual(self.representation.negotiate(request), "gzip")
+
+        request = make_request(**{"Accept-Encoding": "gzip;q=0"})
+        self.assertEqual(self.representation.negotiate(request), "identity")
+
+    def test_small_or_binary_bodies_are_not_compressed(self):
+        small = Representation(b"x" * (MIN_COMPRESS_BYTES - 1), "text/plain")
+        image = Representation(b"\x89PNG" * 1000, "image/png")
+
+        for representation in (small, image):
+            self.assertEqual(list(representation.variants), ["identity"])
+            response = representation.response(make_request(**{"Accept-Encoding": "gzip"}), "no-cache")
+            self.assertNotIn("Accept-Encoding", response.vary)
+
+    def test_if_none_match_returns_304_for_any_encoding(self):
+        for encoding in self.representation.variants:
+            etag = f'"{self.representation.etag(encoding)}"'
+            response = self.representation.response(make_request(**{"If-None-Match": etag}), "no-cache")
+            self.assertEqual(response.status_code, 304, encoding)
+            self.assertEqual(response.get_data(), b"")
+
+        response = self.representation.response(make_request(**{"If-None-Match": '"other"'}), "no-cache")
+        self.assertEqual(response.status_code, 200)
+
+    def test_if_none_match_takes_precedence_over_if_modified_since(self):
+        request = make_request(**{"If-None-Match": '"other"', "If-Modified-Since": "Wed, 01 May 2024 00:00:00 GMT"})
+        self.assertEqual(self.representation.response(request, "no-cache").status_code, 200)
+
+    def test_if_modified_since(self):
+        current = make_request(**{"If-Modified-Since": "Wed, 01 May 2024 00:00:00 GMT"})
+        stale = make_request(**{"If-Modified-Since": "Tue, 30 Apr 2024 23:59:59 GMT"})
+
+        self.assertEqual(self.representation.response(current, "no-cache").status_code, 304)
+        self.assertEqual(self.representation.response(stale, "no-cache").status_code, 200)
+
+
+class RepresentationCacheTest(unittest.TestCase):
+
+    def test_rebuilds_only_when_version_changes(self):
+        cache = RepresentationCache()
+        builds = []
+
+        def build(body):
+            builds.append(body)
+            return Representation(body, "text/plain")
+
+        first = cache.get("a", 1, lambda: build(BODY))
+        self.assertIs(cache.get("a", 1, lambda: build(BODY)), first)
+        cache.get("a", 2, lambda: build(b"changed"))
+
+        self.assertEqual(len(builds), 2)
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["entries"]), (1, 2, 1))
+        self.assertEqual(stats["bytes"], len(b"changed"))
+
+    def test_eviction_updates_byte_count(self):
+        cache = RepresentationCache(max_entries=2)
+        for key in ("a", "b", "c"):
+            cache.get(key, 1, lambda: Representation(b"x" * 10, "text/plain"))
+
+        stats = cache.stats()
+        self.assertEqual((stats["entries"], stats["bytes"]), (2, 20))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+"""가중 RRF 융합과 하이브리드 검색 테스트"""
+import os
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from langchain.schema.document import Document
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+
+from modules.bm25_index import BM25Index
+from modules.hybrid_search import HybridSearcher, reciprocal_rank_fusion, RRF_C
+from modules.unified_chatbot import normalize_top_k, normalize_weights
+
+
+class ReciprocalRankFusionTest(unittest.TestCase):
+
+    def test_scores_are_weighted_reciprocal_ranks(self):
+        ids, scores = reciprocal_rank_fusion([np.array([3, 1]), np.array([1, 2])], [0.6, 0.4])
+
+        expected = {
+            1: 0.6 / (RRF_C + 2) + 0.4 / (RRF_C + 1),
+            3: 0.6 / (RRF_C + 1),
+            2: 0.4 / (RRF_C + 2)
+        }
+        self.assertEqual(ids.tolist(), [1, 3, 2])
+        np.testing.assert_allclose(scores, [expected[i] for i in ids.tolist()], rtol=1e-6)
+
+    def test_weight_decides_which_ranking_wins(self):
+        dense, bm25 = np.array([5, 6]), np.array([6, 5])
+
+        self.assertEqual(reciprocal_rank_fusion([dense, bm25], [0.9, 0.1])[0][0], 5)
+        self.assertEqual(reciprocal_rank_fusion([dense, bm25], [0.1, 0.9])[0][0], 6)
+
+    def test_ties_are_ordered_by_chunk_number(self):
+        ids, scores = reciprocal_rank_fusion([np.array([7, 2]), np.array([2, 7])], [0.5, 0.5])
+
+        self.assertEqual(scores[0], scores[1])
+        self.assertEqual(ids.tolist(), [2, 7])
+
+    def test_zero_weight_and_empty_rankings_are_skipped(self):
+        ids, _ = reciprocal_rank_fusion([np.array([1, 2]), np.array([3])], [0.0, 1.0])
+        self.assertEqual(ids.tolist(), [3])
+
+        ids, scores = reciprocal_rank_fusion([np.array([], dtype=np.int64)], [1.0])
+        self.assertEqual((len(ids), len(scores)), (0, 0))
+
+
+class HybridSearcherTest(unittest.TestCase):
+
+    def setUp(self):
+        texts = ["기준금리는 정책금리입니다", "환율은 통화의 교환 비율입니다", "물가와 금리의 관계"]
+        self.chunks = [Document(page_content=text, metadata={"source_type": "economy_terms"}) for text in texts]
+        self.bm25 = BM25Index.build(texts)
+
+        def dense_search(query_vector, k, mask=None, where=None):
+            return np.array([1, 2]), np.array([0.9, 0.5], dtype=np.float32)
+
+        self.searcher = HybridSearcher(self.chunks, self.bm25, dense_search)
+
+    def test_hybrid_results_carry_both_scores(self):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            hits = self.searcher.search("금리", lambda query: [0.0], k=3, weights=[0.5, 0.5],
+                                        fetch_k=3, executor=executor)
+
+        by_text = {hit["document"].page_content: hit for hit in hits}
+        self.assertEqual(len(hits), 3)
+        self.assertIsNone(by_text["기준금리는 정책금리입니다"]["dense_score"])
+        self.assertIsNotNone(by_text["기준금리는 정책금리입니다"]["bm25_score"])
+        self.assertAlmostEqual(by_text["환율은 통화의 교환 비율입니다"]["dense_score"], 0.9, places=5)
+        self.assertEqual([hit["score"] for hit in hits], sorted((hit["score"] for hit in hits), reverse=True))
+
+    def test_keyword_only_searcher_ignores_embedding(self):
+        searcher = HybridSearcher(self.chunks, self.bm25)
+
+        def fail(query):
+            raise AssertionError("키워드 검색에서는 임베딩하지 않아야 합니다")
+
+        hits = searcher.search("환율", fail, k=2, weights=[0.6, 0.4], fetch_k=2)
+        self.assertEqual(hits[0]["document"].page_content, "환율은 통화의 교환 비율입니다")
+        self.assertIsNone(hits[0]["dense_score"])
+
+
+class RetrievalOptionValidationTest(unittest.TestCase):
+
+    def test_top_k_range(self):
+        self.assertIsNone(normalize_top_k(None))
+        self.assertEqual(normalize_top_k("3"), 3)
+        for invalid in (0, -2, 51, 2.5, True, "x"):
+            with self.assertRaises(ValueError):
+                normalize_top_k(invalid)
+
+    def test_weights(self):
+        self.assertIsNone(normalize_weights(None))
+        self.assertEqual(normalize_weights(["0.7", "0.3"]), [0.7, 0.3])
+        self.assertEqual(normalize_weights([0, 1]), [0.0, 1.0])
+        for invalid in ([-1, 5], [float("nan"), 1], [0, 0], ["inf", 1], [1], [1, 2, 3], "12"):
+            with self.assertRaises(ValueError):
+                normalize_weights(invalid)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+"""news_collector.save_news_to_db 배치 삽입 테스트 (DB 없이 psycopg2 연결과 execute_values를 모의 객체로 대체)"""
+import unittest
+from unittest import mock
+
+import psycopg2
+
+from modules import news_collector
+
+
+def make_news(*doc_ids):
+    return [{"doc_id": doc_id, "title": f"뉴스 {doc_id}", "category": ["경제"]} for doc_id in doc_ids]
+
+
+def returned_ids(cur, sql, rows, page_size=None, fetch=False):
+    """모든 행이 삽입된 경우의 RETURNING bigkinds_id 결과"""
+    return [(row[0],) for row in rows]
+
+
+class SaveNewsToDbTest(unittest.TestCase):
+
+    def setUp(self):
+        self.conn = mock.MagicMock()
+        self.cur = self.conn.cursor.return_value
+        patcher = mock.patch.object(news_collector.psycopg2, "connect", return_value=self.conn)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_batches_use_single_insert_with_fetch(self):
+        with mock.patch.object(news_collector, "execute_values", side_effect=returned_ids) as execute_values:
+            counts = news_collector.save_news_to_db(make_news("a", "b", "c"), batch_size=2)
+
+        self.assertEqual(counts, {"inserted": 3, "skipped": 0, "failed": 0})
+        self.assertEqual(execute_values.call_count, 2)
+        for call, expected_ids in zip(execute_values.call_args_list, (["a", "b"], ["c"])):
+            cur, sql, rows = call.args
+            self.assertIs(cur, self.cur)
+            self.assertIs(sql, news_collector.INSERT_NEWS_SQL)
+            self.assertEqual([row[0] for row in rows], expected_ids)
+            self.assertEqual(call.kwargs, {"page_size": len(rows), "fetch": True})
+        self.assertEqual(self.conn.commit.call_count, 2)
+        self.conn.rollback.assert_not_called()
+        self.conn.close.assert_called_once()
+
+    def test_conflicting_rows_are_counted_as_skipped(self):
+        # ON CONFLICT DO NOTHING으로 건너뛴 행은 RETURNING 결과에 없음
+        with mock.patch.object(news_collector, "execute_values", return_value=[("b",)]):
+            counts = news_collector.save_news_to_db(make_news("a", "b", "c"))
+
+        self.assertEqual(counts, {"inserted": 1, "skipped": 2, "failed": 0})
+
+    def test_missing_and_duplicate_ids_are_not_sent(self):
+        news = make_news("a", "a", "b") + [{"title": "doc_id 없음"}]
+        with mock.patch.object(news_collector, "execute_values", side_effect=returned_ids) as execute_values:
+            counts = news_collector.save_news_to_db(news)
+
+        self.assertEqual(counts, {"inserted": 2, "skipped": 2, "failed": 0})
+        rows = execute_values.call_args.args[2]
+        self.assertEqual([row[0] for row in rows], ["a", "b"])
+
+    def test_failed_batch_rolls_back_and_retries_row_by_row(self):
+        def insert(cur, sql, rows, page_size=None, fetch=False):
+            if len(rows) > 1:
+                raise psycopg2.DataError("배치 오류")
+            if rows[0][0] == "b":
+                raise psycopg2.DataError("행 오류")
+            return returned_ids(cur, sql, rows)
+
+        with mock.patch.object(news_collector, "execute_values", side_effect=insert) as execute_values:
+            counts = news_collector.save_news_to_db(make_news("a", "b", "c"))
+
+        self.assertEqual(counts, {"inserted": 2, "skipped": 0, "failed": 1})
+        self.assertEqual(execute_values.call_count, 4)
+        # 배치 실패 후 한 번, 오류 행에서 한 번 롤백하고 성공한 행마다 커밋
+        self.assertEqual(self.conn.rollback.call_count, 2)
+        self.assertEqual(self.conn.commit.call_count, 2)
+
+    def test_empty_input_does_not_connect(self):
+        counts = news_collector.save_news_to_db([])
+
+        self.assertEqual(counts, {"inserted": 0, "skipped": 0, "failed": 0})
+        news_collector.psycopg2.connect.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
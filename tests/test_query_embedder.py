@@ -0,0 +1,105 @@
+"""QueryEmbedder 동시 질의 배치 처리와 LRU 캐시 테스트"""
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import numpy as np
+
+from modules import query_embedder
+from modules.query_embedder import QueryEmbedder
+
+
+class FakeEmbeddings:
+    """질의 길이로 정해지는 벡터를 돌려주고 요청된 배치를 기록"""
+
+    def __init__(self, error=None):
+        self.batches = []
+        self.error = error
+
+    def embed_documents(self, texts):
+        self.batches.append(list(texts))
+        if self.error:
+            raise self.error
+        return [[float(len(text)), 1.0] for text in texts]
+
+
+class QueryEmbedderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.fake = FakeEmbeddings()
+        self.embedder = QueryEmbedder(self.fake, max_entries=2)
+
+    def embed_concurrently(self, queries):
+        """모든 질의가 등록될 때까지 첫 스레드의 배치 대기를 늦춘 뒤 동시에 임베딩"""
+        real_sleep = time.sleep
+
+        def wait_for_callers(seconds):
+            deadline = time.monotonic() + 5
+            while self.embedder.misses + self.embedder.coalesced < len(queries) and time.monotonic() < deadline:
+                real_sleep(0.001)
+
+        with mock.patch.object(query_embedder.time, "sleep", side_effect=wait_for_callers):
+            with ThreadPoolExecutor(max_workers=len(queries)) as executor:
+                return list(executor.map(self.embedder.embed_query, queries))
+
+    def test_concurrent_queries_share_one_batch(self):
+        queries = ["기준금리", "환율", "기준금리", "물가 상승률"]
+
+        vectors = self.embed_concurrently(queries)
+
+        self.assertEqual(len(self.fake.batches), 1)
+        self.assertEqual(sorted(self.fake.batches[0]), sorted({"기준금리", "환율", "물가 상승률"}))
+        for query, vector in zip(queries, vectors):
+            np.testing.assert_array_equal(vector, [len(query), 1.0])
+        stats = self.embedder.stats()
+        self.assertEqual((stats["misses"], stats["coalesced"], stats["batches"]), (3, 1, 1))
+        self.assertEqual(stats["avg_batch_size"], 3)
+
+    def test_cache_hit_skips_embedding(self):
+        first = self.embedder.embed_query("기준금리")
+        second = self.embedder.embed_query("기준금리")
+
+        np.testing.assert_array_equal(first, second)
+        self.assertEqual(len(self.fake.batches), 1)
+        self.assertEqual(self.embedder.stats()["hits"], 1)
+        self.assertFalse(second.flags.writeable)
+
+    def test_least_recently_used_query_is_evicted(self):
+        self.embedder.embed_query("a")
+        self.embedder.embed_query("b")
+        self.embedder.embed_query("a")
+        self.embedder.embed_query("c")
+
+        self.embedder.embed_query("a")
+        self.assertEqual(len(self.fake.batches), 3)
+        self.embedder.embed_query("b")
+        self.assertEqual(len(self.fake.batches), 4)
+        self.assertEqual(self.embedder.stats()["entries"], 2)
+
+    def test_errors_reach_every_waiter_and_are_not_cached(self):
+        self.fake.error = RuntimeError("rate limit")
+        results = []
+
+        def call(query):
+            try:
+                results.append(self.embedder.embed_query(query))
+            except RuntimeError as e:
+                results.append(e)
+
+        threads = [threading.Thread(target=call, args=("환율",)) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertTrue(all(isinstance(result, RuntimeError) for result in results))
+        self.assertEqual(self.embedder.stats()["entries"], 0)
+
+        self.fake.error = None
+        np.testing.assert_array_equal(self.embedder.embed_query("환율"), [2.0, 1.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+"""RagIndexStore 저장·로드·최신 여부 확인 테스트"""
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+from langchain.schema.document import Document
+
+from modules.bm25_index import BM25Index
+from modules.rag_index import RagIndexStore, INDEX_FORMAT_VERSION, content_sha256
+
+SETTINGS = {"chunk_size": 1000, "chunk_overlap": 200, "embedding_model": "text-embedding-3-small"}
+
+
+def make_files(**contents):
+    return {f"economy_terms/{name}.md": {"sha256": content_sha256(text)} for name, text in contents.items()}
+
+
+class RagIndexStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.base = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.base, ignore_errors=True)
+        self.store = RagIndexStore(self.base / "rag_index")
+
+        self.files = make_files(기준금리="기준금리는 정책금리입니다", 환율="환율은 통화의 교환 비율입니다")
+        self.chunk_ids = ["economy_terms/기준금리.md#0", "economy_terms/환율.md#0"]
+        self.chunks = [
+            Document(page_content="기준금리는 정책금리입니다", metadata={"title": "기준금리", "source_type": "economy_terms"}),
+            Document(page_content="환율은 통화의 교환 비율입니다", metadata={"title": "환율", "source_type": "economy_terms"})
+        ]
+        self.embeddings = np.arange(8, dtype=np.float32).reshape(2, 4)
+        self.bm25 = BM25Index.build([chunk.page_content for chunk in self.chunks])
+
+    def save(self, files=None):
+        manifest = self.store.build_manifest(SETTINGS, files or self.files)
+        self.store.save(manifest, self.chunk_ids, self.chunks, self.embeddings, self.bm25.state())
+        return manifest
+
+    def test_missing_index_is_not_current(self):
+        self.assertIsNone(self.store.load_manifest())
+        self.assertFalse(self.store.is_current(SETTINGS, self.files))
+
+    def test_save_and_load_round_trip(self):
+        manifest = self.save()
+
+        self.assertEqual(self.store.load_manifest(), manifest)
+        self.assertEqual(manifest["version"], INDEX_FORMAT_VERSION)
+
+        chunk_ids, chunks, (bm25_meta, bm25_arrays) = self.store.load_chunks()
+        self.assertEqual(chunk_ids, self.chunk_ids)
+        self.assertEqual([chunk.page_content for chunk in chunks], [chunk.page_content for chunk in self.chunks])
+        self.assertEqual([chunk.metadata for chunk in chunks], [chunk.metadata for chunk in self.chunks])
+        np.testing.assert_array_equal(self.store.load_embeddings(), self.embeddings)
+
+        restored = BM25Index.from_state(bm25_meta, bm25_arrays)
+        self.assertEqual(restored.vocab, self.bm25.vocab)
+        self.assertGreater(self.store.size_bytes(), 0)
+
+    def test_mmap_load_is_read_only(self):
+        self.save()
+
+        embeddings = self.store.load_embeddings(mmap=True)
+        _, _, (_, bm25_arrays) = self.store.load_chunks(mmap=True)
+
+        self.assertIsInstance(embeddings, np.memmap)
+        self.assertFalse(embeddings.flags.writeable)
+        self.assertIsInstance(bm25_arrays["weights"], np.memmap)
+        np.testing.assert_array_equal(embeddings, self.embeddings)
+
+    def test_is_current_tracks_settings_and_file_hashes(self):
+        self.save()
+
+        self.assertTrue(self.store.is_current(SETTINGS, self.files))
+        self.assertFalse(self.store.is_current(dict(SETTINGS, chunk_size=500), self.files))
+
+        modified = dict(self.files, **make_files(환율="환율이 바뀌었습니다"))
+        self.assertFalse(self.store.is_current(SETTINGS, modified))
+
+        added = dict(self.files, **make_files(인플레이션="물가가 오릅니다"))
+        self.assertFalse(self.store.is_current(SETTINGS, added))
+
+        deleted = {key: info for key, info in self.files.items() if "환율" not in key}
+        self.assertFalse(self.store.is_current(SETTINGS, deleted))
+
+    def test_is_current_rejects_other_format_version(self):
+        self.save()
+        manifest_path = self.store.index_dir / RagIndexStore.MANIFEST_FILE
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        manifest["version"] = INDEX_FORMAT_VERSION - 1
+        manifest_path.write_text(json.dumps(manifest), encoding="utf-8")
+
+        self.assertFalse(self.store.is_current(SETTINGS, self.files))
+
+    def test_corrupt_manifest_is_treated_as_missing(self):
+        self.save()
+        (self.store.index_dir / RagIndexStore.MANIFEST_FILE).write_text("{", encoding="utf-8")
+
+        self.assertIsNone(self.store.load_manifest())
+        self.assertFalse(self.store.is_current(SETTINGS, self.files))
+
+    def test_save_replaces_previous_index(self):
+        self.save()
+        self.embeddings = self.embeddings * 2
+        self.save()
+
+        np.testing.assert_array_equal(self.store.load_embeddings(), self.embeddings)
+        leftovers = [path.name for path in self.base.iterdir() if path.name != "rag_index"]
+        self.assertEqual(leftovers, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+"""UnifiedChatbot.refresh_index 증분 갱신 테스트 (가짜 임베딩, 임시 문서 디렉토리)"""
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+
+import modules.unified_chatbot as unified_chatbot
+from modules.rag_index import content_sha256
+
+
+class FakeEmbeddings:
+    """본문 해시로 정해지는 벡터를 돌려주고 임베딩한 텍스트를 기록"""
+
+    def __init__(self):
+        self.texts = []
+
+    def embed_documents(self, texts):
+        self.texts.extend(texts)
+        return [self.vector(text) for text in texts]
+
+    def embed_query(self, text):
+        return self.vector(text)
+
+    @staticmethod
+    def vector(text):
+        return np.random.default_rng(int(content_sha256(text)[:8], 16)).random(8).tolist()
+
+
+class RefreshIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.base = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.base, ignore_errors=True)
+        self.terms_dir = self.base / "economy_terms"
+        self.recent_dir = self.base / "recent_contents_final"
+        self.terms_dir.mkdir()
+        self.recent_dir.mkdir()
+
+        patcher = mock.patch.multiple(
+            unified_chatbot,
+            ECONOMY_TERMS_DIR=self.terms_dir,
+            RECENT_CONTENTS_DIR=self.recent_dir,
+            RAG_INDEX_DIR=self.base / "rag_index",
+            EMBEDDING_CACHE_PATH=self.base / "embedding_cache.sqlite3",
+            VECTOR_BACKEND="numpy",
+            RAG_INDEX_READONLY=False,
+            DOCUMENT_CATALOG_POLL_INTERVAL=0,
+            _document_catalog=None
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.write("기준금리", "기준금리는 한국은행이 정하는 정책금리입니다. " * 5)
+        self.write("환율", "환율은 두 나라 통화의 교환 비율입니다. " * 5)
+        self.write("인플레이션", "인플레이션은 물가가 지속적으로 오르는 현상입니다. " * 5)
+
+        self.chatbot = unified_chatbot.UnifiedChatbot()
+        self.fake = FakeEmbeddings()
+        self.chatbot.embeddings = self.fake
+        self.chatbot.load_documents()
+        self.chatbot.create_rag_index()
+        self.fake.texts.clear()
+
+    def write(self, name, text):
+        (self.terms_dir / f"{name}.md").write_text(f"# {name}\n\n{text}", encoding="utf-8")
+
+    def chunk_files(self):
+        return {chunk.metadata["file_name"] for chunk in self.chatbot.chunks}
+
+    def test_unchanged_corpus_embeds_nothing(self):
+        summary = self.chatbot.refresh_index()
+
+        self.assertEqual((summary["added"], summary["updated"], summary["deleted"]), (0, 0, 0))
+        self.assertEqual(self.fake.texts, [])
+
+    def test_only_changed_documents_are_embedded(self):
+        kept_ids = [chunk_id for chunk_id in self.chatbot.chunk_ids if "인플레이션" in chunk_id]
+        kept_rows = [self.chatbot.chunk_ids.index(chunk_id) for chunk_id in kept_ids]
+        kept_vectors = np.array(self.chatbot.chunk_embeddings[kept_rows])
+
+        self.write("환율", "원달러 환율이 오르면 수입물가가 상승합니다. " * 5)
+        self.write("국내총생산", "국내총생산은 한 나라에서 생산된 부가가치의 합입니다. " * 5)
+        (self.terms_dir / "기준금리.md").unlink()
+
+        summary = self.chatbot.refresh_index()
+
+        self.assertEqual((summary["added"], summary["updated"], summary["deleted"]), (1, 1, 1))
+        self.assertEqual(summary["embedded_chunks"], len(self.fake.texts))
+        self.assertTrue(self.fake.texts)
+        for text in self.fake.texts:
+            self.assertTrue("수입물가" in text or "국내총생산" in text, text)
+
+        self.assertEqual(self.chunk_files(), {"환율.md", "국내총생산.md", "인플레이션.md"})
+        self.assertEqual(len(self.chatbot.chunks), len(self.chatbot.chunk_ids))
+        self.assertEqual(len(self.chatbot.chunk_embeddings), len(self.chatbot.chunks))
+
+        # 바뀌지 않은 문서의 청크와 임베딩은 그대로 유지
+        rows = [self.chatbot.chunk_ids.index(chunk_id) for chunk_id in kept_ids]
+        np.testing.assert_array_equal(self.chatbot.chunk_embeddings[rows], kept_vectors)
+
+        # 새 스냅샷이 디스크에도 저장됨
+        store = self.chatbot.index_store
+        self.assertTrue(store.is_current(self.chatbot._index_settings(), self.chatbot.file_manifest))
+        self.assertEqual(len(store.load_embeddings()), len(self.chatbot.chunks))
+
+    def test_refresh_clears_answer_cache(self):
+        self.chatbot.answer_cache.put("환율이란", "perplexity", {"answer": "이전 답변"})
+        self.write("환율", "환율 설명이 바뀌었습니다. " * 5)
+
+        self.chatbot.refresh_index()
+
+        self.assertIsNone(self.chatbot.answer_cache.get("환율이란", "perplexity"))
+
+    def test_refresh_before_vector_index_is_ready(self):
+        self.chatbot.stages["vector_index"] = "running"
+
+        self.assertEqual(self.chatbot.refresh_index()["status"], "not_ready")
+
+
+if __name__ == "__main__":
+    unittest.main()